@@ -0,0 +1,68 @@
+"""
+LLM client factory shared by the entry points
+"""
+
+from g4f.integration.langchain import ChatAI
+
+from agents.resilience import (
+    AdaptiveTimeouts,
+    CircuitBreaker,
+    ResilientLLM,
+    ResponseCache,
+)
+from agents.scheduler import ScheduledLLM, Scheduler, default_slots
+from agents.single_flight import CoalescingLLM, SingleFlight
+from agents.telemetry import InstrumentedLLM
+from core.metrics import REGISTRY
+
+# One group per process so every call site shares in-flight requests
+_group = SingleFlight()
+# Latency history, breakers and fallback answers are shared the same way
+_timeouts = AdaptiveTimeouts()
+_cache = ResponseCache()
+_breakers = {}
+# All LLM work of the process queues for the same provider slots
+_scheduler = Scheduler(default_slots())
+
+_DEDUPE = REGISTRY.gauge("llm_dedupe", "Single-flight counters (since start)")
+
+
+def _collect():
+    for name, value in _group.snapshot().items():
+        _DEDUPE.set(value, counter=name)
+    for breaker in list(_breakers.values()):
+        breaker.publish()
+
+
+REGISTRY.add_collector(_collect)
+
+
+def breaker_for(provider, model) -> CircuitBreaker:
+    """Process-wide circuit breaker of one provider/model pair"""
+    name = f"{provider}/{model}"
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name=name)
+    return _breakers[name]
+
+
+def wrap_llm(llm, provider=None, model=None):
+    """Put the shared client layers in front of any invoke/stream client"""
+    instrumented = InstrumentedLLM(llm, provider, model)
+    breaker = breaker_for(instrumented.provider, instrumented.model)
+    resilient = ResilientLLM(instrumented, breaker, _timeouts, _cache)
+    return CoalescingLLM(ScheduledLLM(resilient, _scheduler), _group)
+
+
+def create_llm(model="gpt-4o", provider="PollinationsAI"):
+    """ChatAI client wrapped in the shared client layers"""
+    return wrap_llm(ChatAI(model=model, provider=provider, api_key=""), provider, model)
+
+
+def scheduler() -> Scheduler:
+    """The process-wide LLM scheduler"""
+    return _scheduler
+
+
+def dedupe_stats():
+    """Dedupe counters for all clients created by create_llm"""
+    return _group.snapshot()
@@ -0,0 +1,55 @@
+"""
+Code generation with static pre-flight checks
+"""
+
+from core.preflight import preflight
+
+REGENERATE_PROMPT = """
+Your previous answer cannot be executed:
+{problems}
+
+Return ONLY the corrected, complete Python code for the same task.
+No markdown fences, no explanations.
+"""
+
+
+def task_prompt(task_num, task_text, language):
+    """Prompt for one task, as used by the interactive session"""
+    return f"""
+    Generate Python code for this EXACT task:
+
+    Task number: {task_num}
+    Task description: {task_text}
+
+    Requirements:
+    - Generate code ONLY for this specific task description
+    - Clean, executable Python code
+    - Add comments in {language} language
+    - NO markdown blocks
+    - Complete working solution
+    - For squares: use spaces between asterisks for visual equal-sidedness
+
+    Task to implement: {task_text}
+    """
+
+
+def generate_code(llm, code_prompt, max_regenerations=2):
+    """Invoke the LLM and regenerate at once while the output fails pre-flight.
+
+    Returns the PreflightReport of the last attempt; report.code holds the
+    extracted code (no markdown fences or prose).
+    """
+    messages = [{"role": "user", "content": code_prompt}]
+    report = preflight(llm.invoke(messages).content)
+
+    for _ in range(max_regenerations):
+        if report.ok:
+            break
+        problems = "\n".join(f"- {p}" for p in report.problems())
+        retry_messages = messages + [
+            {"role": "assistant", "content": report.code},
+            {"role": "user", "content": REGENERATE_PROMPT.format(problems=problems)},
+        ]
+        report = preflight(llm.invoke(retry_messages).content)
+
+    return report
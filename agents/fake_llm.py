@@ -0,0 +1,131 @@
+"""
+Local stand-in for the LLM provider.
+
+Answers every prompt the project sends (translations, task menus, code,
+grouped code, repairs) with plausible canned output after a configurable
+latency, and fails or hangs with configurable probabilities. Used by the
+load test, the model benchmark and anything else that must run offline.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from core.parser import parse_tasks_from_content
+
+
+class FakeLLMError(RuntimeError):
+    """Simulated provider failure"""
+
+
+@dataclass(slots=True)
+class LatencyModel:
+    """Lognormal latency: median seconds and spread (sigma of the log)"""
+
+    median: float = 0.2
+    sigma: float = 0.5
+    per_token: float = 0.0
+
+    def sample(self, rng, tokens=0):
+        return rng.lognormvariate(0, self.sigma) * self.median + tokens * self.per_token
+
+
+class FakeMessage:
+    def __init__(self, content, usage=None):
+        self.content = content
+        self.usage_metadata = usage or {}
+
+
+_QUOTED = re.compile(r'"(.*)"', re.DOTALL)
+_LANGUAGE = re.compile(r"to (\w+) language")
+_CONTENT = re.compile(r"File content:\n(.*)\n\s*Return ONLY", re.DOTALL)
+_TASKS = re.compile(r"^(\d+)\) ", re.MULTILINE)
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class FakeLLM:
+    """Thread-safe fake client with invoke() and stream()"""
+
+    def __init__(
+        self,
+        latency: LatencyModel | None = None,
+        error_rate=0.0,
+        hang_rate=0.0,
+        hang_seconds=30.0,
+        model="fake-model",
+        seed=None,
+    ):
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.model = model
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            return (
+                self._rng.random(),
+                self._rng.random(),
+                random.Random(self._rng.random()),
+            )
+
+    def respond(self, prompt):
+        """Canned answer for a prompt, chosen by what the prompt asks for"""
+        if "Translate this interface text" in prompt:
+            match = _QUOTED.search(prompt)
+            language = _LANGUAGE.search(prompt)
+            text = match.group(1) if match else prompt.strip()
+            return f"[{language.group(1) if language else 'xx'}] {text}"
+        if "one object per task" in prompt:
+            count = len(_TASKS.findall(prompt.split("Tasks:", 1)[-1]))
+            return json.dumps(
+                [
+                    {"index": i, "code": f"# task {i}\nprint('solution {i}')"}
+                    for i in range(1, count + 1)
+                ]
+            )
+        if "Parse this file content" in prompt:
+            match = _CONTENT.search(prompt)
+            tasks = parse_tasks_from_content(match.group(1) if match else "")
+            return json.dumps(
+                [
+                    {"id": i, "intent": " ".join(text.split()[:3]), "task": text}
+                    for i, (_, text) in enumerate(tasks, 1)
+                ],
+                ensure_ascii=False,
+            )
+        if "This Python code fails" in prompt:
+            return "# repaired\nprint('fixed')"
+        return "# generated solution\nprint('solution')"
+
+    def invoke(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        fail, hang, rng = self._draw()
+        content = self.respond(prompt)
+        tokens = _estimate_tokens(content)
+        if hang < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        time.sleep(self.latency.sample(rng, tokens))
+        if fail < self.error_rate:
+            raise FakeLLMError("Simulated provider error")
+        usage = {
+            "input_tokens": _estimate_tokens(prompt),
+            "output_tokens": tokens,
+            "total_tokens": _estimate_tokens(prompt) + tokens,
+        }
+        return FakeMessage(content, usage)
+
+    def stream(self, messages, chunk_size=16, **kwargs):
+        content = self.invoke(messages, **kwargs).content
+        for i in range(0, len(content), chunk_size):
+            yield FakeMessage(content[i : i + chunk_size])
@@ -0,0 +1,80 @@
+"""
+Grouped generation: one LLM request for a whole section of related tasks
+"""
+
+from agents.codegen import generate_code, task_prompt
+from core.json_stream import extract_json
+from core.metrics import call_site
+from core.preflight import analyze
+from core.records import GeneratedCodeRecord
+
+SECTION_PROMPT = """
+Generate Python code for EACH of the related tasks below.
+
+Section: {title}
+Shared context:
+{context}
+
+Tasks:
+{tasks}
+
+Requirements for every task:
+- Separate, complete, executable Python solution
+- Add comments in {language} language
+- For squares: use spaces between asterisks for visual equal-sidedness
+
+Return ONLY a JSON array, one object per task, in the same order:
+[{{"index": 1, "code": "..."}}, {{"index": 2, "code": "..."}}, ...]
+"""
+
+
+def section_prompt(section, language):
+    tasks = "\n".join(
+        f"{index}) {text}" for index, (_, text) in enumerate(section.tasks, 1)
+    )
+    return SECTION_PROMPT.format(
+        title=section.title or "-",
+        context="\n".join(section.context) or "-",
+        tasks=tasks,
+        language=language,
+    )
+
+
+def parse_section_response(text):
+    """{index: code} from the model's JSON array ({} if it is unusable)"""
+    items = extract_json(text, default=[])
+    codes = {}
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("code"), str):
+            try:
+                codes[int(item.get("index"))] = item["code"]
+            except (TypeError, ValueError):
+                continue
+    return codes
+
+
+def generate_section(llm, section, language):
+    """GeneratedCodeRecord per task of a section.
+
+    One request covers the whole section; tasks whose code is missing or
+    fails pre-flight fall back to an individual request.
+    Returns (records, fallback_count).
+    """
+    codes = {}
+    if len(section.tasks) > 1:
+        with call_site("generate_section", language=language):
+            response = llm.invoke(
+                [{"role": "user", "content": section_prompt(section, language)}]
+            )
+        codes = parse_section_response(response.content)
+
+    records = []
+    fallbacks = 0
+    for index, (task_num, task_text) in enumerate(section.tasks, 1):
+        code = codes.get(index)
+        if code is None or not analyze(code).ok:
+            prompt = task_prompt(task_num, task_text, language)
+            code = generate_code(llm, prompt).code
+            fallbacks += len(section.tasks) > 1
+        records.append(GeneratedCodeRecord(language, task_num, task_text, code))
+    return records, fallbacks
@@ -0,0 +1,192 @@
+"""
+Generate -> check -> repair loop with bounded retries
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from agents.codegen import generate_code
+from core.execution import run_code_cached
+from agents.resilience import deadline
+from core.metrics import call_site
+from core.preflight import preflight
+from core.records import GenerationRecord
+
+REPAIR_PROMPT = """
+This Python code fails. Fix it.
+
+Error:
+{error}
+
+Code (line numbers, >> marks the failing line):
+{excerpt}
+
+Return ONLY the complete corrected Python code. No markdown, no explanations.
+"""
+
+_LINE_RE = re.compile(r'File "<string>", line (\d+)')
+
+
+def numbered_excerpt(code, error, context=3):
+    """Compact excerpt around the failing line, or the whole numbered code"""
+    lines = code.splitlines()
+    hits = _LINE_RE.findall(error) or re.findall(r"\(line (\d+)\)", error)
+    if hits:
+        failing = int(hits[-1])
+        start, stop = max(1, failing - context), min(len(lines), failing + context)
+    else:
+        failing, start, stop = None, 1, len(lines)
+    return "\n".join(
+        f"{'>>' if n == failing else '  '} {n:>3} | {lines[n - 1]}"
+        for n in range(start, stop + 1)
+    )
+
+
+class RepairCache:
+    """(code, error) -> repaired code, so one failure is never repaired twice"""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(code, error):
+        return hashlib.sha256(f"{code}\0{error}".encode("utf-8")).hexdigest()
+
+    def get(self, code, error):
+        with self._lock:
+            key = self.key(code, error)
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+            return None
+
+    def put(self, code, error, repaired):
+        with self._lock:
+            self._items[self.key(code, error)] = repaired
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+_default_cache = RepairCache()
+
+
+class _CountingLLM:
+    """Client wrapper counting invoke() round-trips, pre-flight retries included"""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        return self.llm.invoke(messages, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+def check(code, stdin="", timeout=10.0, exec_cache=None, pool=None, execute=True):
+    """Error text for code that fails pre-flight or (with execute) at runtime,
+    else None"""
+    report = preflight(code)
+    if not report.ok:
+        return "\n".join(report.problems())
+    if not execute:
+        return None
+    if report.uses_input and not stdin:
+        # Interactive code cannot be checked without a stdin script
+        return None
+    # Regenerations often return identical code - replay its earlier run
+    result = run_code_cached(report.code, stdin, timeout, exec_cache, pool)
+    return None if result.ok else result.error_summary()
+
+
+def repair(llm, code, error, cache=None):
+    """Ask the LLM for a fix of one failure (cached per code + error)"""
+    cache = cache or _default_cache
+    repaired = cache.get(code, error)
+    if repaired is None:
+        prompt = REPAIR_PROMPT.format(
+            error=error, excerpt=numbered_excerpt(code, error)
+        )
+        with call_site("repair"):
+            response = llm.invoke([{"role": "user", "content": prompt}])
+        repaired = preflight(response.content).code
+        cache.put(code, error, repaired)
+    return repaired
+
+
+def generate_with_repair(
+    llm,
+    code_prompt,
+    task_id,
+    max_attempts=3,
+    budget=60.0,
+    stdin="",
+    timeout=10.0,
+    cache=None,
+    exec_cache=None,
+    pool=None,
+    execute=False,
+):
+    """Generate code and repair it until it passes, attempts or budget run out.
+
+    By default candidates are only compiled and pre-flight checked; nothing
+    is executed before the user asks for it. With execute=True every
+    candidate is also run (in a subprocess or pool worker, with `timeout`)
+    and runtime errors are repaired too. Interactive code without a stdin
+    script is only checked statically.
+
+    `budget` bounds the whole loop: every LLM call (generation, its
+    pre-flight regenerations and repairs) gets the time left as its timeout.
+    `attempts` counts those round-trips; `max_attempts` limits the
+    generation plus its repairs. A failing repair call ends the loop with
+    the last code and status "failed".
+
+    Returns (code, GenerationRecord) with the attempt count and final status.
+    """
+    counting = _CountingLLM(llm)
+    end = time.monotonic() + budget
+    with deadline(budget):
+        code = generate_code(counting, code_prompt).code
+    repairs = 0
+    seen = set()
+
+    while True:
+        remaining = min(timeout, max(end - time.monotonic(), 0.1))
+        error = check(code, stdin, remaining, exec_cache, pool, execute)
+        if error is None:
+            status = "ok" if counting.calls == 1 and not repairs else "repaired"
+            break
+        # Out of attempts, out of time, or a repair cycle we've already been through
+        if (
+            repairs + 1 >= max_attempts
+            or time.monotonic() >= end
+            or (code, error) in seen
+        ):
+            status = "failed"
+            break
+        seen.add((code, error))
+        try:
+            with deadline(end - time.monotonic()):
+                code = repair(counting, code, error, cache)
+        except Exception:
+            # Timed out, circuit open or provider error: keep what we have
+            status = "failed"
+            break
+        repairs += 1
+
+    record = GenerationRecord(
+        success=status != "failed",
+        task_id=task_id,
+        error_message=error,
+        code_preview=code[:200],
+        attempts=counting.calls,
+        status=status,
+    )
+    return code, record
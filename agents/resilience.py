@@ -0,0 +1,341 @@
+"""
+Adaptive timeouts, circuit breaking and cached fallbacks for LLM calls.
+
+Each call site gets a timeout derived from its own recent latencies
+(p95 x factor, clamped), so a hung provider request is abandoned instead
+of blocking the session. After repeated failures the circuit opens and
+calls fail (or fall back to the last good answer for the same prompt)
+instantly until a probe request succeeds again.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from agents.single_flight import prompt_key
+from core.metrics import REGISTRY, current_labels
+from core.stats import percentile
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = REGISTRY.gauge(
+    "llm_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+TIMEOUT_SECONDS = REGISTRY.gauge(
+    "llm_timeout_seconds", "Current adaptive timeout per call site"
+)
+TIMEOUTS = REGISTRY.counter("llm_timeouts_total", "LLM requests abandoned on timeout")
+FALLBACKS = REGISTRY.counter(
+    "llm_fallbacks_total", "Failed or rejected requests served from cache"
+)
+REJECTED = REGISTRY.counter(
+    "llm_rejected_total", "Requests rejected while the circuit was open"
+)
+
+
+class LLMTimeoutError(TimeoutError):
+    """The provider did not answer within the call site's timeout"""
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider is failing; requests are rejected without waiting"""
+
+
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    """LLM calls inside this block give up once `seconds` have passed,
+    however long their call site's adaptive timeout is"""
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+# Set by agents.scheduler while a provider slot is held: calling it keeps
+# the slot taken and returns the function that gives it back
+slot_hold = contextvars.ContextVar("llm_slot_hold", default=None)
+
+
+def remaining_time():
+    """Seconds left before the enclosing deadline() block, None without one"""
+    at = _deadline.get()
+    return None if at is None else max(at - time.monotonic(), 0.0)
+
+
+class AdaptiveTimeouts:
+    """Per call site timeout = p(percentile) of recent latencies x factor"""
+
+    def __init__(
+        self,
+        initial=60.0,
+        minimum=5.0,
+        maximum=120.0,
+        factor=3.0,
+        percentile=95,
+        window=100,
+        min_samples=10,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def observe(self, site, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(site, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def timeout(self, site) -> float:
+        with self._lock:
+            samples = list(self._samples.get(site, ()))
+        if len(samples) < self.min_samples:
+            value = self.initial
+        else:
+            value = percentile(samples, self.percentile) * self.factor
+        value = min(self.maximum, max(self.minimum, value))
+        TIMEOUT_SECONDS.set(value, call_site=site)
+        return value
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures, probes after `cooldown`"""
+
+    def __init__(self, threshold=5, cooldown=30.0, name="llm", clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.name = name
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self._publish()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return CLOSED
+        if self.clock() - self.opened_at >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def _publish(self):
+        BREAKER_STATE.set(_STATE_VALUES[self._state()], breaker=self.name)
+
+    def publish(self):
+        """Refresh the state gauge (open turns half-open by time alone)"""
+        with self._lock:
+            self._publish()
+
+    def allow(self) -> bool:
+        """True if a request may go upstream now (one probe while half-open)"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self._publish()
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+            self._publish()
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+            self._probing = False
+            self._publish()
+
+
+class CachedMessage:
+    """Stand-in response built from a cached answer"""
+
+    def __init__(self, content):
+        self.content = content
+
+
+class ResponseCache:
+    """LRU of the last good answer per prompt"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+            return None
+
+    def put(self, key, content):
+        with self._lock:
+            self._items[key] = content
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+_DONE = object()
+
+
+def _in_thread(fn, out):
+    """Run fn in a daemon thread with the caller's context (call site labels).
+    A scheduler slot held by the caller stays taken until fn returns, even
+    if the caller stops waiting for it"""
+    context = contextvars.copy_context()
+    hold = slot_hold.get()
+    release = hold() if hold else None
+
+    def target(out):
+        try:
+            fn(out)
+        finally:
+            if release:
+                release()
+
+    thread = threading.Thread(target=context.run, args=(target, out), daemon=True)
+    thread.start()
+
+
+class ResilientLLM:
+    """invoke()/stream() with adaptive timeouts, a circuit breaker and fallbacks"""
+
+    def __init__(self, llm, breaker=None, timeouts=None, cache=None):
+        self.llm = llm
+        self.breaker = breaker or CircuitBreaker()
+        self.timeouts = timeouts or AdaptiveTimeouts()
+        self.cache = cache or ResponseCache()
+
+    def _key(self, messages, kwargs):
+        # The cache is shared between clients, so provider and model are in the key
+        return prompt_key(
+            messages,
+            model=getattr(self.llm, "model", None),
+            provider=str(getattr(self.llm, "provider", None)),
+            **kwargs,
+        )
+
+    def _fallback(self, key, site, error):
+        content = self.cache.get(key)
+        if content is None:
+            raise error
+        FALLBACKS.inc(call_site=site)
+        return CachedMessage(content)
+
+    def _timeout(self, site):
+        """Adaptive timeout of the call site, cut to the enclosing deadline"""
+        timeout = self.timeouts.timeout(site)
+        remaining = remaining_time()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def invoke(self, messages, **kwargs):
+        site = current_labels().get("call_site", "other")
+        key = self._key(messages, kwargs)
+        timeout = self._timeout(site)
+        if timeout <= 0:
+            # Out of time before asking; not the provider's failure
+            TIMEOUTS.inc(call_site=site)
+            return self._fallback(key, site, LLMTimeoutError("Deadline passed"))
+        if not self.breaker.allow():
+            REJECTED.inc(call_site=site)
+            return self._fallback(key, site, CircuitOpenError("LLM circuit is open"))
+        out = queue.Queue()
+
+        def call(out):
+            try:
+                out.put((True, self.llm.invoke(messages, **kwargs)))
+            except Exception as e:
+                out.put((False, e))
+
+        started = time.perf_counter()
+        _in_thread(call, out)
+        try:
+            ok, value = out.get(timeout=timeout)
+        except queue.Empty:
+            TIMEOUTS.inc(call_site=site)
+            ok, value = False, LLMTimeoutError(f"No answer within {timeout:.1f}s")
+
+        if not ok:
+            self.breaker.failure()
+            return self._fallback(key, site, value)
+        self.breaker.success()
+        self.timeouts.observe(site, time.perf_counter() - started)
+        self.cache.put(key, value.content)
+        return value
+
+    def stream(self, messages, **kwargs):
+        """Chunks as they arrive; the timeout applies to the gap between chunks"""
+        site = current_labels().get("call_site", "other")
+        key = self._key(messages, kwargs)
+        if not self.breaker.allow():
+            REJECTED.inc(call_site=site)
+            yield self._fallback(key, site, CircuitOpenError("LLM circuit is open"))
+            return
+
+        out = queue.Queue()
+
+        def pump(out):
+            try:
+                for chunk in self.llm.stream(messages, **kwargs):
+                    out.put((True, chunk))
+                out.put((True, _DONE))
+            except Exception as e:
+                out.put((False, e))
+
+        started = time.perf_counter()
+        parts = []
+        _in_thread(pump, out)
+        while True:
+            timeout = self._timeout(site)
+            try:
+                ok, value = out.get(timeout=timeout)
+            except queue.Empty:
+                TIMEOUTS.inc(call_site=site)
+                ok, value = False, LLMTimeoutError(f"Stream stalled for {timeout:.1f}s")
+            if not ok:
+                self.breaker.failure()
+                if parts:
+                    # Part of the answer was already handed out
+                    raise value
+                yield self._fallback(key, site, value)
+                return
+            if value is _DONE:
+                break
+            parts.append(getattr(value, "content", "") or "")
+            yield value
+
+        self.breaker.success()
+        self.timeouts.observe(site, time.perf_counter() - started)
+        self.cache.put(key, "".join(parts))
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
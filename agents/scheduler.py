@@ -0,0 +1,218 @@
+"""
+Priority scheduler for LLM work.
+
+Every upstream request needs one of a fixed number of slots (the provider
+quota). Waiting requests are granted slots by priority class, interactive
+before prefetch before batch, and round-robin between users within a
+class. Batch work never takes the last `reserved` slots and is passed over
+whenever anything more urgent is waiting, so a running batch job gives way
+to interactive users at its next request.
+
+The priority class and user of a request come from job() blocks, the same
+way call sites come from core.metrics.call_site().
+"""
+
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from agents.resilience import LLMTimeoutError, remaining_time, slot_hold
+from core.metrics import REGISTRY
+
+INTERACTIVE, PREFETCH, BATCH = 0, 1, 2
+CLASS_NAMES = {INTERACTIVE: "interactive", PREFETCH: "prefetch", BATCH: "batch"}
+
+QUEUE_DEPTH = REGISTRY.gauge("scheduler_queue_depth", "Requests waiting for a slot")
+ACTIVE = REGISTRY.gauge("scheduler_active", "Requests holding a slot")
+WAIT = REGISTRY.histogram(
+    "scheduler_wait_seconds",
+    "Time spent waiting for a slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+_job: ContextVar[tuple] = ContextVar("job", default=(INTERACTIVE, "local"))
+
+
+@contextmanager
+def job(priority, user="local"):
+    """Run LLM calls made inside this block with a priority class and user"""
+    token = _job.set((priority, user))
+    try:
+        yield
+    finally:
+        _job.reset(token)
+
+
+def current_job():
+    return _job.get()
+
+
+class _Ticket:
+    __slots__ = ("priority", "user", "seq", "granted")
+
+    def __init__(self, priority, user, seq):
+        self.priority = priority
+        self.user = user
+        self.seq = seq
+        self.granted = False
+
+
+class Scheduler:
+    """Grants `slots` concurrent slots by priority, then fair share per user"""
+
+    def __init__(self, slots=4, reserved=1):
+        if slots < 1:
+            raise ValueError(f"A scheduler needs at least one slot, got {slots}")
+        self._reserve = reserved
+        self.slots = slots
+        self.reserved = min(reserved, slots - 1)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._active = {INTERACTIVE: 0, PREFETCH: 0, BATCH: 0}
+        self._served = {}
+        self._seq = itertools.count()
+
+    def resize(self, slots):
+        """Change the slot count; the batch reserve is kept below it"""
+        if slots < 1:
+            raise ValueError(f"A scheduler needs at least one slot, got {slots}")
+        with self._cond:
+            self.slots = slots
+            self.reserved = min(self._reserve, slots - 1)
+            # More slots may let waiting requests in now
+            self._grant_ready()
+
+    def _running(self):
+        return sum(self._active.values())
+
+    def _next(self):
+        """Ticket to grant next, or None"""
+        free = self.slots - self._running()
+        if free <= 0 or not self._waiting:
+            return None
+        top = min(t.priority for t in self._waiting)
+        if top == BATCH and free <= self.reserved:
+            return None
+        candidates = [t for t in self._waiting if t.priority == top]
+        # Least-served user first, then arrival order
+        return min(
+            candidates, key=lambda t: (self._served.get((top, t.user), 0), t.seq)
+        )
+
+    def _grant_ready(self):
+        while True:
+            ticket = self._next()
+            if ticket is None:
+                break
+            self._waiting.remove(ticket)
+            ticket.granted = True
+            self._active[ticket.priority] += 1
+            key = (ticket.priority, ticket.user)
+            self._served[key] = self._served.get(key, 0) + 1
+        self._publish()
+        self._cond.notify_all()
+
+    def _publish(self):
+        for priority, name in CLASS_NAMES.items():
+            ACTIVE.set(self._active[priority], priority=name)
+            QUEUE_DEPTH.set(
+                sum(t.priority == priority for t in self._waiting), priority=name
+            )
+
+    @contextmanager
+    def slot(self, priority=None, user=None):
+        """Block until a slot is granted; hold it for the block.
+
+        Waiting ends with LLMTimeoutError when an enclosing
+        resilience.deadline() runs out. Worker threads started inside the
+        block (ResilientLLM) keep the slot until they finish, so requests
+        abandoned on timeout still count against the quota.
+        """
+        default_priority, default_user = current_job()
+        priority = default_priority if priority is None else priority
+        user = default_user if user is None else user
+
+        started = time.perf_counter()
+        with self._cond:
+            ticket = _Ticket(priority, user, next(self._seq))
+            self._waiting.append(ticket)
+            self._grant_ready()
+            while not ticket.granted:
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    self._waiting.remove(ticket)
+                    self._grant_ready()
+                    raise LLMTimeoutError("No LLM slot free before the deadline")
+                self._cond.wait(remaining)
+        WAIT.observe(time.perf_counter() - started, priority=CLASS_NAMES[priority])
+
+        holders = 1
+        lock = threading.Lock()
+
+        def release():
+            nonlocal holders
+            with lock:
+                holders -= 1
+                last = holders == 0
+            if last:
+                with self._cond:
+                    self._active[priority] -= 1
+                    self._grant_ready()
+
+        def hold():
+            nonlocal holders
+            with lock:
+                holders += 1
+            return release
+
+        token = slot_hold.set(hold)
+        try:
+            yield
+        finally:
+            try:
+                slot_hold.reset(token)
+            except ValueError:
+                # A generator holding the slot was closed from another context
+                pass
+            release()
+
+    def run(self, fn, priority=None, user=None):
+        """fn() inside a slot"""
+        with self.slot(priority, user):
+            return fn()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "active": {CLASS_NAMES[p]: n for p, n in self._active.items()},
+                "waiting": {
+                    name: sum(t.priority == p for t in self._waiting)
+                    for p, name in CLASS_NAMES.items()
+                },
+            }
+
+
+class ScheduledLLM:
+    """Client wrapper whose invoke()/stream() wait for a scheduler slot"""
+
+    def __init__(self, llm, scheduler: Scheduler):
+        self.llm = llm
+        self.scheduler = scheduler
+
+    def invoke(self, messages, **kwargs):
+        return self.scheduler.run(lambda: self.llm.invoke(messages, **kwargs))
+
+    def stream(self, messages, **kwargs):
+        with self.scheduler.slot():
+            yield from self.llm.stream(messages, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+def default_slots():
+    """LLM_MAX_CONCURRENCY, at least one slot"""
+    return max(1, int(os.environ.get("LLM_MAX_CONCURRENCY", "4")))
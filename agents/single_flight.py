@@ -0,0 +1,193 @@
+"""
+Single-flight coalescing for identical in-flight LLM calls
+"""
+
+import contextvars
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Iterator, List
+
+
+def prompt_key(messages: Any, **params: Any) -> str:
+    """Stable key for a prompt (messages + call parameters)"""
+    payload = json.dumps(
+        {"messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    """One upstream request shared by every caller with the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class _StreamCall:
+    """One upstream stream fanned out to every caller with the same key"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks: List[Any] = []
+        self.finished = False
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Run a function once per key while it is in flight; others share its outcome"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, _StreamCall] = {}
+        self.stats = {
+            "calls": 0,
+            "upstream": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "stream_calls": 0,
+            "stream_upstream": 0,
+            "stream_coalesced": 0,
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn() - shared with concurrent callers using the same key"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats["coalesced"] += 1
+                call.waiters += 1
+                leader = False
+            else:
+                self.stats["upstream"] += 1
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            # Forget the key before waking followers so later calls go upstream again
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stream(self, key: str, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """Iterate fn() once per key; late joiners replay buffered chunks first"""
+        with self._lock:
+            self.stats["stream_calls"] += 1
+            call = self._streams.get(key)
+            if call is not None:
+                self.stats["stream_coalesced"] += 1
+                leader = False
+            else:
+                self.stats["stream_upstream"] += 1
+                call = _StreamCall()
+                self._streams[key] = call
+                leader = True
+
+        if leader:
+            # The upstream stream is read by its own thread, not by the
+            # leader's generator: a caller that stops iterating (or never
+            # starts) cannot stall the followers
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run, args=(self._pump, key, call, fn), daemon=True
+            ).start()
+        return self._follow_stream(call)
+
+    def _pump(self, key, call, fn):
+        """Read fn() to the end into the shared buffer"""
+        try:
+            for chunk in fn():
+                with call.cond:
+                    call.chunks.append(chunk)
+                    call.cond.notify_all()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+        finally:
+            with self._lock:
+                self._streams.pop(key, None)
+            with call.cond:
+                call.finished = True
+                call.cond.notify_all()
+
+    @staticmethod
+    def _follow_stream(call):
+        index = 0
+        while True:
+            with call.cond:
+                while index >= len(call.chunks) and not call.finished:
+                    call.cond.wait()
+                if index < len(call.chunks):
+                    chunk = call.chunks[index]
+                    index += 1
+                elif call.error is not None:
+                    raise call.error
+                else:
+                    return
+            yield chunk
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently in flight"""
+        with self._lock:
+            return len(self._calls) + len(self._streams)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of the dedupe counters"""
+        with self._lock:
+            return dict(self.stats)
+
+
+class CoalescingLLM:
+    """LLM client wrapper that coalesces identical concurrent invoke/stream calls"""
+
+    def __init__(self, llm, group: SingleFlight | None = None):
+        self.llm = llm
+        self.group = group or SingleFlight()
+
+    def _key(self, messages, kwargs):
+        model = getattr(self.llm, "model", None) or getattr(
+            self.llm, "model_name", None
+        )
+        provider = getattr(self.llm, "provider", None)
+        return prompt_key(messages, model=model, provider=str(provider), **kwargs)
+
+    def invoke(self, messages, **kwargs):
+        return self.group.do(
+            self._key(messages, kwargs), lambda: self.llm.invoke(messages, **kwargs)
+        )
+
+    def stream(self, messages, **kwargs):
+        return self.group.stream(
+            self._key(messages, kwargs), lambda: self.llm.stream(messages, **kwargs)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Dedupe counters of the underlying single-flight group"""
+        return self.group.snapshot()
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
@@ -0,0 +1,140 @@
+"""
+Cost and latency telemetry for LLM calls.
+
+InstrumentedLLM sits directly in front of the provider client, so it sees
+every upstream request (coalesced duplicates never reach it) and records
+its latency, outcome and token usage, labelled with the call site, language,
+provider and model.
+"""
+
+import time
+
+from core.metrics import REGISTRY, current_labels
+
+REQUESTS = REGISTRY.counter("llm_requests_total", "LLM requests by outcome")
+LATENCY = REGISTRY.histogram("llm_request_seconds", "LLM request latency")
+TOKENS = REGISTRY.counter("llm_tokens_total", "LLM tokens by direction")
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4) if text else 0
+
+
+def token_usage(response, prompt_text="", output_text=None):
+    """(input, output) tokens from provider metadata, estimated if missing"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("input_tokens") or usage.get("output_tokens"):
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or {}
+    if usage.get("prompt_tokens") or usage.get("completion_tokens"):
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    if output_text is None:
+        output_text = getattr(response, "content", "") or ""
+    return _estimate_tokens(prompt_text), _estimate_tokens(output_text)
+
+
+def _prompt_text(messages):
+    if isinstance(messages, str):
+        return messages
+    return "".join(
+        m.get("content", "") if isinstance(m, dict) else getattr(m, "content", "")
+        for m in messages
+    )
+
+
+class InstrumentedLLM:
+    """Records a metrics sample for every invoke() and stream()"""
+
+    def __init__(self, llm, provider=None, model=None):
+        self._llm = llm
+        self.provider = provider or getattr(llm, "provider", None) or "unknown"
+        self.model = model or getattr(llm, "model", None) or "unknown"
+
+    def _labels(self):
+        context = current_labels()
+        return {
+            "call_site": context.get("call_site", "other"),
+            "language": context.get("language", "-"),
+            "provider": str(self.provider),
+            "model": str(self.model),
+        }
+
+    def _record(self, labels, started, status, tokens=(0, 0)):
+        LATENCY.observe(time.perf_counter() - started, **labels)
+        REQUESTS.inc(status=status, **labels)
+        TOKENS.inc(tokens[0], direction="input", **labels)
+        TOKENS.inc(tokens[1], direction="output", **labels)
+
+    def invoke(self, messages, **kwargs):
+        labels = self._labels()
+        started = time.perf_counter()
+        try:
+            response = self._llm.invoke(messages, **kwargs)
+        except Exception:
+            self._record(labels, started, "error")
+            raise
+        self._record(
+            labels, started, "ok", token_usage(response, _prompt_text(messages))
+        )
+        return response
+
+    def stream(self, messages, **kwargs):
+        labels = self._labels()
+        started = time.perf_counter()
+        parts = []
+        last = None
+        try:
+            for chunk in self._llm.stream(messages, **kwargs):
+                last = chunk
+                parts.append(getattr(chunk, "content", "") or "")
+                yield chunk
+        except Exception:
+            self._record(labels, started, "error")
+            raise
+        tokens = token_usage(last, _prompt_text(messages), "".join(parts))
+        self._record(labels, started, "ok", tokens)
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+
+def summary():
+    """Per call site: requests, errors, mean latency, tokens and share of requests"""
+    rows = {}
+    for key, value in REQUESTS.items():
+        labels = dict(key)
+        row = rows.setdefault(
+            labels["call_site"],
+            {"requests": 0, "errors": 0, "seconds": 0.0, "tokens": 0},
+        )
+        row["requests"] += value
+        if labels["status"] == "error":
+            row["errors"] += value
+    for key, (_, total, _) in LATENCY.items():
+        rows[dict(key)["call_site"]]["seconds"] += total
+    for key, value in TOKENS.items():
+        rows[dict(key)["call_site"]]["tokens"] += value
+
+    total_requests = sum(row["requests"] for row in rows.values()) or 1
+    for row in rows.values():
+        row["mean"] = row["seconds"] / row["requests"] if row["requests"] else 0.0
+        row["share"] = row["requests"] / total_requests
+    return dict(sorted(rows.items(), key=lambda item: -item[1]["requests"]))
+
+
+def format_summary(rows=None):
+    """Text table for the interactive 'stats' command"""
+    rows = summary() if rows is None else rows
+    if not rows:
+        return "No LLM calls yet"
+    lines = [
+        f"{'call site':<22}{'calls':>7}{'errors':>8}{'mean s':>9}"
+        f"{'tokens':>9}{'share':>8}"
+    ]
+    for site, row in rows.items():
+        lines.append(
+            f"{site:<22}{row['requests']:>7}{row['errors']:>8}"
+            f"{row['mean']:>9.2f}{row['tokens']:>9}{row['share']:>8.0%}"
+        )
+    return "\n".join(lines)
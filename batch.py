@@ -0,0 +1,158 @@
+"""
+📦 Batch code generation for whole task files
+Generates solutions for every task without the interactive menus.
+With --changed-only, tasks whose text is unchanged since the last run
+keep their code files and only new or edited tasks are generated.
+"""
+
+import argparse
+import os
+import time
+
+from agents.client import create_llm, dedupe_stats
+from agents.codegen import generate_code, task_prompt
+from agents.grouping import generate_section
+from agents.scheduler import BATCH, job
+from agents.telemetry import format_summary
+from core.blob_store import default_store
+from core.metrics import call_site, setup_from_env
+from core.parallel_parse import find_task_files
+from core.parser import TaskSection, parse_sections, read_task_file
+from core.records import GeneratedCodeRecord
+from core.task_index import INDEX_NAME, IndexEntry, TaskIndex
+from core.writer import CodeWriter
+
+
+def generate_sections(llm, sections, language, grouped=True, only=None):
+    """GeneratedCodeRecord for every task (or every task in `only`),
+    returns (records, fallbacks)"""
+    records = []
+    fallbacks = 0
+    for section in sections:
+        if only is not None:
+            tasks = [task for task in section.tasks if task in only]
+            if not tasks:
+                continue
+            section = TaskSection(section.title, section.context, tasks)
+        if grouped:
+            section_records, section_fallbacks = generate_section(
+                llm, section, language
+            )
+            records.extend(section_records)
+            fallbacks += section_fallbacks
+            continue
+        for task_num, task_text in section.tasks:
+            code = generate_code(llm, task_prompt(task_num, task_text, language)).code
+            records.append(GeneratedCodeRecord(language, task_num, task_text, code))
+    return records, fallbacks
+
+
+def save_records(records, writer, model):
+    """Write records in one batch and record them in the blob store"""
+    store = default_store()
+    for record in records:
+        store.put(
+            record.code,
+            record.task_number,
+            f"task_{record.task_number}",
+            record.locale,
+            model,
+        )
+    return writer.write_many(records)
+
+
+def merge_unchanged(diff, tasks, records, paths, language):
+    """Index entries and records in task order for a whole file, reading
+    unchanged tasks back from their code files. Returns (entries, records)"""
+    generated = {
+        (record.task_number, record.task_description): (record, path)
+        for record, path in zip(records, paths)
+    }
+    entries = {}
+    merged = []
+    for key, (task_num, task_text) in zip(diff.keys, tasks):
+        entry = diff.unchanged.get(key)
+        if entry is None:
+            record, path = generated[(task_num, task_text)]
+            entries[key] = IndexEntry(task_num, task_text, path)
+            merged.append(record)
+            continue
+        with open(entry.path, encoding="utf-8") as f:
+            code = f.read()
+        entries[key] = entry
+        merged.append(GeneratedCodeRecord(language, task_num, task_text, code))
+    return entries, merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate code for whole task files")
+    parser.add_argument("paths", nargs="+", help="Task files or directories")
+    parser.add_argument("--language", choices=["en", "uk", "ru"], default="en")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--provider", default="PollinationsAI")
+    parser.add_argument("--output", default="generated_code")
+    parser.add_argument(
+        "--individual",
+        action="store_true",
+        help="One request per task instead of one per section",
+    )
+    parser.add_argument("--bundle", help="Also write a zip/tar.gz/jsonl bundle")
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only generate tasks that are new or edited since the last run",
+    )
+    args = parser.parse_args(argv)
+
+    setup_from_env()
+    llm = create_llm(model=args.model, provider=args.provider)
+    writer = CodeWriter(args.output)
+    index = TaskIndex(os.path.join(args.output, INDEX_NAME))
+    start = time.perf_counter()
+
+    all_records = []
+    for filepath in (f for path in args.paths for f in find_task_files(path)):
+        print(f"📁 {filepath}")
+        sections = parse_sections(read_task_file(filepath))
+        tasks = [task for section in sections for task in section.tasks]
+        diff = index.diff(filepath, args.language, args.model, tasks)
+        if not args.changed_only:
+            diff.unchanged.clear()
+            diff.changed = tasks
+        # Batch work yields provider slots to interactive sessions
+        with job(BATCH, user="batch"), call_site("batch", language=args.language):
+            records, fallbacks = generate_sections(
+                llm,
+                sections,
+                args.language,
+                grouped=not args.individual,
+                only=set(diff.changed) if args.changed_only else None,
+            )
+        paths = save_records(records, writer, args.model)
+        print(f"   ✅ {len(paths)} tasks generated ({fallbacks} individual fallbacks)")
+        if args.changed_only:
+            print(
+                f"   ⏭️ {len(diff.unchanged)} unchanged, "
+                f"{len(diff.removed)} removed since the last run"
+            )
+        entries, file_records = merge_unchanged(
+            diff, tasks, records, paths, args.language
+        )
+        index.update(filepath, args.language, args.model, entries)
+        index.save()
+        all_records.extend(file_records)
+
+    if args.bundle:
+        fmt = "zip" if args.bundle.endswith(".zip") else "jsonl"
+        fmt = "tar" if args.bundle.endswith((".tar", ".tar.gz", ".tgz")) else fmt
+        print(f"📦 Bundle: {writer.write_archive(all_records, args.bundle, fmt)}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📋 Tasks: {len(all_records)}")
+    print(f"🔁 LLM requests: {dedupe_stats()['calls']}")
+    print(f"⏱️ Total Time: {elapsed:.2f} seconds")
+    print(f"\n{format_summary()}")
+
+
+if __name__ == "__main__":
+    main()
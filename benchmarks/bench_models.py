@@ -0,0 +1,163 @@
+"""
+Benchmark: generation quality and latency per provider/model
+
+Runs every parsed task from tasks/ through generation and the execution
+check for each provider/model pair, then reports success rate, p50/p95
+latency and tokens. --fake swaps the providers for the local FakeLLM so
+the benchmark runs in CI. Each run is appended to
+benchmarks/results/models.jsonl for trend tracking.
+Run: python -m benchmarks.bench_models [--models gpt-4o,qwen-3-235b] [--fake]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from agents.client import create_llm, wrap_llm
+from agents.codegen import generate_code, task_prompt
+from agents.fake_llm import FakeLLM, LatencyModel
+from agents.repair import check
+from agents.scheduler import BATCH, job
+from agents.telemetry import TOKENS
+from core.metrics import call_site
+from core.models import AgentConfig
+from core.stats import percentile
+from core.task_store import TaskStore
+
+RESULTS_PATH = os.path.join("benchmarks", "results", "models.jsonl")
+DEFAULT_MODELS = ("gpt-4o", AgentConfig.model_fields["ai_model"].default)
+CALL_SITE = "bench_models"
+
+
+def fake_client(provider, model, latency=0.05, error_rate=0.0, seed=0):
+    """FakeLLM with a latency profile that differs per provider/model"""
+    spread = zlib.crc32(f"{provider}/{model}".encode()) % 100 / 100
+    fake = FakeLLM(
+        LatencyModel(median=latency * (0.5 + spread), sigma=0.3),
+        error_rate=error_rate,
+        model=model,
+        seed=seed,
+    )
+    return wrap_llm(fake, provider, model)
+
+
+def _tokens(provider, model):
+    total = 0
+    for key, value in TOKENS.items():
+        labels = dict(key)
+        if (labels["provider"], labels["model"], labels["call_site"]) == (
+            provider,
+            model,
+            CALL_SITE,
+        ):
+            total += value
+    return total
+
+
+def run_task(llm, task_num, task_text, language, timeout):
+    """(passed, seconds) for one task: generate, then execute the result"""
+    start = time.perf_counter()
+    try:
+        with job(BATCH, user="bench_models"), call_site(CALL_SITE, language=language):
+            report = generate_code(llm, task_prompt(task_num, task_text, language))
+    except Exception:
+        return False, time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    return report.ok and check(report.code, timeout=timeout) is None, elapsed
+
+
+def benchmark(llm, provider, model, tasks, language="en", workers=4, timeout=10.0):
+    """Result row for one provider/model over (task_num, task_text) pairs"""
+    tokens_before = _tokens(provider, model)
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(
+            pool.map(
+                lambda task: run_task(llm, task[0], task[1], language, timeout),
+                tasks,
+            )
+        )
+    latencies = [seconds for _, seconds in results]
+    passed = sum(ok for ok, _ in results)
+    return {
+        "provider": provider,
+        "model": model,
+        "tasks": len(results),
+        "success_rate": passed / len(results) if results else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "tokens": _tokens(provider, model) - tokens_before,
+    }
+
+
+def print_table(rows):
+    print(f"{'provider/model':<34}{'tasks':>6}{'success':>9}{'p50 s':>8}{'p95 s':>8}")
+    print("-" * 74)
+    for row in rows:
+        name = f"{row['provider']}/{row['model']}"
+        print(
+            f"{name:<34}{row['tasks']:>6}{row['success_rate']:>9.0%}"
+            f"{row['p50']:>8.2f}{row['p95']:>8.2f}  {row['tokens']} tokens"
+        )
+
+
+def save_rows(rows, path=RESULTS_PATH, fake=False):
+    """Append one line per row, stamped with the run time"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps({"run": stamp, "fake": fake, **row}) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Provider/model benchmark")
+    parser.add_argument("--models", default=",".join(DEFAULT_MODELS))
+    parser.add_argument("--providers", default="PollinationsAI")
+    parser.add_argument("--language", choices=["en", "uk", "ru"], default="en")
+    parser.add_argument("--limit", type=int, help="Only the first N tasks")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--fake", action="store_true", help="Local stand-in LLM")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake median s")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--out", default=RESULTS_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    store = TaskStore.from_files(sorted(glob.glob(os.path.join("tasks", "*.txt"))))
+    tasks = list(store)[: args.limit]
+    print(f"📊 Model benchmark ({len(tasks)} tasks{', fake LLM' if args.fake else ''})")
+
+    rows = []
+    for provider in args.providers.split(","):
+        for model in args.models.split(","):
+            if args.fake:
+                llm = fake_client(provider, model, args.latency, args.error_rate)
+            else:
+                llm = create_llm(model=model, provider=provider)
+            rows.append(
+                benchmark(
+                    llm,
+                    provider,
+                    model,
+                    tasks,
+                    args.language,
+                    args.workers,
+                    args.timeout,
+                )
+            )
+    print_table(rows)
+
+    if not args.no_save:
+        save_rows(rows, args.out, args.fake)
+        print(f"✅ Results appended to {args.out}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
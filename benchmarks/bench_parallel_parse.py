@@ -0,0 +1,125 @@
+"""
+Benchmark: parallel corpus parsing speedup
+
+Generates a synthetic corpus from tasks/*.txt and parses it with
+1, 2, 4, ... workers up to the CPU count. Each run is appended to
+benchmarks/results/parallel_parse.jsonl, and the run fails when a
+multi-worker speedup falls below 0.6x the worker count (skipped on one CPU).
+Run: python -m benchmarks.bench_parallel_parse [files] [copies_per_file]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from core.parallel_parse import parse_files_parallel
+from core.parser import read_task_file
+
+RESULTS_PATH = os.path.join("benchmarks", "results", "parallel_parse.jsonl")
+MIN_EFFICIENCY = 0.6
+
+
+def build_corpus(directory, files, copies):
+    """Write `files` task files, each `copies` concatenated task sources"""
+    sources = [read_task_file(p) for p in sorted(glob.glob("tasks/*.txt"))]
+    paths = []
+    for i in range(files):
+        path = os.path.join(directory, f"task_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(sources[(i + j) % len(sources)] for j in range(copies)))
+        paths.append(path)
+    return paths
+
+
+def worker_counts(cpus):
+    return sorted({1, *(2**i for i in range(1, cpus.bit_length())), cpus})
+
+
+def measure(paths, counts):
+    """One row per worker count; speedup is relative to the first count"""
+    rows = []
+    for workers in counts:
+        start = time.perf_counter()
+        store = parse_files_parallel(paths, workers)
+        elapsed = time.perf_counter() - start
+        speedup = rows[0]["seconds"] / elapsed if rows else 1.0
+        rows.append(
+            {
+                "workers": workers,
+                "tasks": len(store),
+                "seconds": round(elapsed, 4),
+                "speedup": round(speedup, 2),
+            }
+        )
+    return rows
+
+
+def check(rows, cpus=None, efficiency=MIN_EFFICIENCY):
+    """Error message if a run scaled below efficiency x workers, else None.
+    One CPU has nothing to scale, so it always passes"""
+    cpus = cpus or os.cpu_count() or 1
+    if cpus < 2:
+        return None
+    for row in rows:
+        expected = efficiency * min(row["workers"], cpus)
+        if row["workers"] > 1 and row["speedup"] < expected:
+            return (
+                f"Parallel parse scaled poorly: {row['speedup']:.2f}x with "
+                f"{row['workers']} workers < {expected:.2f}x"
+            )
+    return None
+
+
+def save_rows(rows, cpus, files, copies, path=RESULTS_PATH):
+    """Append one line per row, stamped with the run time and CPU count"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stamp = datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            line = {"run": stamp, "cpus": cpus, "files": files, "copies": copies}
+            f.write(json.dumps({**line, **row}) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel parse speedup")
+    parser.add_argument("files", type=int, nargs="?", default=400)
+    parser.add_argument("copies", type=int, nargs="?", default=50)
+    parser.add_argument("--efficiency", type=float, default=MIN_EFFICIENCY)
+    parser.add_argument("--out", default=RESULTS_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = build_corpus(directory, args.files, args.copies)
+        print(f"📊 Parallel parse benchmark ({args.files} files, {cpus} CPUs)")
+        print("-" * 52)
+        print(f"{'Workers':>8}{'Tasks':>12}{'Seconds':>12}{'Speedup':>10}")
+        rows = measure(paths, worker_counts(cpus))
+        for row in rows:
+            print(
+                f"{row['workers']:>8}{row['tasks']:>12}"
+                f"{row['seconds']:>12.3f}{row['speedup']:>9.2f}x"
+            )
+
+    if not args.no_save:
+        save_rows(rows, cpus, args.files, args.copies, args.out)
+        print(f"✅ Results appended to {args.out}")
+    problem = check(rows, cpus, args.efficiency)
+    if cpus < 2:
+        print("⏭️ One CPU: speedup check skipped")
+    elif problem:
+        print(f"❌ {problem}")
+        sys.exit(1)
+    else:
+        print("✅ Speedup within threshold")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
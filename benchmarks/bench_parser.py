@@ -0,0 +1,104 @@
+"""
+Benchmark: task parser throughput
+
+Parses a generated large task file and reports MB/s and tasks/s. Speed is
+also expressed relative to a calibration loop (strip + one regex per line)
+so the stored baseline is comparable across machines.
+Run: python -m benchmarks.bench_parser [--tasks N] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+from benchmarks.corpus import large_file
+from core.parser import parse_tasks_from_content
+
+BASELINE_PATH = os.path.join("benchmarks", "results", "parser_baseline.json")
+# Fail when parsing is this much slower than the baseline (0.5 = 50%)
+DEFAULT_TOLERANCE = 0.5
+
+_CALIBRATION_RE = re.compile(r"^(\d+)\)\s*(.*)")
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _calibrate(content):
+    for line in content.split("\n"):
+        _CALIBRATION_RE.match(line.strip())
+
+
+def measure(tasks=5000, repeat=5, seed=0):
+    """Throughput numbers for one generated file of `tasks` tasks"""
+    content = large_file(tasks, seed)
+    parsed = parse_tasks_from_content(content)
+    seconds = _best_of(lambda: parse_tasks_from_content(content), repeat)
+    calibration = _best_of(lambda: _calibrate(content), repeat)
+    return {
+        "tasks": len(parsed),
+        "bytes": len(content.encode("utf-8")),
+        "seconds": seconds,
+        "mb_per_s": len(content.encode("utf-8")) / seconds / 1e6,
+        "tasks_per_s": len(parsed) / seconds,
+        # Parser cost in units of the calibration loop; lower is faster
+        "relative_cost": seconds / calibration,
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Error message if result regressed past the tolerance, else None"""
+    limit = baseline["relative_cost"] * (1 + tolerance)
+    if result["relative_cost"] > limit:
+        return (
+            f"Parser regressed: relative cost {result['relative_cost']:.2f} "
+            f"> {limit:.2f} (baseline {baseline['relative_cost']:.2f})"
+        )
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task parser throughput")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    result = measure(args.tasks, args.repeat)
+    print(f"📊 Parser benchmark ({result['tasks']} tasks, {result['bytes']} bytes)")
+    print("-" * 52)
+    print(f"⏱️ Best time:     {result['seconds'] * 1000:.1f} ms")
+    print(f"📈 Throughput:    {result['mb_per_s']:.2f} MB/s")
+    print(f"📋 Tasks/s:       {result['tasks_per_s']:,.0f}")
+    print(f"⚖️ Relative cost: {result['relative_cost']:.2f}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ Baseline written to {BASELINE_PATH}")
+        return
+
+    baseline = load_baseline()
+    if baseline:
+        problem = check(result, baseline)
+        print(f"❌ {problem}" if problem else "✅ Within baseline tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: warm interpreter pool vs a fresh interpreter per run
+
+Runs the demo_files/demo_square_*.py scripts (with a call appended) through
+run_code() both ways and compares the per-run overhead over executing the
+same code in-process. Target: pool overhead under 10 ms per run.
+Run: python -m benchmarks.bench_pool [runs]
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+from core.execution import run_code
+from core.interpreter_pool import InterpreterPool
+from core.stats import percentile
+
+TARGET_MS = 10.0
+
+
+def demo_scripts():
+    scripts = []
+    for path in sorted(glob.glob(os.path.join("demo_files", "demo_square_*.py"))):
+        with open(path, encoding="utf-8") as f:
+            scripts.append(f.read() + "\nprint_empty_square(5)\n")
+    return scripts
+
+
+def in_process_ms(code):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(compile(code, "<string>", "exec"), {"__name__": "__main__"})
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(scripts, runs, pool=None):
+    """Per-run milliseconds over `runs` passes of every script"""
+    times = []
+    for _ in range(runs):
+        for code in scripts:
+            result = run_code(code, pool=pool)
+            assert result.ok, result.error_summary()
+            times.append(result.duration * 1000)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scripts = demo_scripts()
+    baseline = percentile([in_process_ms(code) for code in scripts * runs], 50)
+
+    print(f"📊 Interpreter pool benchmark ({len(scripts)} scripts x {runs} runs)")
+    print("-" * 56)
+    print(f"{'Backend':<24}{'p50 ms':>10}{'p95 ms':>10}{'overhead':>12}")
+    with InterpreterPool() as pool:
+        measure(scripts, 1, pool)  # wait for the workers to be ready
+        rows = [
+            ("fresh interpreter", measure(scripts, runs)),
+            ("warm pool", measure(scripts, runs, pool)),
+        ]
+    for name, times in rows:
+        p50 = percentile(times, 50)
+        print(
+            f"{name:<24}{p50:>10.2f}{percentile(times, 95):>10.2f}"
+            f"{p50 - baseline:>10.2f}ms"
+        )
+    overhead = percentile(rows[1][1], 50) - baseline
+    status = "✅" if overhead < TARGET_MS else "❌"
+    print(f"{status} Pool overhead {overhead:.2f} ms (target < {TARGET_MS:.0f} ms)")
+    return overhead
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: slotted records vs pydantic models
+
+Measures construction throughput and memory per object.
+Run: python -m benchmarks.bench_records [count]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from core.models import GeneratedCode, TaskMenuItem
+from core.records import GeneratedCodeRecord, TaskRecord
+
+
+def _build_tasks(cls, count):
+    return [
+        cls(id=i, intent="print list", task=f"task number {i}") for i in range(count)
+    ]
+
+
+def _build_code(cls, count):
+    return [
+        cls(locale="en", task_number=i, task_description="print list", code="print(1)")
+        for i in range(count)
+    ]
+
+
+def measure(builder, cls, count):
+    """Return (objects per second, bytes per object)"""
+    start = time.perf_counter()
+    builder(cls, count)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = builder(cls, count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+
+    return count / elapsed, (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = [
+        ("TaskMenuItem (pydantic)", _build_tasks, TaskMenuItem),
+        ("TaskRecord (slots)", _build_tasks, TaskRecord),
+        ("GeneratedCode (pydantic)", _build_code, GeneratedCode),
+        ("GeneratedCodeRecord (slots)", _build_code, GeneratedCodeRecord),
+    ]
+
+    print(f"📊 Records benchmark ({count} objects)")
+    print("-" * 64)
+    print(f"{'Type':<30}{'objects/s':>16}{'bytes/object':>16}")
+    for name, builder, cls in rows:
+        rate, size = measure(builder, cls, count)
+        print(f"{name:<30}{rate:>16,.0f}{size:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
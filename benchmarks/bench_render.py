@@ -0,0 +1,102 @@
+"""
+Benchmark: rendering a 1,000-item task menu
+
+Compares one print() per line (line-buffered like a terminal) with a
+Screen written in one call, for the whole menu and for its first page,
+and counts the write calls each one makes. Also times highlighting a
+long code listing.
+Run: python -m benchmarks.bench_render [items]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from core.render import Menu, Screen, highlight_lines
+from core.task_store import TaskStore
+
+
+class CountingSink(io.RawIOBase):
+    """Discards bytes, counting write calls (one per syscall on a real fd)"""
+
+    def __init__(self):
+        self.writes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.writes += 1
+        return len(data)
+
+
+def terminal():
+    sink = CountingSink()
+    stream = io.TextIOWrapper(
+        io.BufferedWriter(sink), encoding="utf-8", line_buffering=True
+    )
+    return sink, stream
+
+
+def print_menu(store, stream):
+    with contextlib.redirect_stdout(stream):
+        print("\nTasks from task_1.txt:")
+        print("-" * 50)
+        width = len(str(max(store.task_ids)))
+        for task_num, task_desc in store:
+            print(f"{task_num:>{width}}. {task_desc}")
+        print("-" * 50)
+
+
+def screen_menu(store, stream, page_size):
+    menu = Menu(store, page_size)
+    screen = Screen(stream).line("\nTasks from task_1.txt:").rule()
+    screen.lines(menu.page_lines(0)).rule().line(menu.footer(0)).flush()
+
+
+def measure(render, repeat=20):
+    """(ms per render, write calls per render)"""
+    sink, stream = terminal()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render(stream)
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed * 1000, sink.writes / repeat
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    store = TaskStore.from_tasks(
+        [(i, f"створити функцію номер {i}, яка повертає список") for i in range(count)]
+    )
+    rows = [
+        ("print() per line", lambda s: print_menu(store, s)),
+        ("Screen, whole menu", lambda s: screen_menu(store, s, count)),
+        ("Screen, first page", lambda s: screen_menu(store, s, 40)),
+    ]
+
+    print(f"📊 Render benchmark ({count}-item menu)")
+    print("-" * 56)
+    print(f"{'Method':<28}{'ms/render':>14}{'writes':>14}")
+    for name, render in rows:
+        ms, writes = measure(render)
+        print(f"{name:<28}{ms:>14.3f}{writes:>14.0f}")
+
+    code = "\n".join(
+        f"def f{i}(x):\n    return x * {i}  # step {i}" for i in range(500)
+    )
+    start = time.perf_counter()
+    next(highlight_lines(code))
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    lines = list(highlight_lines(code))
+    total_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"\n🎨 Highlighting {len(lines)} lines: first line {first_ms:.2f} ms, "
+        f"all {total_ms:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Synthetic task files for parser regression tests and benchmarks
+
+Large files mix every marker style the parser accepts; adversarial cases
+cover the inputs most likely to break it. Everything is deterministic.
+Run: python -m benchmarks.corpus   (rewrites test_data/golden/*.json)
+"""
+
+import glob
+import json
+import os
+import random
+
+from core.parser import parse_tasks_from_content, read_task_file
+
+GOLDEN_DIR = os.path.join("test_data", "golden")
+TASK_FILES = sorted(glob.glob(os.path.join("tasks", "task_*.txt")))
+
+_WORDS = (
+    "створити функцію яка приймає List чисел та повертає середнє значення "
+    "вивести на екран квадрат знайти мін число видалити дублікати замінити "
+    "кожне значення написати програму class Human name age"
+).split()
+
+_MARKERS = ("{n}) ", "{n}. ", "– ", "* ", "- ")
+
+
+def _sentence(rng, words=8):
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, words)))
+
+
+def large_file(tasks=1000, seed=0):
+    """Task file with `tasks` tasks under headers, separators and prose"""
+    rng = random.Random(seed)
+    lines = []
+    for n in range(1, tasks + 1):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append("#" * rng.randint(3, 80))
+        elif roll < 0.15:
+            lines.append(rng.choice(("function", "list comprehension", "class")))
+        elif roll < 0.25:
+            lines.append("")
+        marker = rng.choice(_MARKERS).format(n=n)
+        lines.append(" " * rng.randint(0, 4) + marker + _sentence(rng))
+    return "\n".join(lines)
+
+
+def adversarial_cases():
+    """{name: content} of inputs that stress the line classifier"""
+    return {
+        "deep_bullets": "\n".join(
+            "  " * depth + marker + f"level {depth}"
+            for depth in range(12)
+            for marker in ("– ", "- ", "* ")
+        ),
+        "mixed_markers": "1) перше\n2. друге\n– третє\n* четверте\n- п'яте\n3) шосте",
+        "empty_markers": "1)\n2.\n–\n*\n-\n3) real task",
+        "crlf": "1) first\r\n2) second\r\n– third\r\n",
+        "numbers_out_of_order": "10) ten\n2) two\n10) ten again\n– bullet",
+        "keyword_lines": "Треба вивести список\nЗНАЙТИ максимум\nпросто текст",
+        "separators_only": "#####\n###\n#\n",
+        "unicode_dashes": "— em dash\n‐ hyphen\n− minus\n– en dash",
+        "bom_prefix": "﻿1) with bom\n2) after bom",
+        "whitespace_only": "   \n\t\n   \n",
+        "long_line": "1) " + "x" * 20000,
+        "digits_without_marker": "2024 рік\n12 завдань\n1)2)3) packed",
+    }
+
+
+def golden_inputs():
+    """{name: content} for every golden case: real task files + adversarial"""
+    cases = {
+        os.path.splitext(os.path.basename(path))[0]: read_task_file(path)
+        for path in TASK_FILES
+    }
+    cases.update(adversarial_cases())
+    return cases
+
+
+def golden_path(name):
+    return os.path.join(GOLDEN_DIR, f"{name}.json")
+
+
+def write_goldens():
+    """Record the current parser output as the expected output"""
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    cases = golden_inputs()
+    for name, content in cases.items():
+        tasks = parse_tasks_from_content(content)
+        # One task per line keeps golden diffs readable
+        rows = ",\n".join(" " + json.dumps(task, ensure_ascii=False) for task in tasks)
+        with open(golden_path(name), "w", encoding="utf-8") as f:
+            f.write(f"[\n{rows}\n]\n" if rows else "[]\n")
+    return len(cases)
+
+
+if __name__ == "__main__":
+    print(f"✅ {write_goldens()} golden files written to {GOLDEN_DIR}")
@@ -0,0 +1,302 @@
+"""
+Compressed archives of generated code for moving between machines.
+
+One file replaces thousands of small .py files: a header naming the codec,
+then a compressed JSON Lines stream whose first line is the manifest and
+every other line one GeneratedCode or GenerationResult record. zstd is
+used when the zstandard package is installed, xz (lzma) otherwise.
+Imports decompress as they read and load code straight into the blob store;
+every save keeps its original timestamp, so importing an archive twice
+records nothing new.
+
+Usage:
+    python -m core.archive export solutions.genarc [--from generated_code demo_files]
+        [--results results.jsonl]
+    python -m core.archive import solutions.genarc [--dest generated_code]
+        [--results results.jsonl]
+    python -m core.archive info solutions.genarc
+"""
+
+import argparse
+import io
+import json
+import lzma
+import os
+import re
+import struct
+import tempfile
+from datetime import datetime
+from itertools import islice
+
+from core.blob_store import BlobStore
+from core.models import GeneratedCode, GenerationResult
+from core.records import GeneratedCodeRecord, GenerationRecord
+from core.writer import content_hash
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"GENARC01"
+# magic, codec
+_HEADER = struct.Struct("<8sB")
+CODECS = {"xz": 1, "zstd": 2}
+VERSION = 1
+IMPORT_CHUNK = 256
+
+# CodeWriter names end in a content hash, legacy names in a timestamp
+_TASK_FILE_RE = re.compile(r"^task_(\d+)_(.+?)(?:_[0-9a-f]{12}|_\d{8}_\d{6})?\.py$")
+# Blob store manifest timestamps
+STAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+def default_codec():
+    return "zstd" if zstandard is not None else "xz"
+
+
+def _compressor(f, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd needs the zstandard package")
+        return zstandard.ZstdCompressor(level=10).stream_writer(f, closefd=False)
+    return lzma.LZMAFile(f, "wb", preset=6)
+
+
+def _decompressor(f, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Archive is zstd-compressed; install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(f, closefd=False)
+    return lzma.LZMAFile(f, "rb")
+
+
+def code_files(directory, locale="en"):
+    """(record, model, filename, created_at) for every .py file in a directory"""
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".py"):
+            continue
+        filepath = os.path.join(directory, filename)
+        with open(filepath, encoding="utf-8") as f:
+            code = f.read()
+        mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
+        match = _TASK_FILE_RE.match(filename)
+        task_number = int(match.group(1)) if match else 0
+        description = match.group(2) if match else filename[:-3]
+        record = GeneratedCodeRecord(locale, task_number, description, code)
+        yield record, None, filename, mtime.strftime(STAMP_FORMAT)
+
+
+def store_records(store: BlobStore):
+    """(record, model, filename, created_at) for the newest save of every
+    task/language/model"""
+    latest = {}
+    for entry in store.entries():
+        latest[(entry["task_id"], entry["language"], entry["model"])] = entry
+    for entry in latest.values():
+        record = GeneratedCodeRecord(
+            entry["language"],
+            entry["task_id"],
+            entry["task_name"],
+            store.get_blob(entry["blob"]),
+        )
+        yield record, entry["model"], BlobStore.legacy_name(entry), entry["created_at"]
+
+
+def result_records(path):
+    """GenerationRecord for every GenerationResult line of a JSONL file"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                model = GenerationResult.model_validate_json(line)
+                yield GenerationRecord.from_model(model)
+
+
+def write_results(path, results):
+    """Append GenerationRecord results to a JSONL file"""
+    with open(path, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(result.to_model().model_dump_json() + "\n")
+
+
+def write_archive(path, codes, results=(), codec=None, sources=()):
+    """Write (record, model, filename, created_at) codes and GenerationRecord
+    results, returns the manifest"""
+    codec = codec or default_codec()
+    codes = list(codes)
+    results = list(results)
+    manifest = {
+        "version": VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "codec": codec,
+        "codes": len(codes),
+        "results": len(results),
+        "sources": list(sources),
+    }
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            raw.write(_HEADER.pack(MAGIC, CODECS[codec]))
+            with _compressor(raw, codec) as stream:
+                stream.write(json.dumps(manifest).encode("utf-8") + b"\n")
+                for record, model, filename, created_at in codes:
+                    line = {
+                        "kind": "code",
+                        "name": filename,
+                        "model": model,
+                        "created_at": created_at,
+                        "blob": content_hash(record.code),
+                        "record": record.to_model().model_dump(mode="json"),
+                    }
+                    stream.write(json.dumps(line, ensure_ascii=False).encode("utf-8"))
+                    stream.write(b"\n")
+                for result in results:
+                    line = {"kind": "result", "record": result.to_model().model_dump()}
+                    stream.write(json.dumps(line, ensure_ascii=False).encode("utf-8"))
+                    stream.write(b"\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return manifest
+
+
+def read_archive(path):
+    """Yield the manifest, then ("code", record, model, filename, created_at)
+    and ("result", record, None, None, None) tuples, decompressing as it goes"""
+    with open(path, "rb") as raw:
+        magic, codec_id = _HEADER.unpack(raw.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a generation archive: {path}")
+        codec = {v: k for k, v in CODECS.items()}.get(codec_id)
+        if codec is None:
+            raise ValueError(f"Unknown archive codec: {codec_id}")
+        with _decompressor(raw, codec) as stream:
+            lines = io.TextIOWrapper(io.BufferedReader(stream), encoding="utf-8")
+            yield json.loads(next(lines))
+            for line in lines:
+                item = json.loads(line)
+                if item["kind"] == "result":
+                    model = GenerationResult.model_validate(item["record"])
+                    record = GenerationRecord.from_model(model)
+                    yield "result", record, None, None, None
+                    continue
+                model = GeneratedCode.model_validate(item["record"])
+                if content_hash(model.code) != item["blob"]:
+                    raise ValueError(f"Corrupt record in archive: {item['name']}")
+                record = GeneratedCodeRecord.from_model(model)
+                yield "code", record, item["model"], item["name"], item.get(
+                    "created_at"
+                )
+
+
+def import_archive(path, store: BlobStore, dest=None, model="imported"):
+    """Load an archive's code into the store (and dest dir, if given).
+    Returns (manifest, code count, GenerationRecord results)"""
+    items = read_archive(path)
+    manifest = next(items)
+    # Archives without per-file times date every save at export time
+    exported_at = datetime.fromisoformat(manifest["created_at"]).strftime(STAMP_FORMAT)
+    if dest:
+        os.makedirs(dest, exist_ok=True)
+    imported = 0
+    results = []
+
+    def saves():
+        for kind, record, record_model, filename, created_at in items:
+            if kind == "result":
+                results.append(record)
+                continue
+            if dest:
+                _write_new(os.path.join(dest, os.path.basename(filename)), record.code)
+            yield (
+                record.code,
+                record.task_number,
+                record.task_description,
+                record.locale,
+                record_model or model,
+                created_at or exported_at,
+            )
+
+    pending = saves()
+    while chunk := list(islice(pending, IMPORT_CHUNK)):
+        imported += store.put_many(chunk)
+    return manifest, imported, results
+
+
+def _write_new(filepath, code):
+    # Content-addressed names: an existing file already holds this code
+    if os.path.exists(filepath):
+        return
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(code)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generation archives")
+    parser.add_argument("--root", default=os.path.join("generated_code", ".store"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Write an archive")
+    export_parser.add_argument("archive")
+    export_parser.add_argument(
+        "--from",
+        dest="sources",
+        nargs="*",
+        default=["generated_code", "demo_files"],
+        help="Directories of .py files to include",
+    )
+    export_parser.add_argument(
+        "--store", action="store_true", help="Also include the blob store"
+    )
+    export_parser.add_argument(
+        "--results", nargs="*", default=[], help="GenerationResult JSONL files"
+    )
+    export_parser.add_argument("--codec", choices=sorted(CODECS))
+    export_parser.add_argument("--locale", choices=["en", "uk", "ru"], default="en")
+    import_parser = commands.add_parser("import", help="Load an archive")
+    import_parser.add_argument("archive")
+    import_parser.add_argument("--dest", help="Also write the .py files here")
+    import_parser.add_argument(
+        "--results", help="Append the archive's results to this JSONL file"
+    )
+    info_parser = commands.add_parser("info", help="Show an archive's manifest")
+    info_parser.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        manifest = next(read_archive(args.archive))
+        for key, value in manifest.items():
+            print(f"   {key}: {value}")
+        return
+
+    store = BlobStore(args.root)
+    try:
+        if args.command == "export":
+            codes = []
+            for directory in args.sources:
+                if os.path.isdir(directory):
+                    codes.extend(code_files(directory, args.locale))
+            if args.store:
+                codes.extend(store_records(store))
+            results = [r for path in args.results for r in result_records(path)]
+            manifest = write_archive(
+                args.archive, codes, results, codec=args.codec, sources=args.sources
+            )
+            size = os.path.getsize(args.archive)
+            print(
+                f"📦 {manifest['codes']} files and {manifest['results']} results"
+                f" -> {args.archive} ({size} bytes)"
+            )
+        else:
+            manifest, imported, results = import_archive(args.archive, store, args.dest)
+            if args.results:
+                write_results(args.results, results)
+            print(f"✅ Imported {imported} files and {len(results)} results")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Content-addressed, deduplicated store for generated code.
+
+Code is kept once per SHA-256 digest as a zlib-compressed blob under
+objects/<2 hex>/<62 hex>; a small SQLite manifest maps every save
+(task, language, model, timestamp) to its blob.
+
+Usage:
+    python -m core.blob_store stats
+    python -m core.blob_store gc [--keep N] [--grace SECONDS]
+    python -m core.blob_store materialize [--task ID] [--dest DIR]
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from core.writer import atomic_write, content_hash, safe_task_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    task_name TEXT NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    blob TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_task ON generations (task_id);
+CREATE INDEX IF NOT EXISTS idx_generations_blob ON generations (blob);
+"""
+
+COLUMNS = "id, task_id, task_name, language, model, created_at, blob"
+
+
+class BlobStore:
+    """Hash -> compressed code blobs plus a SQLite manifest of saves"""
+
+    def __init__(self, root=os.path.join("generated_code", ".store")):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(root, "manifest.db"), check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    # Blobs
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def put_blob(self, code) -> str:
+        """Store code once, returns its digest"""
+        digest = content_hash(code)
+        path = self.blob_path(digest)
+        try:
+            # Fresh mtime: a gc() in another process honours its grace period
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            # New, or just removed by a gc() in another process: write it
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, zlib.compress(code.encode("utf-8")))
+        return digest
+
+    def get_blob(self, digest) -> str:
+        with open(self.blob_path(digest), "rb") as f:
+            return zlib.decompress(f.read()).decode("utf-8")
+
+    # Manifest
+
+    def put(self, code, task_id, task_name, language="en", model="gpt-4o") -> int:
+        """Record one save, returns the manifest entry id"""
+        created_at = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Blob and row under one lock so gc() never sees an unreferenced new blob
+        with self._lock, self._db:
+            digest = self.put_blob(code)
+            cursor = self._db.execute(
+                "INSERT INTO generations (task_id, task_name, language, model, created_at, blob)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, task_name, language, model, created_at, digest),
+            )
+        return cursor.lastrowid
+
+    def put_many(self, items) -> int:
+        """Record many (code, task_id, task_name, language, model[, created_at])
+        saves in one transaction, returns the number recorded.
+
+        A save that brings its own created_at (an import) is skipped when the
+        manifest already has it: same blob, task, language, model and time.
+        """
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with self._lock, self._db:
+            rows = []
+            seen = set()
+            for code, task_id, task_name, language, model, *stamp in items:
+                created_at = stamp[0] if stamp else now
+                digest = self.put_blob(code)
+                if stamp:
+                    key = (digest, task_id, language, model, created_at)
+                    if key in seen or self._recorded(*key):
+                        continue
+                    seen.add(key)
+                rows.append((task_id, task_name, language, model, created_at, digest))
+            self._db.executemany(
+                "INSERT INTO generations (task_id, task_name, language, model, created_at, blob)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def _recorded(self, digest, task_id, language, model, created_at):
+        row = self._db.execute(
+            "SELECT 1 FROM generations WHERE blob = ? AND task_id = ?"
+            " AND language = ? AND model = ? AND created_at = ? LIMIT 1",
+            (digest, task_id, language, model, created_at),
+        ).fetchone()
+        return row is not None
+
+    def entries(self, task_id=None):
+        """Manifest rows, oldest first"""
+        query = f"SELECT {COLUMNS} FROM generations"
+        params = ()
+        if task_id is not None:
+            query += " WHERE task_id = ?"
+            params = (task_id,)
+        with self._lock:
+            return self._db.execute(query + " ORDER BY id", params).fetchall()
+
+    def entry(self, entry_id):
+        with self._lock:
+            return self._db.execute(
+                f"SELECT {COLUMNS} FROM generations WHERE id = ?", (entry_id,)
+            ).fetchone()
+
+    def latest(self, task_id, language=None, model=None):
+        """Most recent entry for a task (optionally for one language/model)"""
+        query = f"SELECT {COLUMNS} FROM generations WHERE task_id = ?"
+        params = [task_id]
+        if language is not None:
+            query += " AND language = ?"
+            params.append(language)
+        if model is not None:
+            query += " AND model = ?"
+            params.append(model)
+        with self._lock:
+            return self._db.execute(
+                query + " ORDER BY id DESC LIMIT 1", params
+            ).fetchone()
+
+    # Compatibility view
+
+    @staticmethod
+    def legacy_name(entry):
+        """task_{id}_{name}_{ts}.py as written by the old save_code"""
+        name = safe_task_name(entry["task_name"])
+        return f"task_{entry['task_id']}_{name}_{entry['created_at']}.py"
+
+    def materialize(self, entry, dest_dir="generated_code"):
+        """Write one manifest entry as a legacy-named file, returns its path.
+        Another save of the task in the same second gets an _<entry id> suffix"""
+        if isinstance(entry, int):
+            entry = self.entry(entry)
+        os.makedirs(dest_dir, exist_ok=True)
+        code = self.get_blob(entry["blob"])
+        filepath = os.path.join(dest_dir, self.legacy_name(entry))
+        if os.path.exists(filepath):
+            with open(filepath, encoding="utf-8") as f:
+                if f.read() == code:
+                    return filepath
+            filepath = f"{filepath[:-3]}_{entry['id']}.py"
+        # An interrupted write never leaves a truncated .py file behind
+        return atomic_write(filepath, code.encode("utf-8"))
+
+    # Maintenance
+
+    def gc(self, keep=None, grace=0.0):
+        """Drop all but the newest `keep` entries per task/language/model,
+        then delete blobs no entry references. Files younger than `grace`
+        seconds are kept, since another process may be about to reference
+        them. Returns (entries, blobs) removed."""
+        removed_entries = 0
+        cutoff = time.time() - grace
+        with self._lock, self._db:
+            if keep is not None:
+                cursor = self._db.execute(
+                    """
+                    DELETE FROM generations WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY task_id, language, model ORDER BY id DESC
+                            ) AS rank FROM generations
+                        ) WHERE rank > ?
+                    )
+                    """,
+                    (keep,),
+                )
+                removed_entries = cursor.rowcount
+            referenced = {
+                row[0]
+                for row in self._db.execute("SELECT DISTINCT blob FROM generations")
+            }
+
+            removed_blobs = 0
+            for shard in os.listdir(self.objects_dir):
+                shard_dir = os.path.join(self.objects_dir, shard)
+                for name in os.listdir(shard_dir):
+                    path = os.path.join(shard_dir, name)
+                    if shard + name in referenced:
+                        continue
+                    if grace and os.path.getmtime(path) > cutoff:
+                        continue
+                    os.remove(path)
+                    removed_blobs += not name.startswith(".tmp-")
+                if not os.listdir(shard_dir):
+                    os.rmdir(shard_dir)
+        return removed_entries, removed_blobs
+
+    def stats(self):
+        """Entry count, blob count and compressed bytes on disk"""
+        blobs = 0
+        size = 0
+        for shard in os.listdir(self.objects_dir):
+            shard_dir = os.path.join(self.objects_dir, shard)
+            for name in os.listdir(shard_dir):
+                # Leftovers of interrupted writes are not blobs
+                if name.startswith(".tmp-"):
+                    continue
+                blobs += 1
+                size += os.path.getsize(os.path.join(shard_dir, name))
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+        return {"entries": entries, "blobs": blobs, "bytes": size}
+
+
+_default_store = None
+
+
+def default_store():
+    """Process-wide store under generated_code/.store, opened on first use"""
+    global _default_store
+    if _default_store is None:
+        _default_store = BlobStore()
+    return _default_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generated code blob store")
+    parser.add_argument("--root", default=os.path.join("generated_code", ".store"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Show store size")
+    gc_parser = commands.add_parser("gc", help="Remove unreferenced blobs")
+    gc_parser.add_argument(
+        "--keep", type=int, help="Keep only the newest N saves per task"
+    )
+    gc_parser.add_argument(
+        "--grace",
+        type=float,
+        default=300.0,
+        help="Keep unreferenced files younger than this many seconds",
+    )
+    mat_parser = commands.add_parser(
+        "materialize", help="Write task_{id}_{name}_{ts}.py files"
+    )
+    mat_parser.add_argument("--task", type=int, help="Only this task id")
+    mat_parser.add_argument("--dest", default="generated_code")
+    args = parser.parse_args(argv)
+
+    store = BlobStore(args.root)
+    try:
+        if args.command == "stats":
+            stats = store.stats()
+            print(f"📦 Entries: {stats['entries']}")
+            print(f"🧱 Blobs: {stats['blobs']}")
+            print(f"💾 Size: {stats['bytes']} bytes")
+        elif args.command == "gc":
+            entries, blobs = store.gc(args.keep, args.grace)
+            print(f"🧹 Removed {entries} entries and {blobs} blobs")
+        elif args.command == "materialize":
+            for entry in store.entries(args.task):
+                print(f"✅ {store.materialize(entry, args.dest)}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Out-of-process execution of generated code
+
+run_code_cached() replays the captured result of an earlier identical run
+(same code, stdin script and interpreter) unless the code can behave
+differently from run to run.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+
+
+@dataclass(slots=True)
+class ExecutionResult:
+    stdout: str
+    stderr: str
+    returncode: int
+    duration: float
+    timed_out: bool = False
+    # Replayed from the execution cache instead of run
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def error_summary(self, max_lines=8) -> str:
+        """Tail of the traceback (or a timeout note)"""
+        if self.timed_out:
+            return f"Timed out after {self.duration:.1f} seconds"
+        lines = self.stderr.strip().splitlines()
+        return "\n".join(lines[-max_lines:])
+
+
+def run_code(code, stdin="", timeout=10.0, pool=None) -> ExecutionResult:
+    """Run code in a fresh isolated interpreter, feeding stdin and capturing output.
+    With a core.interpreter_pool.InterpreterPool, run it on a warm worker instead"""
+    if pool is not None:
+        return pool.run(code, stdin, timeout)
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-I", "-X", "utf8", "-c", code],
+            input=stdin,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as e:
+        return ExecutionResult(
+            stdout=e.stdout.decode("utf-8", "replace") if e.stdout else "",
+            stderr=e.stderr.decode("utf-8", "replace") if e.stderr else "",
+            returncode=-1,
+            duration=time.perf_counter() - start,
+            timed_out=True,
+        )
+    return ExecutionResult(
+        stdout=completed.stdout,
+        stderr=completed.stderr,
+        returncode=completed.returncode,
+        duration=time.perf_counter() - start,
+    )
+
+
+# Imports and calls whose results differ between runs
+NONDETERMINISTIC_MODULES = frozenset(
+    {"random", "secrets", "time", "datetime", "uuid", "os", "tempfile", "platform"}
+)
+NONDETERMINISTIC_CALLS = frozenset({"id", "hash", "open"})
+
+
+def nondeterminism(code, stdin="") -> list:
+    """Reasons code may not give the same output twice (empty = deterministic)"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        # Fails the same way every time
+        return []
+    reasons = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name.split(".")[0] for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules = [node.module.split(".")[0]]
+        else:
+            modules = []
+        reasons.extend(f"imports {m}" for m in modules if m in NONDETERMINISTIC_MODULES)
+        if isinstance(node, ast.Call):
+            name = getattr(node.func, "id", None)
+            if name in NONDETERMINISTIC_CALLS:
+                reasons.append(f"calls {name}()")
+            elif name == "input" and not stdin:
+                reasons.append("reads input without a stdin script")
+    return list(dict.fromkeys(reasons))
+
+
+def execution_key(code, stdin="") -> str:
+    """Hash of code, stdin script and interpreter version"""
+    payload = "\0".join((code, stdin, sys.version, sys.executable))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExecutionCache:
+    """LRU of execution results, optionally persisted as one JSON file per key"""
+
+    def __init__(self, directory=None, max_size=512):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key) -> ExecutionResult | None:
+        with self._lock:
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+        if result is None and self.directory:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    result = ExecutionResult(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                result = None
+            if result is not None:
+                self._remember(key, result)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._items[key] = result
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def put(self, key, result: ExecutionResult):
+        self._remember(key, result)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(result), f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+
+
+_default_cache = None
+
+
+def default_cache() -> ExecutionCache:
+    """Process-wide in-memory cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExecutionCache()
+    return _default_cache
+
+
+def run_code_cached(
+    code, stdin="", timeout=10.0, cache=None, pool=None
+) -> ExecutionResult:
+    """run_code(), replayed from the cache for deterministic code"""
+    if nondeterminism(code, stdin):
+        return run_code(code, stdin, timeout, pool)
+    cache = cache or default_cache()
+    key = execution_key(code, stdin)
+    result = cache.get(key)
+    if result is not None:
+        return replace(result, cached=True)
+    result = run_code(code, stdin, timeout, pool)
+    # A timeout says more about the machine than about the code
+    if not result.timed_out:
+        cache.put(key, result)
+    return result
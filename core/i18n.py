@@ -0,0 +1,231 @@
+"""
+Precompiled UI message catalog.
+
+A build step extracts every static UI string from the entry points,
+translates it once per locale and packs the result into one binary file.
+At runtime the catalog is opened with a single mmap and looked up in place
+(binary search over a sorted entry table), so UI text never needs the LLM.
+
+Usage:
+    python -m core.i18n build [--stub] [--out locale/messages.cat]
+    python -m core.i18n list
+"""
+
+import argparse
+import ast
+import mmap
+import os
+import struct
+
+LOCALES = ("en", "uk", "ru")
+DEFAULT_PATH = os.path.join("locale", "messages.cat")
+SOURCES = ("main.py", "main_simple.py")
+# Functions whose string-literal second argument is a UI text
+TRANSLATE_CALLS = ("ai_translate", "ai_localize")
+
+MAGIC = b"MSGCAT01"
+# magic, entry count, locale count
+_HEADER = struct.Struct("<8sII")
+_LOCALE = struct.Struct("<8s")
+_SPAN = struct.Struct("<II")
+# Span of a text the build could not translate; lookups treat it as a miss
+_MISSING = (0xFFFFFFFF, 0)
+
+
+def extract_strings(paths=SOURCES):
+    """Static UI strings from get_ui_messages dicts and translate calls, in order"""
+    found = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name == "get_ui_messages":
+                for inner in ast.walk(node):
+                    if isinstance(inner, ast.Dict):
+                        for value in inner.values:
+                            if isinstance(value, ast.Constant) and isinstance(
+                                value.value, str
+                            ):
+                                found.setdefault(value.value, None)
+            elif isinstance(node, ast.Call) and len(node.args) >= 2:
+                name = getattr(node.func, "id", None)
+                text = node.args[1]
+                if (
+                    name in TRANSLATE_CALLS
+                    and isinstance(text, ast.Constant)
+                    and isinstance(text.value, str)
+                ):
+                    found.setdefault(text.value, None)
+    return list(found)
+
+
+def write_catalog(path, translations, locales=LOCALES):
+    """Pack {source: {locale: text}} into the binary catalog format.
+    Locales without a text (or with None) are stored as missing"""
+    entries = sorted(translations.items(), key=lambda item: item[0].encode("utf-8"))
+    pool = bytearray()
+    spans = {}
+
+    def intern(text):
+        data = text.encode("utf-8")
+        if data not in spans:
+            spans[data] = (len(pool), len(data))
+            pool.extend(data)
+        return spans[data]
+
+    table = bytearray()
+    for source, by_locale in entries:
+        table += _SPAN.pack(*intern(source))
+        for locale in locales:
+            text = by_locale.get(locale)
+            table += _SPAN.pack(*(_MISSING if text is None else intern(text)))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(entries), len(locales)))
+        for locale in locales:
+            f.write(_LOCALE.pack(locale.encode("ascii")))
+        f.write(table)
+        f.write(pool)
+    os.replace(tmp_path, path)
+
+
+class Catalog:
+    """Read-only mmap view of a compiled catalog"""
+
+    def __init__(self, path=None):
+        self._mmap = None
+        self.count = 0
+        self.locales = ()
+        if path and os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count, locale_count = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"Not a message catalog: {path}")
+            pos = _HEADER.size
+            self.locales = tuple(
+                _LOCALE.unpack_from(self._mmap, pos + i * _LOCALE.size)[0]
+                .rstrip(b"\0")
+                .decode("ascii")
+                for i in range(locale_count)
+            )
+            self._table = pos + locale_count * _LOCALE.size
+            self._row = _SPAN.size * (1 + locale_count)
+            self._pool = self._table + self.count * self._row
+
+    def __len__(self):
+        return self.count
+
+    def _span(self, row, column):
+        offset, length = _SPAN.unpack_from(
+            self._mmap, self._table + row * self._row + column * _SPAN.size
+        )
+        if (offset, length) == _MISSING:
+            return None
+        start = self._pool + offset
+        return self._mmap[start : start + length]
+
+    def get(self, text, locale):
+        """Translation of text, or None if the catalog doesn't have it"""
+        if self._mmap is None or locale not in self.locales:
+            return None
+        key = text.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            source = self._span(mid, 0)
+            if source < key:
+                low = mid + 1
+            elif source > key:
+                high = mid
+            else:
+                translated = self._span(mid, 1 + self.locales.index(locale))
+                return None if translated is None else translated.decode("utf-8")
+        return None
+
+
+_default_catalog = None
+
+
+def catalog():
+    """Process-wide catalog from locale/messages.cat (empty if not built)"""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = Catalog(DEFAULT_PATH)
+    return _default_catalog
+
+
+def reset_catalog(path=None):
+    """Replace the process-wide catalog (None = empty)"""
+    global _default_catalog
+    _default_catalog = Catalog(path)
+
+
+def build(out=DEFAULT_PATH, translate=None, sources=SOURCES):
+    """Extract, translate for every locale and compile.
+
+    A translation that fails (None, an exception, or the English text
+    handed back unchanged, which is what ai_translate does on error) is
+    stored as missing, so the runtime still asks the LLM for it.
+    Returns (entry count, missing translations).
+    """
+    translations = {}
+    missing = 0
+    for text in extract_strings(sources):
+        translations[text] = {"en": text}
+        for locale in LOCALES:
+            if locale == "en":
+                continue
+            try:
+                translated = translate(text, locale) if translate else None
+            except Exception:
+                translated = None
+            if translated is None or translated == text:
+                missing += 1
+                continue
+            translations[text][locale] = translated
+    write_catalog(out, translations)
+    return len(translations), missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UI message catalog")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Translate and compile")
+    build_parser.add_argument("--out", default=DEFAULT_PATH)
+    build_parser.add_argument(
+        "--stub", action="store_true", help="No LLM: English only, others missing"
+    )
+    commands.add_parser("list", help="Show extracted UI strings")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for text in extract_strings():
+            print(text)
+        return
+
+    translate = None
+    if not args.stub:
+        from agents.client import create_llm
+        from agents.scheduler import BATCH, job
+        from core.i18n import reset_catalog
+        from main import ai_translate
+
+        # Translate from scratch, not from a previously built catalog
+        reset_catalog()
+        llm = create_llm()
+
+        def translate(text, locale):
+            with job(BATCH, user="i18n"):
+                return ai_translate(llm, text, locale)
+
+    count, missing = build(args.out, translate)
+    print(f"✅ {count} messages x {len(LOCALES)} locales -> {args.out}")
+    if missing:
+        print(f"⚠️ {missing} translations failed; they are left to the LLM at runtime")
+
+
+if __name__ == "__main__":
+    main()
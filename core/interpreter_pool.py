@@ -0,0 +1,192 @@
+"""
+Pool of pre-warmed interpreters for running generated code out of process.
+
+Each worker is a `python -I` process (core/pool_worker.py) that has already
+imported the standard library modules tasks commonly use. Code and stdin go
+to it over a pipe and the result comes back as an ExecutionResult, so a run
+costs a fork and a pipe round-trip instead of a full interpreter start.
+Used as the `pool=` backend of core.execution.run_code().
+"""
+
+import atexit
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from core.execution import ExecutionResult, run_code
+from core.pool_worker import read_frame, write_frame
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pool_worker.py")
+PREIMPORT = (
+    "collections",
+    "datetime",
+    "decimal",
+    "fractions",
+    "functools",
+    "itertools",
+    "json",
+    "math",
+    "random",
+    "re",
+    "statistics",
+    "string",
+    "textwrap",
+    "traceback",
+    "typing",
+)
+# Extra time before a worker that missed its own timeout is killed
+GRACE = 2.0
+# Tries to start a replacement worker before the pool gives up
+RESPAWN_ATTEMPTS = 3
+
+
+class _Worker:
+    def __init__(self, modules):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-I", "-X", "utf8", WORKER_PATH, ",".join(modules)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=os.name == "posix",
+        )
+        self.single_use = None
+
+    def wait_ready(self):
+        if self.single_use is None:
+            hello = read_frame(self.proc.stdout)
+            if not hello or not hello.get("ready"):
+                raise RuntimeError("Interpreter pool worker failed to start")
+            self.single_use = not hello["fork"]
+
+    def kill(self):
+        try:
+            if os.name == "posix":
+                # The worker leads its own session, so forked children go too
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            else:
+                self.proc.kill()
+        except OSError:
+            pass
+        self.proc.wait()
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+class InterpreterPool:
+    """`size` warm workers; run() borrows one per call.
+
+    If a dead worker cannot be replaced, the pool closes itself and `failed`
+    holds the error; run() then falls back to a fresh interpreter per call.
+    """
+
+    def __init__(self, size=2, modules=PREIMPORT):
+        self.size = size
+        self.modules = tuple(modules)
+        self.failed = None
+        self._idle = queue.Queue()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(_Worker(self.modules))
+
+    def _replace(self, worker):
+        worker.kill()
+        for attempt in range(RESPAWN_ATTEMPTS):
+            if self._closed:
+                return
+            try:
+                self._idle.put(_Worker(self.modules))
+                return
+            except OSError as e:
+                error = e
+                time.sleep(0.1 * 2**attempt)
+        self.failed = error
+        self.close()
+
+    def run(self, code, stdin="", timeout=10.0) -> ExecutionResult:
+        """Same contract as run_code(), on a warm worker"""
+        if self.failed is not None:
+            return run_code(code, stdin, timeout)
+        if self._closed:
+            raise RuntimeError("Interpreter pool is closed")
+        try:
+            worker = self._idle.get(timeout=timeout + GRACE)
+        except queue.Empty:
+            # Every worker is busy or being respawned; don't queue behind them
+            return run_code(code, stdin, timeout)
+        start = time.perf_counter()
+        reply = {}
+        errors = []
+
+        def exchange():
+            try:
+                worker.wait_ready()
+                request = {"code": code, "stdin": stdin, "timeout": timeout}
+                write_frame(worker.proc.stdin, request)
+                reply.update(read_frame(worker.proc.stdout) or {})
+            except (OSError, ValueError, RuntimeError) as e:
+                errors.append(e)
+
+        exchanger = threading.Thread(target=exchange, daemon=True)
+        try:
+            exchanger.start()
+            exchanger.join(timeout + GRACE)
+        finally:
+            healthy = reply and not exchanger.is_alive() and not worker.single_use
+            if healthy and self._closed:
+                worker.close()
+            elif healthy:
+                self._idle.put(worker)
+            else:
+                # Respawn off the caller's path; the new worker warms up meanwhile
+                threading.Thread(target=self._replace, args=(worker,)).start()
+
+        duration = time.perf_counter() - start
+        if exchanger.is_alive():
+            return ExecutionResult("", "", -1, duration, timed_out=True)
+        if not reply:
+            error = errors[0] if errors else "Interpreter pool worker exited"
+            return ExecutionResult("", f"{error}\n", -1, duration)
+        return ExecutionResult(
+            stdout=reply["stdout"],
+            stderr=reply["stderr"],
+            returncode=reply["returncode"],
+            duration=duration,
+            timed_out=reply.get("timed_out", False),
+        )
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> InterpreterPool:
+    """Process-wide pool, started on first use and closed at exit"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = InterpreterPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,169 @@
+"""
+Incremental, tolerant JSON extraction from LLM output.
+
+Finds the first JSON array or object in a (possibly streamed) response,
+skipping prose and markdown fences, and hands out array items as soon as
+each one is complete. Broken items are skipped instead of failing the
+whole response, and items parsed before a truncated ending are kept.
+"""
+
+import ast
+import json
+import re
+from typing import Any, List
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Everything loads_lenient can raise on bad input: ast.literal_eval also
+# fails with TypeError (unhashable keys), MemoryError and RecursionError
+PARSE_ERRORS = (ValueError, SyntaxError, TypeError, MemoryError, RecursionError)
+
+
+def loads_lenient(text) -> Any:
+    """json.loads (raw newlines in strings allowed), then trailing-comma
+    cleanup, then Python literal syntax"""
+    try:
+        return json.loads(text, strict=False)
+    except json.JSONDecodeError:
+        pass
+    cleaned = _TRAILING_COMMA.sub(r"\1", text)
+    try:
+        return json.loads(cleaned, strict=False)
+    except json.JSONDecodeError:
+        pass
+    # Single quotes, True/False/None as models sometimes write them
+    return ast.literal_eval(cleaned)
+
+
+class JsonStreamExtractor:
+    """Feed text chunks, get completed items of the first JSON value back"""
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.errors = 0
+        self.done = False
+        self.yielded = 0
+        self._reset_root()
+
+    def _reset_root(self):
+        self.root_start = None
+        self.root_kind = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.item_start = None
+
+    def _restart_after_root(self):
+        """The bracket we locked onto was prose - resume scanning after it"""
+        self.pos = self.root_start + 1
+        self._reset_root()
+
+    def _emit(self, text, out):
+        """Parse one item; returns False if it was unusable"""
+        text = text.strip()
+        if not text:
+            return True
+        try:
+            value = loads_lenient(text)
+        except PARSE_ERRORS:
+            self.errors += 1
+            return False
+        out.append(value)
+        self.yielded += 1
+        return True
+
+    def feed(self, chunk) -> List[Any]:
+        """Add text; returns array items (or the object) completed by it"""
+        out: List[Any] = []
+        if self.done:
+            return out
+        self.buf += chunk
+        buf = self.buf
+
+        while self.pos < len(buf):
+            pos = self.pos
+            c = buf[pos]
+            self.pos += 1
+
+            if self.root_start is None:
+                if c in "[{":
+                    self.root_start = pos
+                    self.root_kind = c
+                    self.depth = 1
+                continue
+
+            in_array = self.root_kind == "["
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                continue
+
+            if c == '"':
+                self.in_string = True
+                if in_array and self.depth == 1 and self.item_start is None:
+                    self.item_start = pos
+            elif c in "[{":
+                if in_array and self.depth == 1 and self.item_start is None:
+                    self.item_start = pos
+                self.depth += 1
+            elif c in "]}":
+                self.depth -= 1
+                if self.depth == 0:
+                    if in_array:
+                        if self.item_start is not None:
+                            if not self._emit(buf[self.item_start : pos], out):
+                                if not self.yielded:
+                                    self._restart_after_root()
+                                    continue
+                    elif not self._emit(buf[self.root_start : pos + 1], out):
+                        self._restart_after_root()
+                        continue
+                    self.done = True
+                    return out
+            elif in_array and self.depth == 1:
+                if c == ",":
+                    if self.item_start is not None:
+                        ok = self._emit(buf[self.item_start : pos], out)
+                        self.item_start = None
+                        if not ok and not self.yielded:
+                            self._restart_after_root()
+                elif self.item_start is None and not c.isspace():
+                    self.item_start = pos
+        return out
+
+    def finish(self) -> List[Any]:
+        """End of stream: salvage a truncated last item if it still parses"""
+        out: List[Any] = []
+        if self.done or self.root_start is None:
+            return out
+        if self.root_kind == "[" and self.item_start is not None:
+            tail = self.buf[self.item_start :]
+            # A truncated object may still be closable
+            for suffix in ("", "}", '"}', "]}", '"]}'):
+                try:
+                    out.append(loads_lenient(tail.strip() + suffix))
+                    break
+                except PARSE_ERRORS:
+                    continue
+            else:
+                self.errors += 1
+        self.done = True
+        return out
+
+
+def extract_json(text, default=None) -> Any:
+    """First JSON array/object in text; a truncated array keeps its complete items"""
+    extractor = JsonStreamExtractor()
+    items = extractor.feed(text)
+    complete = extractor.done
+    items += extractor.finish()
+    if extractor.root_kind == "{":
+        return items[0] if items else default
+    if extractor.root_kind == "[" and (items or complete):
+        return items
+    return default
@@ -0,0 +1,210 @@
+"""
+In-process metrics: counters, gauges and histograms with labels.
+
+Rendered in Prometheus text format, served over HTTP or dumped to a file.
+
+Environment:
+    LLM_METRICS_FILE  write the metrics to this file at exit
+    LLM_METRICS_PORT  serve /metrics on this port while the process runs
+"""
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Labels describing the LLM call in progress (call site, language, ...)
+_call_labels: ContextVar[dict] = ContextVar("call_labels", default={})
+
+
+@contextmanager
+def call_site(name, **labels):
+    """Label LLM calls made inside this block with a call site (and language)"""
+    token = _call_labels.set({**_call_labels.get(), "call_site": name, **labels})
+    try:
+        yield
+    finally:
+        _call_labels.reset(token)
+
+
+def current_labels() -> dict:
+    return dict(_call_labels.get())
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def render(self):
+        for key, value in self.items():
+            yield f"{self.name}{_format_labels(key)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            counts = list(counts)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def summary(self, **labels):
+        """(count, sum) for one label set"""
+        with self._lock:
+            _, total, count = self._values.get(_label_key(labels), (None, 0.0, 0))
+        return count, total
+
+    def render(self):
+        for key, (counts, total, count) in self.items():
+            for bound, bucket_count in zip(self.buckets, counts):
+                le = (("le", f"{bound:g}"),)
+                yield f"{self.name}_bucket{_format_labels(key, le)} {bucket_count}"
+            inf = (("le", "+Inf"),)
+            yield f"{self.name}_bucket{_format_labels(key, inf)} {count}"
+            yield f"{self.name}_sum{_format_labels(key)} {total}"
+            yield f"{self.name}_count{_format_labels(key)} {count}"
+
+
+class Registry:
+    """Named metrics plus collectors that refresh gauges at render time"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, help_text="") -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text="") -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, fn):
+        """fn() is called before every render to update gauges"""
+        self._collectors.append(fn)
+
+    def metrics(self):
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve /metrics from a daemon thread; returns the server"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+REGISTRY = Registry()
+
+
+def setup_from_env(registry=REGISTRY):
+    """Honour LLM_METRICS_FILE / LLM_METRICS_PORT"""
+    path = os.environ.get("LLM_METRICS_FILE")
+    if path:
+        atexit.register(registry.dump, path)
+    port = os.environ.get("LLM_METRICS_PORT")
+    if port:
+        registry.serve(int(port))
@@ -87,3 +87,7 @@ class GenerationResult(BaseModel):
     file_path: str | None = Field(description="Path to generated file")
     error_message: str | None = Field(description="Error message if failed")
     code_preview: str | None = Field(description="Preview of generated code")
+    attempts: int = Field(default=1, description="Generation/repair attempts made")
+    status: Literal["ok", "repaired", "failed"] = Field(
+        default="ok", description="Final status after the repair loop"
+    )
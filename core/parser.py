@@ -0,0 +1,128 @@
+"""
+Task file reading and parsing
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+def read_task_file(filepath):
+    """Read a task file as UTF-8 (BOM dropped) with cp1251 fallback"""
+    try:
+        with open(filepath, "r", encoding="utf-8-sig") as f:
+            return f.read()
+    except UnicodeDecodeError:
+        with open(filepath, "r", encoding="cp1251") as f:
+            return f.read()
+
+
+def iter_task_lines(content):
+    """Yield (line, task) for every non-empty stripped line in original order.
+
+    task is a (task_num, task_text) pair, or None for lines that are not tasks.
+    """
+    # A BOM left by Notepad would hide the first line's marker
+    lines = content.removeprefix("\ufeff").split("\n")
+    task_counter = 1
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Look for various task patterns
+        patterns = [
+            r"^(\d+)\)\s*(.*)",  # "1) task description"
+            r"^(\d+)\.\s*(.*)",  # "1. task description"
+            r"^–\s*(.*)",  # "– task description"
+            r"^\*\s*(.*)",  # "* task description"
+            r"^-\s*(.*)",  # "- task description"
+        ]
+
+        task_found = False
+        for pattern in patterns:
+            match = re.match(pattern, line)
+            if match:
+                if pattern.startswith(r"^(\d+)"):
+                    # Numbered task
+                    task_num = int(match.group(1))
+                    task_text = match.group(2)
+                else:
+                    # Bullet point task
+                    task_num = task_counter
+                    task_text = match.group(1)
+                    task_counter += 1
+
+                if task_text.strip():
+                    yield line, (task_num, task_text.strip())
+                else:
+                    yield line, None
+                task_found = True
+                break
+
+        # Also look for tasks that start with keywords
+        if not task_found:
+            keywords = [
+                "створити функцію",
+                "написати програму",
+                "вивести",
+                "знайти",
+                "видалити",
+                "замінити",
+            ]
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in keywords):
+                yield line, (task_counter, line)
+                task_counter += 1
+            else:
+                yield line, None
+
+
+def parse_tasks_from_content(content):
+    """Parse tasks from file content preserving original order"""
+    return [task for _, task in iter_task_lines(content) if task is not None]
+
+
+@dataclass(slots=True)
+class TaskSection:
+    title: str
+    context: List[str]
+    tasks: List[Tuple[int, str]]
+
+
+_HEADER_RE = re.compile(r"^[^\W\d_][\w \-]{0,39}$")
+
+
+def parse_sections(content, max_context=5):
+    """Group tasks into sections of consecutive tasks sharing the same context.
+
+    A section ends at any non-task text or where numbered tasks switch to
+    bullets (and back). The text before a section becomes its context; a
+    short header line such as "function" starts a fresh context.
+    """
+    sections = []
+    context = []
+    current = None
+    current_numbered = None
+
+    for line, task in iter_task_lines(content):
+        if task is None:
+            current = None
+            if set(line) <= {"#"}:
+                context = []
+            elif _HEADER_RE.match(line):
+                context = [line]
+            else:
+                context = (context + [line])[-max_context:]
+            continue
+        numbered = line[0].isdigit()
+        if current is None or numbered != current_numbered:
+            title = context[0] if context and _HEADER_RE.match(context[0]) else ""
+            current = TaskSection(title, context, [])
+            current_numbered = numbered
+            sections.append(current)
+            context = []
+        current.tasks.append(task)
+
+    return sections
@@ -0,0 +1,142 @@
+"""
+Warm interpreter for core.interpreter_pool.
+
+Started with `python -I <this file> <module,...>`: it imports the listed
+modules once, reports ready and then serves length-prefixed JSON requests
+on stdin. Where os.fork exists every request runs in a forked child, so
+runs share the warm imports but not each other's state; elsewhere the
+worker runs a single request and exits. Self-contained: -I keeps the
+project off sys.path.
+"""
+
+import importlib
+import io
+import json
+import os
+import signal
+import struct
+import sys
+import traceback
+
+_LENGTH = struct.Struct("<I")
+FORKING = hasattr(os, "fork")
+# Time code that swallows its timeout gets before the child is killed
+KILL_GRACE = 0.5
+
+
+class _TimedOut(BaseException):
+    """Raised inside the executed code when its time is up"""
+
+
+def _on_timeout(signum, frame):
+    # One chance only: if the code catches this, the next alarm kills it
+    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+    signal.setitimer(signal.ITIMER_REAL, KILL_GRACE)
+    raise _TimedOut
+
+
+def read_frame(stream):
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        return None
+    return json.loads(stream.read(_LENGTH.unpack(header)[0]))
+
+
+def write_frame(stream, data):
+    payload = json.dumps(data).encode("utf-8")
+    stream.write(_LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def execute(code, stdin):
+    """Reply for running code as __main__: stdout, stderr, returncode and
+    timed_out (output printed before a timeout is kept)"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.stdin = io.StringIO(stdin)
+    sys.stdout, sys.stderr = stdout, stderr
+    returncode = 0
+    timed_out = False
+    try:
+        exec(compile(code, "<string>", "exec"), {"__name__": "__main__"})
+    except _TimedOut:
+        returncode = -1
+        timed_out = True
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is not None:
+            stderr.write(f"{e.code}\n")
+            returncode = 1
+    except BaseException as e:
+        # Drop this function's frame so tracebacks match `python -c`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next, file=stderr)
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stdin, sys.stdout, sys.stderr = (
+            sys.__stdin__,
+            sys.__stdout__,
+            sys.__stderr__,
+        )
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "returncode": returncode,
+        "timed_out": timed_out,
+    }
+
+
+def run_forked(request):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, request["timeout"])
+        reply = execute(request["code"], request["stdin"])
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        with os.fdopen(write_fd, "wb") as out:
+            write_frame(out, reply)
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as result_pipe:
+        result = read_frame(result_pipe)
+    _, status = os.waitpid(pid, 0)
+    if result is None:
+        # Killed after ignoring its timeout, or left through os._exit()
+        timed_out = os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGALRM
+        return {
+            "stdout": "",
+            "stderr": "",
+            "returncode": -1 if timed_out else os.waitstatus_to_exitcode(status),
+            "timed_out": timed_out,
+        }
+    return result
+
+
+def main():
+    # Keep the protocol pipes away from anything the executed code writes
+    requests = os.fdopen(os.dup(0), "rb")
+    responses = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    modules = sys.argv[1].split(",") if len(sys.argv) > 1 else []
+    for name in filter(None, modules):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    write_frame(responses, {"ready": True, "fork": FORKING})
+
+    while (request := read_frame(requests)) is not None:
+        if FORKING:
+            write_frame(responses, run_forked(request))
+            continue
+        write_frame(responses, execute(request["code"], request["stdin"]))
+        break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Static pre-flight analysis of generated code before execution
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+# Modules generated task scripts have no business importing
+DISALLOWED_MODULES = frozenset(
+    {
+        "ctypes",
+        "multiprocessing",
+        "shutil",
+        "signal",
+        "socket",
+        "subprocess",
+        "threading",
+        "urllib",
+        "http",
+        "requests",
+        "ftplib",
+        "smtplib",
+        "pickle",
+        "marshal",
+        "importlib",
+    }
+)
+
+# `os` stays importable (os.path, os.getcwd), but not the parts of it that
+# spawn processes or delete files
+DISALLOWED_ATTRIBUTES = {
+    "os": frozenset(
+        {
+            "system",
+            "popen",
+            "fork",
+            "forkpty",
+            "kill",
+            "killpg",
+            "remove",
+            "unlink",
+            "rmdir",
+            "removedirs",
+            "rename",
+            "renames",
+            "replace",
+            "chmod",
+            "chown",
+            "truncate",
+            "execl",
+            "execle",
+            "execlp",
+            "execlpe",
+            "execv",
+            "execve",
+            "execvp",
+            "execvpe",
+            "spawnl",
+            "spawnle",
+            "spawnlp",
+            "spawnlpe",
+            "spawnv",
+            "spawnve",
+            "spawnvp",
+            "spawnvpe",
+            "posix_spawn",
+            "posix_spawnp",
+        }
+    ),
+}
+
+_FENCE = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)(?:```|\Z)", re.DOTALL)
+
+
+@dataclass(slots=True)
+class PreflightReport:
+    code: str
+    syntax_error: str | None = None
+    uses_input: bool = False
+    unbounded_loops: List[int] = field(default_factory=list)
+    disallowed_imports: List[str] = field(default_factory=list)
+    disallowed_calls: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Code can be handed to execution without wasting a run"""
+        return (
+            self.syntax_error is None
+            and not self.unbounded_loops
+            and not self.disallowed_imports
+            and not self.disallowed_calls
+        )
+
+    def problems(self) -> List[str]:
+        """Human-readable reasons the code failed pre-flight"""
+        problems = []
+        if self.syntax_error:
+            problems.append(f"syntax error: {self.syntax_error}")
+        for line in self.unbounded_loops:
+            problems.append(f"'while True' without break at line {line}")
+        for module in self.disallowed_imports:
+            problems.append(f"disallowed import: {module}")
+        for name in self.disallowed_calls:
+            problems.append(f"disallowed call: {name}")
+        return problems
+
+
+def extract_code(text):
+    """Python source from an LLM response (markdown fences and prose stripped)"""
+    blocks = _FENCE.findall(text)
+    if blocks:
+        python_blocks = [
+            body for lang, body in blocks if lang.lower() in ("", "python", "py")
+        ]
+        return max(python_blocks or [body for _, body in blocks], key=len).strip()
+
+    # No fences: drop leading prose lines until the rest parses
+    lines = text.strip().splitlines()
+    for start in range(min(len(lines), 10)):
+        candidate = "\n".join(lines[start:])
+        try:
+            ast.parse(candidate)
+            return candidate
+        except SyntaxError:
+            continue
+    return text.strip()
+
+
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+_EXIT_CALLS = ("exit", "quit", "_exit")
+
+
+def _is_true(node):
+    return isinstance(node, ast.Constant) and node.value in (True, 1)
+
+
+def _has_exit(loop):
+    """A break/return/raise/exit() that leaves this loop"""
+    # (node, inside a nested loop) - a nested break only leaves the nested loop
+    stack = [(node, False) for node in loop.body]
+    while stack:
+        node, nested = stack.pop()
+        if isinstance(node, ast.Break) and not nested:
+            return True
+        if isinstance(node, (ast.Return, ast.Raise)):
+            return True
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = (
+                func.attr
+                if isinstance(func, ast.Attribute)
+                else getattr(func, "id", "")
+            )
+            if name in _EXIT_CALLS:
+                return True
+        if isinstance(node, _SCOPES):
+            continue
+        if isinstance(node, _LOOPS):
+            stack.extend((child, True) for child in node.body)
+            stack.extend((child, nested) for child in node.orelse)
+            continue
+        stack.extend((child, nested) for child in ast.iter_child_nodes(node))
+    return False
+
+
+def analyze(code) -> PreflightReport:
+    """Compile and statically check already-extracted code"""
+    report = PreflightReport(code=code)
+    try:
+        tree = ast.parse(code)
+        compile(tree, "<generated>", "exec")
+    except SyntaxError as e:
+        report.syntax_error = f"{e.msg} (line {e.lineno})"
+        return report
+
+    # Local names bound to modules with disallowed attributes (import os as o)
+    modules = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in DISALLOWED_ATTRIBUTES:
+                    modules[alias.asname or alias.name] = alias.name
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            module = modules.get(node.value.id)
+            if module and node.attr in DISALLOWED_ATTRIBUTES[module]:
+                report.disallowed_calls.append(f"{module}.{node.attr}")
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "input":
+            report.uses_input = True
+        elif isinstance(node, ast.While) and _is_true(node.test):
+            if not _has_exit(node):
+                report.unbounded_loops.append(node.lineno)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] in DISALLOWED_MODULES:
+                    report.disallowed_imports.append(alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.module.split(".")[0] in DISALLOWED_MODULES:
+                report.disallowed_imports.append(node.module)
+            for alias in node.names:
+                if alias.name in DISALLOWED_ATTRIBUTES.get(node.module, ()):
+                    report.disallowed_imports.append(f"{node.module}.{alias.name}")
+    return report
+
+
+def preflight(text) -> PreflightReport:
+    """Extract the code block from an LLM response and analyze it"""
+    return analyze(extract_code(text))
@@ -0,0 +1,218 @@
+"""
+Profiling hooks for the interactive scripts.
+
+--profile runs cProfile on the main thread and a sampler thread that
+records the stack of every thread at a fixed wall-clock interval, so time
+spent blocked on input, the network or the terminal shows up too. At exit
+it writes <prefix>.collapsed (folded stacks for flamegraph.pl or
+speedscope), <prefix>.pstats and a top-N summary in <prefix>.txt.
+--tracemalloc adds the largest allocations by call site to the summary.
+
+The flags start profiling once the script has parsed them, after its
+imports. To include imports (g4f, langchain, pydantic), launch the script
+through this module, which starts the profiler first:
+
+    python -m core.profiling main [--tracemalloc] [script arguments]
+"""
+
+import argparse
+import atexit
+import cProfile
+import importlib
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = os.path.join("generated_code", "profiles")
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP = 20
+
+# Started by launch(), before the script's imports
+_active = None
+
+
+def frame_label(code) -> str:
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def collapse(frame, thread_name) -> str:
+    """Folded stack for one frame: thread;outermost;...;innermost"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """Daemon thread counting folded stacks of all other threads"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.stacks[collapse(frame, names.get(ident, str(ident)))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top(self, n=DEFAULT_TOP):
+        """[(frame, self samples, share)] of the innermost frames"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [(frame, count, count / total) for frame, count in leaves.most_common(n)]
+
+
+class Profiler:
+    """cProfile plus wall-clock sampling and/or tracemalloc for one run"""
+
+    def __init__(
+        self,
+        prefix,
+        sample=True,
+        memory=False,
+        interval=DEFAULT_INTERVAL,
+        top=DEFAULT_TOP,
+    ):
+        self.prefix = prefix
+        self.top = top
+        self.profile = cProfile.Profile() if sample else None
+        self.sampler = Sampler(interval) if sample else None
+        self.memory = memory
+        self.started = None
+        self._stopped = False
+
+    def start(self):
+        if self.memory:
+            tracemalloc.start(10)
+        if self.sampler:
+            self.sampler.start()
+            self.profile.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self) -> str:
+        """Stop, write the output files and return the summary text"""
+        if self._stopped:
+            return ""
+        self._stopped = True
+        elapsed = time.perf_counter() - self.started
+        os.makedirs(os.path.dirname(self.prefix) or ".", exist_ok=True)
+        lines = [f"⏱️ Profiled {elapsed:.2f} seconds"]
+
+        if self.sampler:
+            self.profile.disable()
+            self.sampler.stop()
+            self.sampler.write_collapsed(self.prefix + ".collapsed")
+            self.profile.dump_stats(self.prefix + ".pstats")
+            lines.append(
+                f"\n🔥 Wall clock, innermost frames ({self.sampler.samples} samples)"
+            )
+            for frame, count, share in self.sampler.top(self.top):
+                lines.append(f"{share:>7.1%} {count:>7}  {frame}")
+            cpu = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=cpu)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            lines.append("\n🧮 CPU, main thread (cProfile, cumulative)")
+            lines.append(cpu.getvalue().strip())
+
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            lines.append("\n🧠 Largest allocations by call site (tracemalloc)")
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"{stat.size / 1024:>10.1f} KiB {stat.count:>8}  "
+                    f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                )
+
+        summary = "\n".join(lines)
+        with open(self.prefix + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+        return summary
+
+
+def add_profile_arguments(parser):
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Sample the session and write a flamegraph and summary at exit",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Report the largest allocations by call site at exit",
+    )
+    parser.add_argument("--profile-out", help="Output prefix for profile files")
+
+
+def setup_profiling(args, name) -> Profiler | None:
+    """Start profiling if requested; the report is written at exit"""
+    global _active
+    if _active is not None:
+        return _active
+    if not (args.profile or args.tracemalloc):
+        return None
+    prefix = args.profile_out or os.path.join(
+        PROFILE_DIR, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    profiler = Profiler(prefix, sample=args.profile, memory=args.tracemalloc)
+
+    def report():
+        print(f"\n{profiler.stop()}")
+        print(f"📄 Profile written to {prefix}.*")
+
+    atexit.register(report)
+    _active = profiler.start()
+    return _active
+
+
+def launch(argv=None):
+    """Profile a script's imports and main(): import it only after the
+    profiler has started, then call its main() with the remaining arguments"""
+    parser = argparse.ArgumentParser(description="Profile a script from startup")
+    parser.add_argument("script", help="Module to run, e.g. main or main_simple")
+    add_profile_arguments(parser)
+    args, rest = parser.parse_known_args(argv)
+    if not args.tracemalloc:
+        args.profile = True
+    setup_profiling(args, args.script)
+    return importlib.import_module(args.script).main(rest)
+
+
+if __name__ == "__main__":
+    # Run the imported core.profiling, whose profiler the script will find
+    importlib.import_module("core.profiling").launch()
@@ -0,0 +1,92 @@
+"""
+Lightweight slotted records for hot paths.
+
+Pydantic models in core.models stay the I/O boundary: records are converted
+with to_model() when they are validated, serialized or shown to the user,
+and built from models with from_model() when data comes back in.
+"""
+
+from dataclasses import asdict, dataclass
+
+from core.models import GeneratedCode, GenerationResult, TaskFile, TaskMenuItem
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    id: int
+    intent: str
+    task: str
+
+    def to_model(self) -> TaskMenuItem:
+        return TaskMenuItem(id=self.id, intent=self.intent, task=self.task)
+
+    @classmethod
+    def from_model(cls, model: TaskMenuItem) -> "TaskRecord":
+        return cls(model.id, model.intent, model.task)
+
+
+@dataclass(slots=True)
+class TaskFileRecord:
+    id: int
+    filename: str
+    filepath: str
+    description: str
+
+    def to_model(self) -> TaskFile:
+        return TaskFile(**asdict(self))
+
+    @classmethod
+    def from_model(cls, model: TaskFile) -> "TaskFileRecord":
+        return cls(model.id, model.filename, model.filepath, model.description)
+
+
+@dataclass(slots=True)
+class GeneratedCodeRecord:
+    locale: str
+    task_number: int
+    task_description: str
+    code: str
+    # uuid is only assigned when the record crosses the model boundary
+    id: str | None = None
+
+    def to_model(self) -> GeneratedCode:
+        data = asdict(self)
+        if data["id"] is None:
+            del data["id"]
+        return GeneratedCode(**data)
+
+    @classmethod
+    def from_model(cls, model: GeneratedCode) -> "GeneratedCodeRecord":
+        return cls(
+            model.locale,
+            model.task_number,
+            model.task_description,
+            model.code,
+            str(model.id),
+        )
+
+
+@dataclass(slots=True)
+class GenerationRecord:
+    success: bool
+    task_id: int
+    file_path: str | None = None
+    error_message: str | None = None
+    code_preview: str | None = None
+    attempts: int = 1
+    status: str = "ok"
+
+    def to_model(self) -> GenerationResult:
+        return GenerationResult(**asdict(self))
+
+    @classmethod
+    def from_model(cls, model: GenerationResult) -> "GenerationRecord":
+        return cls(
+            model.success,
+            model.task_id,
+            model.file_path,
+            model.error_message,
+            model.code_preview,
+            model.attempts,
+            model.status,
+        )
@@ -0,0 +1,179 @@
+"""
+Single-buffer terminal rendering.
+
+A Screen collects every line of one screen (menu, code listing) and writes
+it with one write() call on the terminal's file descriptor, instead of one
+print() per line. Menus format only the rows of the page being shown, and
+code can be syntax-highlighted line by line as the tokenizer reaches it.
+"""
+
+import builtins
+import io
+import keyword
+import os
+import sys
+import tokenize
+from functools import lru_cache
+
+DEFAULT_PAGE_SIZE = 40
+RESET = "\033[0m"
+STYLES = {
+    "keyword": "\033[1;34m",
+    "string": "\033[32m",
+    "comment": "\033[90m",
+    "number": "\033[36m",
+    "builtin": "\033[35m",
+}
+_BUILTINS = frozenset(dir(builtins))
+
+
+def color_enabled(stream=None) -> bool:
+    """Colors for terminals, unless NO_COLOR is set"""
+    stream = stream or sys.stdout
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty()) and "NO_COLOR" not in os.environ
+
+
+def _style(token):
+    if token.type == tokenize.STRING:
+        return "string"
+    if token.type == tokenize.COMMENT:
+        return "comment"
+    if token.type == tokenize.NUMBER:
+        return "number"
+    if token.type == tokenize.NAME:
+        if keyword.iskeyword(token.string):
+            return "keyword"
+        if token.string in _BUILTINS:
+            return "builtin"
+    return None
+
+
+def _paint(line, spans):
+    if not spans:
+        return line
+    parts = []
+    position = 0
+    for start, end, style in sorted(spans):
+        parts.append(line[position:start])
+        parts.append(f"{STYLES[style]}{line[start:end]}{RESET}")
+        position = end
+    parts.append(line[position:])
+    return "".join(parts)
+
+
+def highlight_lines(code):
+    """Yield code lines with ANSI colors, each as soon as it is tokenized.
+    Lines after a tokenizer error are yielded plain"""
+    lines = code.splitlines()
+    spans = {}
+    done = 0
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            (start_row, start_col), (end_row, end_col) = token.start, token.end
+            # Every line before the token's first line is complete
+            while done < min(start_row - 1, len(lines)):
+                yield _paint(lines[done], spans.pop(done, None))
+                done += 1
+            style = _style(token)
+            if style is None:
+                continue
+            for row in range(start_row - 1, min(end_row, len(lines))):
+                first = start_col if row == start_row - 1 else 0
+                last = end_col if row == end_row - 1 else len(lines[row])
+                spans.setdefault(row, []).append((first, last, style))
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    for row in range(done, len(lines)):
+        yield _paint(lines[row], spans.pop(row, None))
+
+
+@lru_cache(maxsize=64)
+def highlight(code) -> str:
+    """Whole highlighted listing (memoized: the same code is often shown twice)"""
+    return "\n".join(highlight_lines(code))
+
+
+class Screen:
+    """Lines of one screen, written to the terminal in a single call"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._parts = []
+
+    def line(self, text=""):
+        self._parts.append(f"{text}\n")
+        return self
+
+    def lines(self, texts):
+        self._parts.extend(f"{text}\n" for text in texts)
+        return self
+
+    def rule(self, char="-", width=50):
+        return self.line(char * width)
+
+    def code(self, code, color=None):
+        """Code listing, highlighted when color is on (default: terminals only)"""
+        color = color_enabled(self.stream) if color is None else color
+        return self.line(highlight(code) if color else code)
+
+    def render(self) -> str:
+        return "".join(self._parts)
+
+    def flush(self):
+        """Write everything collected so far and start a new buffer"""
+        text = self.render()
+        self._parts.clear()
+        if not text:
+            return
+        try:
+            fd = self.stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            self.stream.write(text)
+            self.stream.flush()
+            return
+        # Keep earlier print() output ahead of ours
+        self.stream.flush()
+        encoding = getattr(self.stream, "encoding", None) or "utf-8"
+        data = memoryview(text.encode(encoding, errors="replace"))
+        while data:
+            data = data[os.write(fd, data) :]
+
+
+class Menu:
+    """Numbered (id, text) rows of a sequence (list, TaskStore) shown one
+    page at a time"""
+
+    def __init__(self, rows, page_size=DEFAULT_PAGE_SIZE, width=None):
+        self.rows = rows
+        self.page_size = page_size
+        if width is None:
+            # A TaskStore has its ids in an array; no need to build the rows
+            ids = getattr(rows, "task_ids", None)
+            ids = (row[0] for row in rows) if ids is None else ids
+            width = len(str(max(ids, default=0)))
+        self.width = width
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self.rows) // self.page_size))
+
+    def page_lines(self, page):
+        """Formatted rows of one page; other rows are never formatted"""
+        start = page * self.page_size
+        end = min(start + self.page_size, len(self.rows))
+        rows = (self.rows[i] for i in range(start, end))
+        return [f"{row_id:>{self.width}}. {text}" for row_id, text in rows]
+
+    def footer(self, page) -> str:
+        """Page position and how to turn pages, empty for one-page menus"""
+        if self.pages == 1:
+            return ""
+        return f"◀ p   {page + 1}/{self.pages}   n ▶"
+
+    def turn(self, page, choice) -> int | None:
+        """New page for an 'n'/'p' choice, or None if choice is not a page turn"""
+        if self.pages == 1 or choice.lower() not in ("n", "p"):
+            return None
+        step = 1 if choice.lower() == "n" else -1
+        return (page + step) % self.pages
@@ -0,0 +1,154 @@
+"""
+Warm session snapshot for instant resume.
+
+One compact binary file holds everything main.py resolves at startup:
+the AgentConfig, the translated UI messages, the task file listing with
+its parsed task index (a TaskStore) and the most recent generations.
+
+Layout: header | zlib-compressed JSON metadata | TaskStore.to_bytes()
+"""
+
+import json
+import os
+import struct
+import tempfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+from core.models import AgentConfig
+from core.records import GeneratedCodeRecord, TaskFileRecord
+from core.task_store import TaskStore
+
+DEFAULT_PATH = os.path.join("generated_code", ".session")
+MAX_RECENT = 20
+
+MAGIC = b"SESSN001"
+# magic, metadata length, task store length
+_HEADER = struct.Struct("<8sIQ")
+
+
+def scan_task_files(tasks_dir) -> List[TaskFileRecord]:
+    """Task files (.txt) in a directory, numbered from 1"""
+    task_files = []
+    for filename in os.listdir(tasks_dir):
+        if filename.endswith(".txt"):
+            filepath = os.path.join(tasks_dir, filename)
+            description = filename.replace(".txt", "").replace("_", " ").title()
+            task_files.append(
+                TaskFileRecord(len(task_files) + 1, filename, filepath, description)
+            )
+    return task_files
+
+
+def _fingerprint(filepath):
+    stat = os.stat(filepath)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+@dataclass(slots=True)
+class Session:
+    config: AgentConfig
+    messages: Dict[str, str]
+    files: List[TaskFileRecord]
+    # Parsed tasks of every file; file ids follow the order of `files`
+    tasks: TaskStore
+    fingerprints: Dict[str, list]
+    recent: List[GeneratedCodeRecord] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, config: AgentConfig, messages) -> "Session":
+        """Scan and parse the tasks directory for a fresh session"""
+        session = cls(config, dict(messages), [], TaskStore(), {})
+        session.refresh()
+        return session
+
+    def refresh(self):
+        """Rescan task files and rebuild the task index"""
+        self.files = scan_task_files(self.config.tasks_directory)
+        paths = [f.filepath for f in self.files]
+        self.tasks = TaskStore.from_files(paths)
+        self.fingerprints = {path: _fingerprint(path) for path in paths}
+
+    def is_fresh(self) -> bool:
+        """True if no task file was added, removed or modified since the scan"""
+        try:
+            current = scan_task_files(self.config.tasks_directory)
+            return [asdict(f) for f in current] == [
+                asdict(f) for f in self.files
+            ] and all(
+                _fingerprint(path) == fingerprint
+                for path, fingerprint in self.fingerprints.items()
+            )
+        except OSError:
+            return False
+
+    def tasks_for(self, task_file: TaskFileRecord) -> TaskStore:
+        """Zero-copy view of one file's tasks"""
+        rows = self.tasks.rows_for_file(task_file.id - 1)
+        if not rows:
+            return TaskStore.from_tasks([], task_file.filepath)
+        return self.tasks.slice(rows[0], rows[-1] + 1)
+
+    def add_generation(self, record: GeneratedCodeRecord):
+        self.recent = (self.recent + [record])[-MAX_RECENT:]
+
+    # Persistence
+
+    def to_bytes(self) -> bytes:
+        meta = zlib.compress(
+            json.dumps(
+                {
+                    "config": self.config.model_dump(),
+                    "messages": self.messages,
+                    "files": [asdict(f) for f in self.files],
+                    "fingerprints": self.fingerprints,
+                    "recent": [asdict(r) for r in self.recent],
+                },
+                ensure_ascii=False,
+            ).encode("utf-8")
+        )
+        store = self.tasks.to_bytes()
+        # Pad so the task store starts 8-byte aligned
+        padding = b"\0" * ((-(_HEADER.size + len(meta))) % 8)
+        return _HEADER.pack(MAGIC, len(meta), len(store)) + meta + padding + store
+
+    @classmethod
+    def from_bytes(cls, data) -> "Session":
+        buf = memoryview(data)
+        magic, meta_len, store_len = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not a session snapshot")
+        pos = _HEADER.size
+        meta = json.loads(zlib.decompress(buf[pos : pos + meta_len]))
+        pos += meta_len + (-(pos + meta_len)) % 8
+        return cls(
+            AgentConfig(**meta["config"]),
+            meta["messages"],
+            [TaskFileRecord(**f) for f in meta["files"]],
+            TaskStore.from_buffer(buf[pos : pos + store_len]),
+            meta["fingerprints"],
+            [GeneratedCodeRecord(**r) for r in meta["recent"]],
+        )
+
+    def save(self, path=DEFAULT_PATH):
+        """Write the snapshot atomically"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH) -> "Session | None":
+        """Saved session, or None if missing or unreadable"""
+        try:
+            with open(path, "rb") as f:
+                return cls.from_bytes(f.read())
+        except (OSError, ValueError, KeyError, TypeError, zlib.error, struct.error):
+            return None
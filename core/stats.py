@@ -0,0 +1,18 @@
+"""
+Small statistics helpers for latency reporting
+"""
+
+import math
+
+
+def percentile(values, p):
+    """p-th percentile (0-100) with linear interpolation; 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
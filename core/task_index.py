@@ -0,0 +1,108 @@
+"""
+Index of generated tasks keyed by stable text hashes
+
+Batch runs record, per task file and language/model, which code file each
+task produced. Tasks are identified by a hash of their normalized text
+instead of their position or number, so a later run can tell new and
+edited tasks from ones that were only renumbered or moved.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+
+INDEX_NAME = ".task_index.json"
+VERSION = 1
+
+
+def task_key(text) -> str:
+    """Hash of the task text, ignoring whitespace differences"""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def task_keys(tasks) -> list:
+    """Key per (task_num, task_text); repeated texts get #2, #3, ... suffixes"""
+    seen = {}
+    keys = []
+    for _, task_text in tasks:
+        key = task_key(task_text)
+        seen[key] = seen.get(key, 0) + 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    task_number: int
+    task_description: str
+    path: str
+
+
+@dataclass(slots=True)
+class TaskDiff:
+    keys: list
+    # key -> IndexEntry whose code can be reused as is
+    unchanged: dict = field(default_factory=dict)
+    # (task_num, task_text) pairs that need generating
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+
+class TaskIndex:
+    """{language/model: {task file: {task key: IndexEntry}}} stored as JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == VERSION:
+            self._data = data.get("indexes", {})
+
+    @staticmethod
+    def _scope(language, model):
+        return f"{language}/{model}"
+
+    def entries(self, filepath, language, model) -> dict:
+        scope = self._data.get(self._scope(language, model), {})
+        raw = scope.get(os.path.normpath(filepath), {})
+        return {key: IndexEntry(**entry) for key, entry in raw.items()}
+
+    def diff(self, filepath, language, model, tasks) -> TaskDiff:
+        """Split freshly parsed tasks into reusable and to-generate"""
+        previous = self.entries(filepath, language, model)
+        result = TaskDiff(task_keys(tasks))
+        for key, task in zip(result.keys, tasks):
+            entry = previous.get(key)
+            # A deleted output file means there is nothing to reuse
+            if entry is not None and os.path.exists(entry.path):
+                entry.task_number = task[0]
+                result.unchanged[key] = entry
+            else:
+                result.changed.append(task)
+        current = set(result.keys)
+        result.removed = [key for key in previous if key not in current]
+        return result
+
+    def update(self, filepath, language, model, entries: dict):
+        """Replace a file's entries with key -> IndexEntry"""
+        scope = self._data.setdefault(self._scope(language, model), {})
+        scope[os.path.normpath(filepath)] = {
+            key: asdict(entry) for key, entry in entries.items()
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": VERSION, "indexes": self._data}, f, ensure_ascii=False
+            )
+        os.replace(tmp_path, self.path)
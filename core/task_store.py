@@ -0,0 +1,255 @@
+"""
+Columnar in-memory store for large task corpora.
+
+Task texts live in one contiguous UTF-8 arena; per-row data lives in typed
+arrays (text offsets, task ids, file ids). Slices share the same buffers and
+stores saved with save() can be reopened with load() straight from an mmap.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+from core.parser import parse_tasks_from_content, read_task_file
+
+MAGIC = b"TSTORE01"
+# magic, byteorder flag, rows, files, names length, arena length
+_HEADER = struct.Struct("<8sBxxxIIQQ")
+_ALIGN = 8
+
+
+def _pad(size):
+    return (-size) % _ALIGN
+
+
+class TaskStore:
+    """Columnar replacement for lists of (task_num, task_text) tuples"""
+
+    def __init__(self):
+        self.arena = bytearray()
+        self.offsets = array("Q", [0])
+        self.task_ids = array("q")
+        self.file_ids = array("i")
+        self.files: List[str] = []
+        self._file_rows: dict | None = None
+        self._mmap = None
+        self._arena_base = 0
+
+    # Building
+
+    @classmethod
+    def from_tasks(cls, tasks, filename="") -> "TaskStore":
+        """Store holding one file's parsed tasks"""
+        store = cls()
+        store.add_tasks(filename, tasks)
+        return store
+
+    @classmethod
+    def from_files(cls, filepaths: Iterable[str]) -> "TaskStore":
+        """Parse task files in order into one store"""
+        store = cls()
+        for filepath in filepaths:
+            store.add_file(filepath)
+        return store
+
+    def add_file(self, filepath) -> int:
+        """Parse a task file and append its tasks, returns the file id"""
+        content = read_task_file(filepath)
+        return self.add_tasks(filepath, parse_tasks_from_content(content))
+
+    def add_tasks(self, filename, tasks) -> int:
+        """Append (task_num, task_text) pairs for a file, returns the file id"""
+        if not isinstance(self.arena, bytearray):
+            raise TypeError("TaskStore is read-only (loaded or sliced)")
+        file_id = len(self.files)
+        self.files.append(filename)
+        for task_num, task_text in tasks:
+            self.arena += task_text.encode("utf-8")
+            self.offsets.append(len(self.arena))
+            self.task_ids.append(task_num)
+            self.file_ids.append(file_id)
+        self._file_rows = None
+        return file_id
+
+    def extend(self, other: "TaskStore"):
+        """Append every file and row of another store, keeping their order"""
+        if not isinstance(self.arena, bytearray):
+            raise TypeError("TaskStore is read-only (loaded or sliced)")
+        file_shift = len(self.files)
+        rows = len(other)
+        first = other.offsets[0]
+        text_shift = len(self.arena) - first
+        self.arena += memoryview(other.arena)[first : other.offsets[rows]]
+        self.offsets.extend(o + text_shift for o in other.offsets[1 : rows + 1])
+        self.task_ids.extend(other.task_ids)
+        self.file_ids.extend(f + file_shift for f in other.file_ids)
+        self.files.extend(other.files)
+        self._file_rows = None
+
+    # Access
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    def text_bytes(self, row) -> memoryview:
+        """Zero-copy UTF-8 bytes of a task text"""
+        return memoryview(self.arena)[self.offsets[row] : self.offsets[row + 1]]
+
+    def text(self, row) -> str:
+        return bytes(self.text_bytes(row)).decode("utf-8")
+
+    def __getitem__(self, row) -> Tuple[int, str]:
+        if isinstance(row, slice):
+            start, stop, step = row.indices(len(self))
+            if step != 1:
+                raise ValueError("TaskStore slices must be contiguous")
+            return self.slice(start, stop)
+        if row < 0:
+            row += len(self)
+        return self.task_ids[row], self.text(row)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for row in range(len(self)):
+            yield self.task_ids[row], self.text(row)
+
+    def find(self, task_num, file_id=None) -> str | None:
+        """Text of the first task with this number (optionally within a file)"""
+        rows = self.rows_for_file(file_id) if file_id is not None else range(len(self))
+        for row in rows:
+            if self.task_ids[row] == task_num:
+                return self.text(row)
+        return None
+
+    def slice(self, start, stop) -> "TaskStore":
+        """Zero-copy view of rows [start, stop) (the parent cannot grow while it lives)"""
+        view = TaskStore.__new__(TaskStore)
+        view.arena = memoryview(self.arena)
+        view.offsets = memoryview(self.offsets)[start : stop + 1]
+        view.task_ids = memoryview(self.task_ids)[start:stop]
+        view.file_ids = memoryview(self.file_ids)[start:stop]
+        view.files = self.files
+        view._file_rows = None
+        view._mmap = self._mmap
+        view._arena_base = self._arena_base
+        return view
+
+    # Filtering
+
+    def rows_for_file(self, file_id) -> array:
+        """Row indices of a file, from the per-file index"""
+        if self._file_rows is None:
+            index = {}
+            for row, fid in enumerate(self.file_ids):
+                index.setdefault(fid, array("I")).append(row)
+            self._file_rows = index
+        return self._file_rows.get(file_id, array("I"))
+
+    def file_id(self, filename) -> int:
+        return self.files.index(filename)
+
+    def search(self, keyword, ignore_case=False) -> array:
+        """Row indices whose text contains keyword"""
+        rows = array("I")
+        if ignore_case:
+            needle = keyword.lower()
+            for row in range(len(self)):
+                if needle in self.text(row).lower():
+                    rows.append(row)
+            return rows
+
+        # Scan the arena directly and map hits back to rows
+        needle = keyword.encode("utf-8")
+        if not needle:
+            return array("I", range(len(self)))
+        haystack = self._mmap if self._mmap is not None else self.arena
+        if isinstance(haystack, memoryview):
+            haystack = haystack.obj
+        base = self._arena_base
+        first, last = self.offsets[0] + base, self.offsets[len(self)] + base
+        pos = haystack.find(needle, first, last)
+        while pos != -1:
+            row = bisect_right(self.offsets, pos - base) - 1
+            end = self.offsets[row + 1] + base
+            if pos + len(needle) <= end:
+                rows.append(row)
+                pos = haystack.find(needle, end, last)
+            else:
+                pos = haystack.find(needle, pos + 1, last)
+        return rows
+
+    # Persistence
+
+    def _blocks(self):
+        names = json.dumps(self.files, ensure_ascii=False).encode("utf-8")
+        rows = len(self)
+        first = self.offsets[0]
+        offsets = array("Q", (o - first for o in self.offsets))
+        arena = memoryview(self.arena)[first : self.offsets[rows]]
+        yield _HEADER.pack(
+            MAGIC,
+            sys.byteorder == "little",
+            rows,
+            len(self.files),
+            len(names),
+            len(arena),
+        )
+        yield names
+        yield offsets.tobytes()
+        yield memoryview(self.task_ids).tobytes()
+        yield memoryview(self.file_ids).tobytes()
+        yield arena
+
+    def save(self, path):
+        """Write the store in an aligned, mmap-friendly binary layout"""
+        with open(path, "wb") as f:
+            for block in self._blocks():
+                f.write(block)
+                f.write(b"\0" * _pad(len(block)))
+
+    def to_bytes(self) -> bytes:
+        """Same layout as save(), in memory"""
+        out = bytearray()
+        for block in self._blocks():
+            out += block
+            out += b"\0" * _pad(len(block))
+        return bytes(out)
+
+    @classmethod
+    def load(cls, path) -> "TaskStore":
+        """Open a saved store; columns are memoryviews over an mmap"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(mapped, mapped)
+
+    @classmethod
+    def from_buffer(cls, data, mapped=None) -> "TaskStore":
+        """Read-only store over bytes produced by to_bytes() (no copy)"""
+        buf = memoryview(data)
+        magic, little, rows, _, names_len, arena_len = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not a task store buffer")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ValueError("Task store was written with a different byte order")
+
+        pos = _HEADER.size + _pad(_HEADER.size)
+
+        def take(size):
+            nonlocal pos
+            block = buf[pos : pos + size]
+            pos += size + _pad(size)
+            return block
+
+        store = cls.__new__(cls)
+        store.files = json.loads(bytes(take(names_len)).decode("utf-8"))
+        store.offsets = take(8 * (rows + 1)).cast("Q")
+        store.task_ids = take(8 * rows).cast("q")
+        store.file_ids = take(4 * rows).cast("i")
+        store._arena_base = pos
+        store.arena = take(arena_len)
+        store._file_rows = None
+        store._mmap = mapped
+        return store
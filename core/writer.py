@@ -0,0 +1,166 @@
+"""
+Buffered, atomic writer for generated code output
+"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+import uuid
+import zipfile
+from typing import Iterable, List, Literal
+
+from core.records import GeneratedCodeRecord
+
+FsyncPolicy = Literal["never", "file", "batch"]
+ArchiveFormat = Literal["zip", "tar", "jsonl"]
+
+
+def safe_task_name(task_name):
+    """Filesystem-safe lowercase version of a task name"""
+    safe_name = "".join(
+        c for c in task_name if c.isalnum() or c in (" ", "-", "_")
+    ).strip()
+    return safe_name.replace(" ", "_").lower()
+
+
+def atomic_write(filepath, data: bytes, sync=False):
+    """Write to a temp file next to filepath, then rename over it.
+
+    The temp file is created 0666 and the kernel applies the umask, so the
+    result gets the same mode as any other new file (mkstemp would give
+    0600). Returns filepath.
+    """
+    directory = os.path.dirname(filepath) or "."
+    tmp_path = os.path.join(directory, f".tmp-{uuid.uuid4().hex}")
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filepath
+
+
+def content_hash(code):
+    """Hex digest used for content-addressed names"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class CodeWriter:
+    """Write generated code atomically under collision-free content-addressed names.
+
+    fsync policy:
+      never - leave flushing to the OS (fastest, not crash-safe)
+      file  - fsync every file and the directory after each rename
+      batch - fsync all files of a write_many() call, then the directory once
+    """
+
+    def __init__(self, output_dir="generated_code", fsync: FsyncPolicy = "batch"):
+        if fsync not in ("never", "file", "batch"):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.output_dir = output_dir
+        self.fsync = fsync
+        self._dir_ready = False
+
+    def name_for(self, code, task_name, task_id=1):
+        """task_{id}_{name}_{hash}.py - same content always gets the same name"""
+        digest = content_hash(code)[:12]
+        return f"task_{task_id}_{safe_task_name(task_name)}_{digest}.py"
+
+    def _ensure_dir(self):
+        if not self._dir_ready:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._dir_ready = True
+
+    def _fsync_dir(self):
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.output_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _atomic_write(self, filename, data: bytes, sync):
+        return atomic_write(os.path.join(self.output_dir, filename), data, sync)
+
+    def write(self, code, task_name, task_id=1):
+        """Write one code file, returns its path"""
+        return self.write_many([(code, task_name, task_id)])[0]
+
+    def write_many(self, items: Iterable) -> List[str]:
+        """Write many (code, task_name, task_id) items or GeneratedCodeRecord objects"""
+        self._ensure_dir()
+        sync = self.fsync != "never"
+        paths = []
+        written = 0
+        for item in items:
+            code, task_name, task_id = self._unpack(item)
+            filename = self.name_for(code, task_name, task_id)
+            filepath = os.path.join(self.output_dir, filename)
+            # Content-addressed: an existing file already holds these bytes
+            if not os.path.exists(filepath):
+                self._atomic_write(filename, code.encode("utf-8"), sync)
+                written += 1
+                if self.fsync == "file":
+                    self._fsync_dir()
+            paths.append(filepath)
+        if written and self.fsync == "batch":
+            self._fsync_dir()
+        return paths
+
+    def write_archive(self, records: Iterable, filename, fmt: ArchiveFormat):
+        """Bundle many (code, task_name, task_id) items or GeneratedCodeRecord
+        objects into one zip/tar archive or JSONL file, returns its path"""
+        self._ensure_dir()
+        buffer = io.BytesIO()
+        if fmt == "jsonl":
+            for record in records:
+                if isinstance(record, GeneratedCodeRecord):
+                    line = record.to_model().model_dump_json()
+                else:
+                    code, task_name, task_id = record
+                    line = json.dumps(
+                        {"task_number": task_id, "task_name": task_name, "code": code},
+                        ensure_ascii=False,
+                    )
+                buffer.write(line.encode("utf-8"))
+                buffer.write(b"\n")
+        elif fmt == "zip":
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for code, task_name, task_id in map(self._unpack, records):
+                    archive.writestr(self.name_for(code, task_name, task_id), code)
+        elif fmt == "tar":
+            with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                now = time.time()
+                for code, task_name, task_id in map(self._unpack, records):
+                    data = code.encode("utf-8")
+                    info = tarfile.TarInfo(self.name_for(code, task_name, task_id))
+                    info.size = len(data)
+                    info.mtime = now
+                    archive.addfile(info, io.BytesIO(data))
+        else:
+            raise ValueError(f"Unknown archive format: {fmt}")
+
+        filepath = self._atomic_write(
+            filename, buffer.getvalue(), self.fsync != "never"
+        )
+        if self.fsync != "never":
+            self._fsync_dir()
+        return filepath
+
+    @staticmethod
+    def _unpack(item):
+        if isinstance(item, GeneratedCodeRecord):
+            return item.code, f"task_{item.task_number}", item.task_number
+        return item
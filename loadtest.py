@@ -0,0 +1,259 @@
+"""
+🏫 Load test: concurrent classroom sessions against a fake LLM
+Replays scripted sessions of main.main (language, file, task, save, run)
+with N virtual users and reports throughput, latency percentiles,
+hit rates and error rates.
+
+There is no server: the fake LLM is an in-process client (FakeLLM) put
+behind the same wrap_llm() layers as the real one - single-flight
+coalescing, scheduler slots, timeouts/breaker with the response cache,
+and instrumentation. Two hit rates are reported: requests that shared an
+identical in-flight call (coalescing) and failed requests answered from
+the response cache.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from agents.client import dedupe_stats, scheduler, wrap_llm
+from agents.codegen import task_prompt
+from agents.fake_llm import FakeLLM, LatencyModel
+from agents.repair import generate_with_repair
+from agents.resilience import FALLBACKS
+from agents.scheduler import INTERACTIVE, job
+from core.blob_store import BlobStore
+from core.execution import run_code_cached
+from core.parser import parse_tasks_from_content, read_task_file
+from core.stats import percentile
+from core.writer import CodeWriter
+from main import ai_translate, get_ui_messages
+
+STEPS = ("language", "file", "task", "save", "run")
+
+
+def _fallbacks():
+    """Answers served from the response cache so far, all call sites"""
+    return sum(value for _, value in FALLBACKS.items())
+
+
+def random_sessions(count, tasks_dir="tasks", seed=None, run_rate=0.3):
+    """Session scripts picking random languages, files and tasks"""
+    rng = random.Random(seed)
+    files = sorted(f for f in os.listdir(tasks_dir) if f.endswith(".txt"))
+    parsed = {
+        f: parse_tasks_from_content(read_task_file(os.path.join(tasks_dir, f)))
+        for f in files
+    }
+    sessions = []
+    for _ in range(count):
+        filename = rng.choice(files)
+        task_num = rng.choice(parsed[filename])[0] if parsed[filename] else 1
+        sessions.append(
+            {
+                "language": rng.choice(["en", "uk", "ru"]),
+                "file": filename,
+                "task": task_num,
+                "save": rng.random() < 0.7,
+                "run": rng.random() < run_rate,
+            }
+        )
+    return sessions
+
+
+class LoadTest:
+    """Runs session scripts on virtual-user threads and collects timings"""
+
+    def __init__(self, llm, tasks_dir="tasks", output_dir=None):
+        self.llm = llm
+        self.tasks_dir = tasks_dir
+        self.output_dir = output_dir or tempfile.mkdtemp(prefix="loadtest-")
+        self.writer = CodeWriter(self.output_dir, fsync="never")
+        self.store = BlobStore(os.path.join(self.output_dir, ".store"))
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.sessions_done = 0
+        self._lock = threading.Lock()
+        # Process-wide counters; only this test's share is reported
+        self._dedupe_start = dedupe_stats()
+        self._fallbacks_start = _fallbacks()
+
+    def _timed(self, step, fn):
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.timings[step].append(time.perf_counter() - start)
+
+    def run_session(self, script):
+        """One scripted pass through the main.main flow"""
+        language = script["language"]
+        self._timed("language", lambda: get_ui_messages(language, self.llm))
+
+        def pick_file():
+            content = read_task_file(os.path.join(self.tasks_dir, script["file"]))
+            tasks = parse_tasks_from_content(content)
+            ai_translate(self.llm, f"Found {len(tasks)} tasks in file", language)
+            return tasks
+
+        tasks = self._timed("file", pick_file)
+        task_text = next((t for n, t in tasks if n == script["task"]), None)
+        if task_text is None:
+            raise LookupError(f"Task {script['task']} not found in {script['file']}")
+
+        code, _ = self._timed(
+            "task",
+            lambda: generate_with_repair(
+                self.llm,
+                task_prompt(script["task"], task_text, language),
+                script["task"],
+                max_attempts=2,
+            ),
+        )
+        if script.get("save"):
+            name = f"task_{script['task']}"
+
+            def save():
+                self.store.put(code, script["task"], name, language, "fake")
+                return self.writer.write(code, name, script["task"])
+
+            self._timed("save", save)
+            if script.get("run"):
+                self._timed("run", lambda: run_code_cached(code, timeout=5))
+
+    def run(self, sessions, users):
+        """Run all sessions on `users` threads; returns wall time"""
+        queue = list(sessions)
+        queue_lock = threading.Lock()
+
+        def user(name):
+            while True:
+                with queue_lock:
+                    if not queue:
+                        return
+                    script = queue.pop(0)
+                try:
+                    # Each virtual user gets a fair share of the LLM slots
+                    with job(INTERACTIVE, user=name):
+                        self.run_session(script)
+                except Exception as e:
+                    with self._lock:
+                        self.errors[type(e).__name__] += 1
+                with self._lock:
+                    self.sessions_done += 1
+
+        threads = [
+            threading.Thread(target=user, args=(f"user-{i}",)) for i in range(users)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    def report(self, elapsed, upstream_calls):
+        """Summary dict: throughput, per-step percentiles, hit and error rates"""
+        stats = dedupe_stats()
+        calls = stats["calls"] - self._dedupe_start["calls"]
+        coalesced = stats["coalesced"] - self._dedupe_start["coalesced"]
+        cached = _fallbacks() - self._fallbacks_start
+        failed = sum(self.errors.values())
+        return {
+            "sessions": self.sessions_done,
+            "wall_seconds": elapsed,
+            "sessions_per_second": self.sessions_done / elapsed if elapsed else 0.0,
+            "llm_calls": calls,
+            "llm_upstream_calls": upstream_calls,
+            "coalesce_hit_rate": coalesced / calls if calls else 0.0,
+            "cache_hit_rate": cached / calls if calls else 0.0,
+            "error_rate": failed / self.sessions_done if self.sessions_done else 0.0,
+            "errors": dict(self.errors),
+            "steps": {
+                step: {
+                    "count": len(self.timings[step]),
+                    "p50": percentile(self.timings[step], 50),
+                    "p95": percentile(self.timings[step], 95),
+                    "p99": percentile(self.timings[step], 99),
+                }
+                for step in STEPS
+                if self.timings[step]
+            },
+        }
+
+
+def print_report(report):
+    print("\n📊 LOAD TEST REPORT")
+    print("=" * 60)
+    print(f"👥 Sessions: {report['sessions']} in {report['wall_seconds']:.2f} s")
+    print(f"🚀 Throughput: {report['sessions_per_second']:.2f} sessions/s")
+    print(
+        f"🔁 LLM calls: {report['llm_calls']} "
+        f"(upstream {report['llm_upstream_calls']}, "
+        f"coalesce hit rate {report['coalesce_hit_rate']:.1%}, "
+        f"response cache hit rate {report['cache_hit_rate']:.1%})"
+    )
+    print(f"❌ Error rate: {report['error_rate']:.1%} {report['errors'] or ''}")
+    print("-" * 60)
+    print(f"{'Step':<10}{'Count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    for step, row in report["steps"].items():
+        print(
+            f"{step:<10}{row['count']:>8}"
+            f"{row['p50'] * 1000:>12.1f}{row['p95'] * 1000:>12.1f}{row['p99'] * 1000:>12.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a class using the generator")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--sessions", type=int, default=60)
+    parser.add_argument("--script", help="JSON list of session scripts to replay")
+    parser.add_argument("--latency", type=float, default=0.3, help="Median seconds")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=10.0)
+    parser.add_argument("--run-rate", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--slots", type=int, help="Concurrent LLM requests (provider quota)"
+    )
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            sessions = json.load(f)
+    else:
+        sessions = random_sessions(
+            args.sessions, seed=args.seed, run_rate=args.run_rate
+        )
+
+    fake = FakeLLM(
+        LatencyModel(args.latency, args.sigma),
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+    if args.slots:
+        scheduler().resize(args.slots)
+    test = LoadTest(wrap_llm(fake))
+    print(f"🏫 {len(sessions)} sessions, {args.users} virtual users")
+    elapsed = test.run(sessions, args.users)
+    report = test.report(elapsed, fake.calls)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,27 @@
 AI-powered code generation with LangChain + G4F integration
 """
 
+import argparse
 import os
-from datetime import datetime
 
-from g4f.integration.langchain import ChatAI
+from agents.client import create_llm
+from agents.codegen import task_prompt
+from agents.repair import generate_with_repair
+from agents.telemetry import format_summary
+from core.blob_store import default_store
+from core.execution import ExecutionCache, run_code_cached
+from core.i18n import catalog
+from core.interpreter_pool import default_pool
+from core.metrics import call_site, setup_from_env
+from core.models import AgentConfig
+from core.parser import read_task_file
+from core.preflight import analyze
+from core.profiling import add_profile_arguments, setup_profiling
+from core.records import GeneratedCodeRecord
+from core.render import Menu, Screen
+from core.session import Session
+
+_exec_cache = ExecutionCache(os.path.join("generated_code", ".exec_cache"))
 
 
 def get_language_choice():
@@ -33,6 +50,11 @@ def ai_translate(llm, text, language):
     if language == "en":
         return text
 
+    # Precompiled catalog first - static UI text needs no network call
+    translated = catalog().get(text, language)
+    if translated is not None:
+        return translated
+
     prompt = f"""
     Translate this interface text to {language} language naturally and appropriately:
     "{text}"
@@ -42,9 +64,10 @@ def ai_translate(llm, text, language):
 
     try:
         messages = [{"role": "user", "content": prompt}]
-        response = llm.invoke(messages)
+        with call_site("ai_translate", language=language):
+            response = llm.invoke(messages)
         return response.content.strip().strip('"')
-    except:
+    except Exception:
         return text
 
 
@@ -87,147 +110,119 @@ def get_ui_messages(language, llm):
     return translated_messages
 
 
-def parse_tasks_from_content(content):
-    """Parse tasks from file content preserving original order"""
-    import re
-
-    tasks = []  # Use list to preserve order
-    lines = content.split("\n")
-    task_counter = 1
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Look for various task patterns
-        patterns = [
-            r"^(\d+)\)\s*(.*)",  # "1) task description"
-            r"^(\d+)\.\s*(.*)",  # "1. task description"
-            r"^–\s*(.*)",  # "– task description"
-            r"^\*\s*(.*)",  # "* task description"
-            r"^-\s*(.*)",  # "- task description"
-        ]
-
-        task_found = False
-        for pattern in patterns:
-            match = re.match(pattern, line)
-            if match:
-                if pattern.startswith(r"^(\d+)"):
-                    # Numbered task
-                    task_num = int(match.group(1))
-                    task_text = match.group(2)
-                else:
-                    # Bullet point task
-                    task_num = task_counter
-                    task_text = match.group(1)
-                    task_counter += 1
-
-                if task_text.strip():
-                    tasks.append((task_num, task_text.strip()))
-                task_found = True
-                break
-
-        # Also look for tasks that start with keywords
-        if not task_found:
-            keywords = [
-                "створити функцію",
-                "написати програму",
-                "вивести",
-                "знайти",
-                "видалити",
-                "замінити",
-            ]
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in keywords):
-                tasks.append((task_counter, line))
-                task_counter += 1
-
-    return tasks
-
-
-def save_code(code, task_name, task_id=1):
-    """Save generated code to file"""
+def save_code(code, task_name, task_id=1, language="en", model="gpt-4o"):
+    """Record generated code in the blob store and write its
+    task_{id}_{name}_{ts}.py file, returns the file path"""
     try:
-        output_dir = "generated_code"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = "".join(
-            c for c in task_name if c.isalnum() or c in (" ", "-", "_")
-        ).strip()
-        safe_name = safe_name.replace(" ", "_").lower()
-
-        filename = f"task_{task_id}_{safe_name}_{timestamp}.py"
-        filepath = os.path.join(output_dir, filename)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(code)
-
-        return filepath
-
+        store = default_store()
+        return store.materialize(store.put(code, task_id, task_name, language, model))
     except Exception as e:
         print(f"❌ Save error: {e}")
-        return ""
+        return None
 
 
-def main():
+def run_generated(code):
+    """Run generated code; deterministic programs replay their last run"""
+    if analyze(code).uses_input:
+        # Interactive programs run in-process so they can read the keyboard
+        exec(code)
+        return
+    result = run_code_cached(code, cache=_exec_cache, pool=default_pool())
+    print(result.stdout, end="")
+    if not result.ok:
+        raise RuntimeError(result.error_summary())
+
+
+def main(argv=None):
     """Main function"""
+    parser = argparse.ArgumentParser(description="Universal Python Code Generator")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Restore the last session (language, UI texts, task index)",
+    )
+    parser.add_argument(
+        "--check-runs",
+        action="store_true",
+        help="Also run each generated candidate to repair runtime errors",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    setup_profiling(args, "main")
+
     print("🤖 Universal Python Code Generator")
     print("==================================")
     print("AI Model: gpt-4o")
     print("Provider: LangChain + PollinationsAI")
     print("Output Directory: generated_code")
+    setup_from_env()
 
-    # Language selection
-    language = get_language_choice()
+    session = Session.load() if args.resume else None
+    if session is not None and not session.is_fresh():
+        try:
+            session.refresh()
+        except OSError as e:
+            # Task folder moved or unreadable since the session was saved
+            print(f"⚠️ Cannot rescan task files ({e}), starting fresh")
+            session = None
+            args.resume = False
+
+    if session is not None:
+        # Everything below was resolved by the previous run
+        config = session.config
+        language = config.default_language
+        llm = create_llm(model=config.ai_model, provider=config.provider)
+        ui = session.messages
+        print(f"⚡ Session restored ({len(session.recent)} recent generations)")
+        print(f"{ui['language_selected']} {language}")
+    else:
+        if args.resume:
+            print("⚠️ No saved session, starting fresh")
 
-    # Initialize AI first for translations
-    llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
-    ui = get_ui_messages(language, llm)
-    print(f"{ui['language_selected']} {language}")
+        # Language selection
+        language = get_language_choice()
 
-    # Check tasks folder
-    tasks_dir = "tasks"
-    if not os.path.exists(tasks_dir):
-        print(f"❌ Folder {tasks_dir} not found!")
-        return
+        # Initialize AI first for translations
+        llm = create_llm(model="gpt-4o", provider="PollinationsAI")
+        ui = get_ui_messages(language, llm)
+        print(f"{ui['language_selected']} {language}")
 
-    # Find task files
-    task_files = []
-    for filename in os.listdir(tasks_dir):
-        if filename.endswith(".txt"):
-            filepath = os.path.join(tasks_dir, filename)
-            description = filename.replace(".txt", "").replace("_", " ").title()
-            task_files.append(
-                {
-                    "id": len(task_files) + 1,
-                    "filename": filename,
-                    "filepath": filepath,
-                    "description": description,
-                }
-            )
+        # Check tasks folder
+        tasks_dir = "tasks"
+        if not os.path.exists(tasks_dir):
+            print(f"❌ Folder {tasks_dir} not found!")
+            return
 
+        # Find and parse task files once for the whole session
+        config = AgentConfig(
+            task_file_path="",
+            tasks_directory=tasks_dir,
+            default_language=language,
+            ai_model="gpt-4o",
+            provider="PollinationsAI",
+        )
+        session = Session.build(config, ui)
+
+    task_files = session.files
     if not task_files:
         print("❌ No task files (.txt) found in tasks folder")
         return
 
+    session.save()
     print(f"\n{ui['task_files_found']} {len(task_files)}")
 
     # File selection loop
     while True:
-        print(f"\n{ui['select_task_file']}")
-
         # Calculate max width for right-aligned numbers
-        max_file_id = max(f["id"] for f in task_files) if task_files else 0
+        max_file_id = max(f.id for f in task_files) if task_files else 0
         file_width = len(str(max_file_id))
 
-        for file in task_files:
-            print(
-                f"{file['id']:>{file_width}}. {file['description']} ({file['filename']})"
-            )
-        print(f"{0:>{file_width}}. {ui['exit']}")
+        screen = Screen().line(f"\n{ui['select_task_file']}")
+        screen.lines(
+            f"{file.id:>{file_width}}. {file.description} ({file.filename})"
+            for file in task_files
+        )
+        screen.line(f"{0:>{file_width}}. {ui['exit']}").flush()
 
         choice = input(f"\n{ui['enter_file_number']} ").strip()
 
@@ -235,25 +230,25 @@ def main():
             print(ui["goodbye"])
             return
 
+        # LLM cost/latency breakdown for this session
+        if choice.lower() == "stats":
+            print(format_summary())
+            continue
+
         try:
             file_id = int(choice)
-            selected_file = next((f for f in task_files if f["id"] == file_id), None)
+            selected_file = next((f for f in task_files if f.id == file_id), None)
 
             if selected_file:
-                print(f"{ui['file_selected']} {selected_file['description']}")
+                print(f"{ui['file_selected']} {selected_file.description}")
 
                 # Read task file
-                try:
-                    with open(selected_file["filepath"], "r", encoding="utf-8") as f:
-                        file_content = f.read()
-                except UnicodeDecodeError:
-                    with open(selected_file["filepath"], "r", encoding="cp1251") as f:
-                        file_content = f.read()
+                file_content = read_task_file(selected_file.filepath)
 
                 print(f"{ui['file_loaded']} ({len(file_content)} {ui['characters']})")
 
-                # Parse tasks from content for exact mapping
-                parsed_tasks = parse_tasks_from_content(file_content)
+                # Tasks of this file from the session's task index
+                parsed_tasks = session.tasks_for(selected_file)
                 print(
                     f"📋 {ai_translate(llm, f'Found {len(parsed_tasks)} tasks in file', language)}"
                 )
@@ -261,42 +256,36 @@ def main():
                 # Generate menu using AI
                 print(ui["generating_menu"])
 
-                # Create structured menu from parsed tasks
-                print(f"\n{ui['tasks_from']} {selected_file['filename']}:")
-                print("-" * 50)
-
-                if parsed_tasks:
-                    # Calculate max width for right-aligned numbers
-                    max_num = (
-                        max(task_num for task_num, _ in parsed_tasks)
-                        if parsed_tasks
-                        else 0
-                    )
-                    width = len(str(max_num))
-
-                    # Display tasks in original file order
-                    for task_num, task_desc in parsed_tasks:
-                        # Right-align the number with proper spacing
-                        print(f"{task_num:>{width}}. {task_desc}")
-                else:
-                    print(
-                        f"❌ {ai_translate(llm, 'Failed to parse tasks from file', language)}"
-                    )
-
-                print("-" * 50)
-
-                # Simple task selection
-                task_choice = input(f"\n{ui['enter_task_number']} ").strip()
+                # Tasks in original file order, one page per screen
+                menu = Menu(parsed_tasks)
+                page = 0
+                while True:
+                    screen = Screen()
+                    screen.line(f"\n{ui['tasks_from']} {selected_file.filename}:")
+                    screen.rule()
+                    if parsed_tasks:
+                        screen.lines(menu.page_lines(page))
+                    else:
+                        screen.line(
+                            f"❌ {ai_translate(llm, 'Failed to parse tasks from file', language)}"
+                        )
+                    screen.rule()
+                    if menu.footer(page):
+                        screen.line(menu.footer(page))
+                    screen.flush()
+
+                    # Simple task selection; n/p turn pages
+                    task_choice = input(f"\n{ui['enter_task_number']} ").strip()
+                    next_page = menu.turn(page, task_choice)
+                    if next_page is None:
+                        break
+                    page = next_page
 
                 if task_choice != "0":
                     try:
                         task_num = int(task_choice)
-                        # Find task in list
-                        exact_task = None
-                        for num, desc in parsed_tasks:
-                            if num == task_num:
-                                exact_task = desc
-                                break
+                        # Find task in store
+                        exact_task = parsed_tasks.find(task_num)
 
                         if exact_task:
                             print(f"{ui['generating_code']} {task_choice}...")
@@ -304,22 +293,7 @@ def main():
                                 f"📝 {ai_translate(llm, f'Exact task: {exact_task}', language)}"
                             )
 
-                            code_prompt = f"""
-                                Generate Python code for this EXACT task:
-
-                                Task number: {task_num}
-                                Task description: {exact_task}
-
-                                Requirements:
-                                - Generate code ONLY for this specific task description
-                                - Clean, executable Python code
-                                - Add comments in {language} language
-                                - NO markdown blocks
-                                - Complete working solution
-                                - For squares: use spaces between asterisks for visual equal-sidedness
-
-                                Task to implement: {exact_task}
-                                """
+                            code_prompt = task_prompt(task_num, exact_task, language)
                         else:
                             print(
                                 f"❌ {ai_translate(llm, f'Task {task_choice} not found in file', language)}"
@@ -331,32 +305,62 @@ def main():
                         )
                         continue
 
-                    code_messages = [{"role": "user", "content": code_prompt}]
-                    code_response = llm.invoke(code_messages)
+                    # Generate, check and repair before the code reaches exec;
+                    # candidates only run here with --check-runs
+                    try:
+                        with call_site("generate_code", language=language):
+                            code, result = generate_with_repair(
+                                llm,
+                                code_prompt,
+                                task_num,
+                                exec_cache=_exec_cache,
+                                pool=default_pool() if args.check_runs else None,
+                                execute=args.check_runs,
+                            )
+                    except Exception as e:
+                        # Timed out or the provider's circuit is open
+                        print(f"{ui['ai_error']} {e}")
+                        continue
+                    config.task_file_path = selected_file.filepath
+                    session.add_generation(
+                        GeneratedCodeRecord(language, task_num, exact_task, code)
+                    )
+                    session.save()
 
-                    print("\n" + "=" * 50)
-                    print(ui["generated_code"])
-                    print("=" * 50)
-                    print(code_response.content)
-                    print("=" * 50)
+                    screen = Screen().line().rule("=").line(ui["generated_code"])
+                    screen.rule("=").code(code).rule("=").flush()
+                    if result.status == "repaired":
+                        print(
+                            f"🔧 {ai_translate(llm, f'Repaired after {result.attempts} attempts', language)}"
+                        )
+                    elif result.status == "failed":
+                        print(
+                            f"⚠️ {ai_translate(llm, f'Still failing after {result.attempts} attempts', language)}"
+                        )
+                        print(result.error_message)
 
                     # Save code option
                     save_choice = input(f"\n{ui['save_code']} ").lower()
                     if save_choice == "y":
                         filepath = save_code(
-                            code_response.content,
+                            code,
                             f"task_{task_choice}",
                             int(task_choice),
+                            language,
                         )
-                        if filepath:
+                        if filepath is not None:
                             print(f"{ui['code_saved']} {filepath}")
-                            # Offer to run code
-                            run_choice = input(f"{ui['run_code']} ").lower()
+                            # Offer to run code that passed the checks
+                            run_choice = (
+                                input(f"{ui['run_code']} ").lower()
+                                if result.success
+                                else "n"
+                            )
                             if run_choice == "y":
                                 try:
                                     print(f"\n{ui['running_code']}")
                                     print("-" * 30)
-                                    exec(code_response.content)
+                                    run_generated(code)
                                     print("-" * 30)
                                     print(ui["code_executed"])
                                 except Exception as e:
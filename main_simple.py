@@ -3,11 +3,28 @@
 No hardcoding - AI determines language, context, and behavior automatically
 """
 
-import json
+import argparse
 import os
-from datetime import datetime
 
-from g4f.integration.langchain import ChatAI
+from pydantic import ValidationError
+
+from agents.client import create_llm
+from agents.codegen import generate_code
+from agents.telemetry import format_summary
+from core.blob_store import default_store
+from core.execution import ExecutionCache, run_code_cached
+from core.i18n import catalog
+from core.interpreter_pool import default_pool
+from core.json_stream import JsonStreamExtractor
+from core.metrics import call_site, setup_from_env
+from core.models import TaskMenuItem
+from core.parser import read_task_file
+from core.preflight import analyze
+from core.profiling import add_profile_arguments, setup_profiling
+from core.records import TaskFileRecord
+from core.render import Screen
+
+_exec_cache = ExecutionCache(os.path.join("generated_code", ".exec_cache"))
 
 
 def get_language_choice():
@@ -30,6 +47,11 @@ def ai_localize(llm, text, language):
     if language == "en":
         return text
 
+    # Precompiled catalog first - static UI text needs no network call
+    translated = catalog().get(text, language)
+    if translated is not None:
+        return translated
+
     prompt = f"""
     Translate this interface text to {language} language naturally:
     "{text}"
@@ -39,14 +61,20 @@ def ai_localize(llm, text, language):
 
     try:
         messages = [{"role": "user", "content": prompt}]
-        response = llm.invoke(messages)
+        with call_site("ai_localize", language=language):
+            response = llm.invoke(messages)
         return response.content.strip().strip('"')
-    except:
+    except Exception:
         return text
 
 
-def ai_parse_tasks(llm, content, language):
-    """AI-powered task parsing and menu generation preserving order"""
+def ai_parse_tasks(llm, content, language, on_task=None):
+    """AI-powered task parsing and menu generation preserving order.
+
+    The response is streamed; each item is validated as a TaskMenuItem as soon
+    as it is complete and passed to on_task, so the menu renders while the
+    model is still writing. Returns {"1": "Task description", ...}.
+    """
     prompt = f"""
     Parse this file content and extract ALL programming tasks in ORIGINAL ORDER.
     Create a numbered menu in {language} language.
@@ -63,28 +91,41 @@ def ai_parse_tasks(llm, content, language):
     {content}
 
     Return ONLY a JSON array of objects like:
-    [{{"id": 1, "description": "Task description 1"}}, {{"id": 2, "description": "Task description 2"}}, ...]
+    [{{"id": 1, "intent": "2-4 word intent", "task": "Task description 1"}}, ...]
     """
 
-    try:
-        messages = [{"role": "user", "content": prompt}]
-        response = llm.invoke(messages)
-
-        # Clean response
-        content = response.content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        elif content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
+    tasks = {}
 
-        return json.loads(content)
+    def add(item):
+        if not isinstance(item, dict):
+            return
+        description = item.get("task") or item.get("description")
+        try:
+            menu_item = TaskMenuItem(
+                id=item.get("id"),
+                intent=item.get("intent") or " ".join(str(description).split()[:4]),
+                task=description,
+            )
+        except ValidationError:
+            return
+        tasks[str(menu_item.id)] = menu_item.task
+        if on_task:
+            on_task(menu_item)
 
+    extractor = JsonStreamExtractor()
+    try:
+        messages = [{"role": "user", "content": prompt}]
+        with call_site("ai_parse_tasks", language=language):
+            for chunk in llm.stream(messages):
+                for item in extractor.feed(chunk.content):
+                    add(item)
+        for item in extractor.finish():
+            add(item)
     except Exception as e:
+        # Keep whatever was already parsed
         print(f"❌ Error parsing tasks: {e}")
-        return {}
+
+    return tasks
 
 
 def ai_generate_code(llm, task_description, language):
@@ -103,51 +144,54 @@ def ai_generate_code(llm, task_description, language):
     """
 
     try:
-        messages = [{"role": "user", "content": prompt}]
-        response = llm.invoke(messages)
-        return response.content.strip()
+        with call_site("ai_generate_code", language=language):
+            return generate_code(llm, prompt).code
     except Exception as e:
         return f"# Error generating code: {e}"
 
 
-def save_code(code, task_name, task_id=1):
-    """Save generated code to file"""
+def save_code(code, task_name, task_id=1, language="en", model="gpt-4o"):
+    """Record generated code in the blob store and write its
+    task_{id}_{name}_{ts}.py file, returns the file path"""
     try:
-        output_dir = "generated_code"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = "".join(
-            c for c in task_name if c.isalnum() or c in (" ", "-", "_")
-        ).strip()
-        safe_name = safe_name.replace(" ", "_").lower()
-
-        filename = f"task_{task_id}_{safe_name}_{timestamp}.py"
-        filepath = os.path.join(output_dir, filename)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(code)
-
-        return filepath
+        store = default_store()
+        return store.materialize(store.put(code, task_id, task_name, language, model))
     except Exception as e:
         print(f"❌ Save error: {e}")
-        return ""
+        return None
+
+
+def run_generated(code):
+    """Run generated code; deterministic programs replay their last run"""
+    if analyze(code).uses_input:
+        # Interactive programs run in-process so they can read the keyboard
+        exec(code)
+        return
+    result = run_code_cached(code, cache=_exec_cache, pool=default_pool())
+    print(result.stdout, end="")
+    if not result.ok:
+        raise RuntimeError(result.error_summary())
 
 
-def main():
+def main(argv=None):
     """Main function - AI-driven, no hardcoding"""
+    parser = argparse.ArgumentParser(description="Universal Python Code Generator")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    setup_profiling(args, "main_simple")
+
     print("🤖 Universal Python Code Generator")
     print("==================================")
     print("AI Model: gpt-4o")
     print("Provider: LangChain + PollinationsAI")
     print("Output Directory: generated_code")
+    setup_from_env()
 
     # Language selection
     language = get_language_choice()
 
     # Initialize AI
-    llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+    llm = create_llm(model="gpt-4o", provider="PollinationsAI")
 
     print(f"✅ {ai_localize(llm, 'Language selected', language)}: {language}")
 
@@ -164,12 +208,7 @@ def main():
             filepath = os.path.join(tasks_dir, filename)
             description = filename.replace(".txt", "").replace("_", " ").title()
             task_files.append(
-                {
-                    "id": len(task_files) + 1,
-                    "filename": filename,
-                    "filepath": filepath,
-                    "description": description,
-                }
+                TaskFileRecord(len(task_files) + 1, filename, filepath, description)
             )
 
     if not task_files:
@@ -183,13 +222,11 @@ def main():
         print(f"\n📁 {ai_localize(llm, 'Select task file', language)}:")
 
         # Calculate max width for right-aligned numbers
-        max_file_id = max(f["id"] for f in task_files) if task_files else 0
+        max_file_id = max(f.id for f in task_files) if task_files else 0
         file_width = len(str(max_file_id))
 
         for file in task_files:
-            print(
-                f"{file['id']:>{file_width}}. {file['description']} ({file['filename']})"
-            )
+            print(f"{file.id:>{file_width}}. {file.description} ({file.filename})")
         print(f"{0:>{file_width}}. {ai_localize(llm, 'Exit', language)}")
 
         choice = input(
@@ -200,53 +237,48 @@ def main():
             print(ai_localize(llm, "Goodbye! 👋", language))
             return
 
+        # LLM cost/latency breakdown for this session
+        if choice.lower() == "stats":
+            print(format_summary())
+            continue
+
         try:
             file_id = int(choice)
-            selected_file = next((f for f in task_files if f["id"] == file_id), None)
+            selected_file = next((f for f in task_files if f.id == file_id), None)
 
             if selected_file:
                 print(
-                    f"✅ {ai_localize(llm, 'File selected', language)}: {selected_file['description']}"
+                    f"✅ {ai_localize(llm, 'File selected', language)}: {selected_file.description}"
                 )
 
                 # Read task file
-                try:
-                    with open(selected_file["filepath"], "r", encoding="utf-8") as f:
-                        file_content = f.read()
-                except UnicodeDecodeError:
-                    with open(selected_file["filepath"], "r", encoding="cp1251") as f:
-                        file_content = f.read()
+                file_content = read_task_file(selected_file.filepath)
 
                 print(
                     f"✅ {ai_localize(llm, 'File content loaded', language)} ({len(file_content)} {ai_localize(llm, 'characters', language)})"
                 )
 
-                # AI parse tasks
+                # AI parse tasks, rendering the menu as items arrive
                 print(f"🎨 {ai_localize(llm, 'Generating task menu', language)}...")
-                tasks = ai_parse_tasks(llm, file_content, language)
-
-                if not tasks:
-                    print("❌ No tasks found in file")
-                    continue
-
-                # Display menu
                 print(
-                    f"\n📋 {ai_localize(llm, 'Tasks from', language)} {selected_file['filename']}:"
+                    f"\n📋 {ai_localize(llm, 'Tasks from', language)} {selected_file.filename}:"
                 )
                 print("-" * 50)
 
-                # Calculate max width for right-aligned numbers
-                max_task_id = (
-                    max(int(task_id) for task_id in tasks.keys()) if tasks else 0
+                tasks = ai_parse_tasks(
+                    llm,
+                    file_content,
+                    language,
+                    on_task=lambda item: print(
+                        f"{item.id:>2}. {item.task}", flush=True
+                    ),
                 )
-                task_width = len(str(max_task_id))
-
-                for task_id, task_desc in sorted(
-                    tasks.items(), key=lambda x: int(x[0])
-                ):
-                    print(f"{int(task_id):>{task_width}}. {task_desc}")
                 print("-" * 50)
 
+                if not tasks:
+                    print("❌ No tasks found in file")
+                    continue
+
                 # Task selection
                 task_choice = input(
                     f"\n{ai_localize(llm, 'Enter task number to generate code (or 0 to return)', language)}: "
@@ -262,11 +294,10 @@ def main():
                     # Generate code
                     code = ai_generate_code(llm, selected_task, language)
 
-                    print("\n" + "=" * 50)
-                    print(ai_localize(llm, "GENERATED CODE", language))
-                    print("=" * 50)
-                    print(code)
-                    print("=" * 50)
+                    # Localize before drawing so the listing appears in one write
+                    title = ai_localize(llm, "GENERATED CODE", language)
+                    screen = Screen().line().rule("=").line(title)
+                    screen.rule("=").code(code).rule("=").flush()
 
                     # Save code option
                     save_choice = input(
@@ -274,24 +305,33 @@ def main():
                     ).lower()
                     if save_choice == "y":
                         filepath = save_code(
-                            code, f"task_{task_choice}", int(task_choice)
+                            code, f"task_{task_choice}", int(task_choice), language
                         )
-                        if filepath:
+                        if filepath is not None:
                             print(
                                 f"✅ {ai_localize(llm, 'Code saved', language)}: {filepath}"
                             )
 
-                            # Run code option
-                            run_choice = input(
-                                f"{ai_localize(llm, 'Run generated code? (y/n)', language)}: "
-                            ).lower()
+                            # Offer to run code that passed pre-flight, as main.py does
+                            report = analyze(code)
+                            if report.ok:
+                                run_choice = input(
+                                    f"{ai_localize(llm, 'Run generated code? (y/n)', language)}: "
+                                ).lower()
+                            else:
+                                run_choice = "n"
+                                print(
+                                    f"⚠️ {ai_localize(llm, 'Code failed pre-flight checks', language)}:"
+                                )
+                                for problem in report.problems():
+                                    print(f"  - {problem}")
                             if run_choice == "y":
                                 try:
                                     print(
                                         f"\n🔄 {ai_localize(llm, 'Running code', language)}..."
                                     )
                                     print("-" * 30)
-                                    exec(code)
+                                    run_generated(code)
                                     print("-" * 30)
                                     print(
                                         f"✅ {ai_localize(llm, 'Code executed successfully', language)}"
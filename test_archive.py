@@ -0,0 +1,88 @@
+"""
+Test compressed generation archives
+"""
+
+import os
+
+import pytest
+
+from core import archive
+from core.blob_store import BlobStore
+from core.records import GenerationRecord
+from core.writer import CodeWriter
+
+
+def _export(tmp_path, codec):
+    writer = CodeWriter(str(tmp_path / "generated"), fsync="never")
+    writer.write("print('sum')\n", "sum of digits", 3)
+    writer.write("print('x' * 2)\n", "repeat", 4)
+    codes = list(archive.code_files(str(tmp_path / "generated"), "uk"))
+    codes += list(archive.code_files("demo_files"))
+    results = [GenerationRecord(True, 3, file_path="task_3.py", attempts=2)]
+    path = str(tmp_path / "solutions.genarc")
+    return path, archive.write_archive(path, codes, results, codec=codec)
+
+
+def test_round_trip_into_store_and_files(tmp_path):
+    path, manifest = _export(tmp_path, "xz")
+    demos = [name for name in os.listdir("demo_files") if name.endswith(".py")]
+    assert manifest["codes"] == 2 + len(demos)
+
+    store = BlobStore(str(tmp_path / "store"))
+    dest = tmp_path / "restored"
+    loaded, imported, results = archive.import_archive(path, store, str(dest))
+
+    assert loaded["codec"] == "xz" and imported == manifest["codes"]
+    assert results == [GenerationRecord(True, 3, file_path="task_3.py", attempts=2)]
+    entry = store.latest(3, language="uk")
+    assert entry["task_name"] == "sum_of_digits"
+    assert store.get_blob(entry["blob"]) == "print('sum')\n"
+    assert sorted(os.listdir(dest)) == sorted(
+        os.listdir(tmp_path / "generated") + demos
+    )
+
+
+def test_corrupt_record_is_rejected(tmp_path, monkeypatch):
+    path, _ = _export(tmp_path, "xz")
+    monkeypatch.setattr(archive, "content_hash", lambda code: "0" * 64)
+    with pytest.raises(ValueError):
+        list(archive.read_archive(path))
+
+
+def test_unknown_file_is_rejected(tmp_path):
+    path = tmp_path / "bad.genarc"
+    path.write_bytes(b"PK\x03\x04 not an archive")
+    with pytest.raises(ValueError):
+        next(archive.read_archive(str(path)))
+
+
+@pytest.mark.skipif(archive.zstandard is None, reason="zstandard not installed")
+def test_zstd_round_trip(tmp_path):
+    path, manifest = _export(tmp_path, "zstd")
+    assert next(archive.read_archive(path)) == manifest
+
+
+def test_importing_twice_records_nothing_new(tmp_path):
+    path, manifest = _export(tmp_path, "xz")
+    store = BlobStore(str(tmp_path / "store"))
+    archive.import_archive(path, store)
+    _, imported, _ = archive.import_archive(path, store)
+    assert imported == 0
+    assert len(store.entries()) == manifest["codes"]
+
+
+def test_cli_export_carries_results(tmp_path, capsys):
+    results = tmp_path / "results.jsonl"
+    record = GenerationRecord(False, 5, error_message="boom", attempts=3)
+    archive.write_results(str(results), [record])
+    path = str(tmp_path / "solutions.genarc")
+    root = str(tmp_path / "store")
+    archive.main(
+        ["--root", root, "export", path, "--from", "demo_files"]
+        + ["--results", str(results)]
+    )
+    assert "1 results" in capsys.readouterr().out
+
+    restored = tmp_path / "restored.jsonl"
+    archive.main(["--root", root, "import", path, "--results", str(restored)])
+    assert list(archive.result_records(str(restored))) == [record]
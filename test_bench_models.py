@@ -0,0 +1,33 @@
+"""
+Test the provider/model benchmark
+"""
+
+import json
+
+from benchmarks import bench_models
+
+
+def test_fake_matrix_reports_and_appends(tmp_path):
+    out = tmp_path / "models.jsonl"
+    rows = bench_models.main(
+        ["--fake", "--limit", "3", "--models", "m1,m2", "--out", str(out)]
+    )
+
+    assert [(r["provider"], r["model"]) for r in rows] == [
+        ("PollinationsAI", "m1"),
+        ("PollinationsAI", "m2"),
+    ]
+    for row in rows:
+        assert row["tasks"] == 3
+        assert row["success_rate"] == 1.0
+        assert 0 < row["p50"] <= row["p95"]
+        assert row["tokens"] > 0
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert len(lines) == 2 and all(line["fake"] for line in lines)
+
+
+def test_failing_model_lowers_success_rate():
+    llm = bench_models.fake_client("Local", "broken", latency=0.0, error_rate=1.0)
+    row = bench_models.benchmark(llm, "Local", "broken", [(1, "print hello")])
+    assert row["success_rate"] == 0.0
@@ -0,0 +1,94 @@
+"""
+Test the content-addressed generated code store
+"""
+
+import os
+
+from core.blob_store import BlobStore, main
+
+
+def test_identical_saves_share_one_blob(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    first = store.put("print(1)\n", 1, "task_1", "uk")
+    second = store.put("print(1)\n", 1, "task_1", "uk")
+    store.put("print(2)\n", 2, "task_2", "en")
+
+    assert first != second
+    stats = store.stats()
+    assert (stats["entries"], stats["blobs"]) == (3, 2)
+    assert store.get_blob(store.entry(first)["blob"]) == "print(1)\n"
+    assert store.latest(1, language="uk")["id"] == second
+
+
+def test_blob_removed_by_concurrent_gc_is_rewritten(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "store"))
+    code = "print(1)\n"
+    digest = store.put_blob(code)
+    utime = os.utime
+
+    def gc_in_between(path, *args):
+        # Another process's gc() deletes the blob right before the touch
+        os.remove(path)
+        return utime(path, *args)
+
+    monkeypatch.setattr(os, "utime", gc_in_between)
+    assert store.put_blob(code) == digest
+    monkeypatch.undo()
+    assert store.get_blob(digest) == code
+
+
+def test_materialize_legacy_names(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    entry_id = store.put("print('hi')\n", 7, "task 7", "en")
+
+    path = store.materialize(entry_id, str(tmp_path / "out"))
+
+    name = os.path.basename(path)
+    assert name.startswith("task_7_task_7_") and name.endswith(".py")
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "print('hi')\n"
+
+
+def test_gc_keeps_newest_and_drops_orphans(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    for i in range(3):
+        store.put(f"print({i})\n", 1, "task_1")
+    store.put_blob("orphan = True\n")
+
+    assert store.gc() == (0, 1)
+    assert store.gc(keep=1) == (2, 2)
+    entries = store.entries()
+    assert len(entries) == 1
+    assert store.get_blob(entries[0]["blob"]) == "print(2)\n"
+
+
+def test_cli_gc(tmp_path, capsys):
+    root = str(tmp_path / "store")
+    BlobStore(root).put_blob("orphan = True\n")
+    # A just-written blob may belong to a save in another process
+    main(["--root", root, "gc"])
+    assert "0 blobs" in capsys.readouterr().out
+    main(["--root", root, "gc", "--grace", "0"])
+    assert "1 blobs" in capsys.readouterr().out
+
+
+def test_stats_skip_interrupted_writes(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    digest = store.entry(store.put("print(1)\n", 1, "task_1"))["blob"]
+    leftover = os.path.join(os.path.dirname(store.blob_path(digest)), ".tmp-x")
+    with open(leftover, "wb") as f:
+        f.write(b"partial")
+    assert store.stats()["blobs"] == 1
+    assert store.gc() == (0, 0)
+    assert not os.path.exists(leftover)
+
+
+def test_same_second_saves_materialize_apart(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    first = store.put("print(1)\n", 5, "task_5")
+    second = store.put("print(2)\n", 5, "task_5")
+    out = str(tmp_path / "out")
+    paths = {store.materialize(first, out), store.materialize(second, out)}
+    # Re-materializing the same entry reuses its file
+    paths.add(store.materialize(first, out))
+    assert len(paths) == 2 and len(os.listdir(out)) == 2
@@ -5,17 +5,59 @@ Demonstrates all project capabilities and validates functionality
 
 import os
 import sys
+import threading
 import time
 from datetime import datetime
-from g4f.integration.langchain import ChatAI
+
+from agents.client import create_llm
+from agents.telemetry import format_summary
+from core.metrics import call_site
+
+
+# Wall-clock budget per test group in seconds
+DEFAULT_BUDGETS = {
+    "test_1_environment_setup": 10,
+    "test_2_ai_integration": 60,
+    "test_3_task_parsing": 90,
+    "test_4_multilingual_support": 90,
+    "test_5_code_execution": 60,
+    "test_6_file_management": 10,
+    "test_7_visual_features": 60,
+}
+
+
+class _ThreadOutput:
+    """stdout proxy that buffers output per registered thread"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}
+
+    def write(self, text):
+        buffer = self.buffers.get(threading.get_ident())
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 
 class ComprehensiveTest:
     """Complete test suite demonstrating all project features"""
 
-    def __init__(self):
+    def __init__(self, llm=None, budgets=None):
         self.test_results = []
+        self.timings = {}
         self.start_time = time.time()
+        # One client shared by every test group
+        self.llm = llm or create_llm(model="gpt-4o", provider="PollinationsAI")
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self._current = threading.local()
         
     def log_test(self, test_name: str, status: str, details: str = ""):
         """Log test results"""
@@ -23,7 +65,8 @@ class ComprehensiveTest:
             "test": test_name,
             "status": status,
             "details": details,
-            "timestamp": datetime.now().strftime("%H:%M:%S")
+            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "group": getattr(self._current, "group", ""),
         }
         self.test_results.append(result)
         
@@ -76,7 +119,7 @@ class ComprehensiveTest:
         
         try:
             # Test ChatAI initialization
-            llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+            llm = self.llm
             self.log_test("ChatAI Initialization", "PASS", "PollinationsAI provider ready")
             
             # Test simple AI response
@@ -114,7 +157,7 @@ class ComprehensiveTest:
                 self.log_test("Task File Reading", "PASS", f"Loaded {len(content)} characters")
                 
                 # Test AI task extraction
-                llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+                llm = self.llm
                 
                 extraction_prompt = f"""
                 IMPORTANT: Extract ALL programming tasks from this text. Do NOT skip any tasks, even if they seem similar.
@@ -174,7 +217,7 @@ class ComprehensiveTest:
         print("-" * 50)
         
         try:
-            llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+            llm = self.llm
             
             # Test English
             en_prompt = "Generate a Python function that calculates the sum of two numbers. Add comments in English."
@@ -215,7 +258,7 @@ class ComprehensiveTest:
         print("-" * 50)
         
         try:
-            llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+            llm = self.llm
             
             # Generate executable code
             prompt = """
@@ -325,7 +368,7 @@ if __name__ == "__main__":
         print("-" * 50)
         
         try:
-            llm = ChatAI(model="gpt-4o", provider="PollinationsAI", api_key="")
+            llm = self.llm
             
             # Test square generation with proper spacing
             square_prompt = """
@@ -377,18 +420,75 @@ if __name__ == "__main__":
         print("LangChain + G4F Integration")
         print("=" * 60)
         
-        # Run all tests
-        self.test_1_environment_setup()
-        self.test_2_ai_integration()
-        self.test_3_task_parsing()
-        self.test_4_multilingual_support()
-        self.test_5_code_execution()
-        self.test_6_file_management()
-        self.test_7_visual_features()
-        
+        self.run_tests(
+            [
+                self.test_1_environment_setup,
+                self.test_2_ai_integration,
+                self.test_3_task_parsing,
+                self.test_4_multilingual_support,
+                self.test_5_code_execution,
+                self.test_6_file_management,
+                self.test_7_visual_features,
+            ]
+        )
+
         # Generate summary report
         self.generate_report()
 
+    def run_tests(self, tests):
+        """Run test groups concurrently, each within its wall-clock budget.
+
+        Output of every group is buffered and printed in one piece when the
+        group finishes, so total time is that of the slowest group.
+        """
+        output = _ThreadOutput(sys.stdout)
+        sys.stdout = output
+        threads = []
+
+        def run(test, buffer):
+            output.buffers[threading.get_ident()] = buffer
+            self._current.group = test.__name__
+            started = time.perf_counter()
+            try:
+                # LLM calls labelled with the test they belong to
+                with call_site(test.__name__):
+                    test()
+            except Exception as e:
+                self.log_test(test.__name__, "FAIL", str(e))
+            finally:
+                self.timings[test.__name__] = time.perf_counter() - started
+
+        # Report order follows the test order, not completion order
+        self.timings = {test.__name__: 0.0 for test in tests}
+        try:
+            suite_start = time.perf_counter()
+            for test in tests:
+                buffer = []
+                thread = threading.Thread(target=run, args=(test, buffer), daemon=True)
+                thread.start()
+                threads.append((test.__name__, thread, buffer))
+
+            for name, thread, buffer in threads:
+                deadline = suite_start + self.budgets.get(name, 60)
+                thread.join(max(0.0, deadline - time.perf_counter()))
+                output.stream.write("".join(buffer))
+                if thread.is_alive():
+                    # A hung group cannot be stopped, only abandoned
+                    self.timings[name] = time.perf_counter() - suite_start
+                    self._current.group = name
+                    budget = self.budgets.get(name, 60)
+                    self.log_test(name, "FAIL", f"Exceeded {budget}s budget")
+        finally:
+            sys.stdout = output.stream
+
+    def group_status(self, group):
+        """Worst status among the checks of one test group"""
+        statuses = {r["status"] for r in self.test_results if r["group"] == group}
+        for status in ("FAIL", "WARN"):
+            if status in statuses:
+                return status
+        return "PASS"
+
     def generate_report(self):
         """Generate comprehensive test report"""
         print("\n📊 TEST SUMMARY REPORT")
@@ -410,6 +510,14 @@ if __name__ == "__main__":
         elapsed_time = time.time() - self.start_time
         print(f"⏱️ Total Time: {elapsed_time:.2f} seconds")
         
+        print("\n⏱️ Per-Test Timing:")
+        print("-" * 40)
+        for group, seconds in self.timings.items():
+            status = self.group_status(group)
+            status_emoji = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
+            budget = self.budgets.get(group, 60)
+            print(f"{status_emoji} {group}: {status} ({seconds:.2f}s / {budget}s)")
+
         print("\n📋 Detailed Results:")
         print("-" * 40)
         for result in self.test_results:
@@ -417,6 +525,10 @@ if __name__ == "__main__":
             print(f"{status_emoji} {result['test']}: {result['status']}")
             if result["details"]:
                 print(f"   📝 {result['details']}")
+
+        print("\n💸 LLM Usage:")
+        print("-" * 40)
+        print(format_summary())
         
         print("\n🎉 TEST SUITE COMPLETED!")
         print("=" * 60)
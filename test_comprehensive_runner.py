@@ -0,0 +1,70 @@
+"""
+Test the concurrent group runner of the comprehensive suite
+"""
+
+import time
+
+from agents.client import wrap_llm
+from agents.fake_llm import FakeLLM, LatencyModel
+from test_comprehensive import ComprehensiveTest
+
+
+def suite(**kwargs):
+    fake = FakeLLM(LatencyModel(median=0.0, sigma=0.0), seed=1)
+    return ComprehensiveTest(llm=wrap_llm(fake), **kwargs)
+
+
+def test_groups_run_concurrently():
+    test = suite()
+
+    def slow_a():
+        time.sleep(0.3)
+        test.log_test("A", "PASS")
+
+    def slow_b():
+        time.sleep(0.3)
+        test.log_test("B", "WARN")
+
+    started = time.perf_counter()
+    test.run_tests([slow_a, slow_b])
+    assert time.perf_counter() - started < 0.55
+    assert test.group_status("slow_a") == "PASS"
+    assert test.group_status("slow_b") == "WARN"
+    assert list(test.timings) == ["slow_a", "slow_b"]
+    assert test.timings["slow_a"] >= 0.3
+
+
+def test_group_over_budget_is_abandoned():
+    test = suite(budgets={"hang": 0.2})
+
+    def hang():
+        time.sleep(5)
+
+    started = time.perf_counter()
+    test.run_tests([hang])
+    assert time.perf_counter() - started < 1
+    assert test.group_status("hang") == "FAIL"
+    assert "budget" in test.test_results[-1]["details"]
+
+
+def test_group_output_is_not_interleaved(capsys):
+    test = suite()
+
+    def chatty(tag):
+        def group():
+            for _ in range(3):
+                print(tag)
+                time.sleep(0.01)
+
+        group.__name__ = f"group_{tag}"
+        return group
+
+    test.run_tests([chatty("x"), chatty("y")])
+    assert capsys.readouterr().out == "x\nx\nx\ny\ny\ny\n"
+
+
+def test_shared_client_is_used_by_groups():
+    test = suite()
+    test.run_tests([test.test_2_ai_integration])
+    assert test.llm.llm.calls == 2
+    assert test.group_status("test_2_ai_integration") in ("PASS", "WARN")
@@ -0,0 +1,70 @@
+"""
+Test the execution result cache
+"""
+
+import sys
+
+from core.execution import (
+    ExecutionCache,
+    execution_key,
+    nondeterminism,
+    run_code_cached,
+)
+
+
+def test_deterministic_run_is_replayed():
+    cache = ExecutionCache()
+    first = run_code_cached("print(input() * 2)", stdin="ab\n", cache=cache)
+    second = run_code_cached("print(input() * 2)", stdin="ab\n", cache=cache)
+    assert first.stdout == second.stdout == "abab\n"
+    assert not first.cached and second.cached
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A different stdin script is a different run
+    third = run_code_cached("print(input() * 2)", stdin="x\n", cache=cache)
+    assert third.stdout == "xx\n" and not third.cached
+
+
+def test_failures_are_replayed_too():
+    cache = ExecutionCache()
+    run_code_cached("1 / 0", cache=cache)
+    result = run_code_cached("1 / 0", cache=cache)
+    assert result.cached and not result.ok
+    assert "ZeroDivisionError" in result.error_summary()
+
+
+def test_nondeterministic_code_bypasses_cache():
+    cache = ExecutionCache()
+    code = "import random\nprint(random.random())"
+    assert nondeterminism(code) == ["imports random"]
+    first = run_code_cached(code, cache=cache)
+    second = run_code_cached(code, cache=cache)
+    assert not second.cached and first.stdout != second.stdout
+    assert cache.hits == cache.misses == 0
+
+
+def test_nondeterminism_reasons():
+    assert nondeterminism("print(1)") == []
+    assert nondeterminism("from datetime import date") == ["imports datetime"]
+    assert nondeterminism("x = input()") == ["reads input without a stdin script"]
+    assert nondeterminism("x = input()", stdin="1\n") == []
+    assert nondeterminism("print(id([]))") == ["calls id()"]
+
+
+def test_timeouts_are_not_cached():
+    cache = ExecutionCache()
+    result = run_code_cached("while 1: pass", timeout=0.3, cache=cache)
+    assert result.timed_out
+    assert cache.get(execution_key("while 1: pass")) is None
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    run_code_cached("print('hi')", cache=ExecutionCache(str(tmp_path)))
+    result = run_code_cached("print('hi')", cache=ExecutionCache(str(tmp_path)))
+    assert result.cached and result.stdout == "hi\n"
+
+
+def test_key_depends_on_interpreter(monkeypatch):
+    key = execution_key("print(1)")
+    monkeypatch.setattr(sys, "version", "0.0.0")
+    assert execution_key("print(1)") != key
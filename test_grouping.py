@@ -0,0 +1,75 @@
+"""
+Test section parsing and grouped generation
+"""
+
+import json
+
+from agents.grouping import generate_section, parse_section_response
+from core.parser import parse_sections, parse_tasks_from_content, read_task_file
+
+
+class Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class ScriptedLLM:
+    """Fake client returning canned answers in order"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return Reply(self.answers.pop(0))
+
+
+def _function_section():
+    sections = parse_sections(read_task_file("tasks/task_1.txt"))
+    return next(s for s in sections if s.title == "function")
+
+
+def test_sections_cover_every_parsed_task():
+    for path in ["tasks/task_1.txt", "tasks/task_3.txt", "tasks/task_4.txt"]:
+        content = read_task_file(path)
+        flattened = [t for s in parse_sections(content) for t in s.tasks]
+        assert flattened == parse_tasks_from_content(content)
+
+
+def test_function_section_groups_seven_tasks():
+    section = _function_section()
+    assert len(section.tasks) == 7
+    assert all("створити функцію" in text for _, text in section.tasks)
+
+
+def test_one_request_for_whole_section():
+    section = _function_section()
+    answer = json.dumps([{"index": i, "code": f"print({i})"} for i in range(1, 8)])
+    llm = ScriptedLLM(f"Here you go:\n```json\n{answer}\n```")
+
+    records, fallbacks = generate_section(llm, section, "uk")
+
+    assert llm.calls == 1
+    assert fallbacks == 0
+    assert [r.code for r in records] == [f"print({i})" for i in range(1, 8)]
+    assert [r.task_number for r in records] == [n for n, _ in section.tasks]
+
+
+def test_invalid_tasks_fall_back_to_individual_calls():
+    section = _function_section()
+    items = [{"index": i, "code": f"print({i})"} for i in range(1, 8)]
+    items[2]["code"] = "def broken(:"
+    del items[5]
+    llm = ScriptedLLM(json.dumps(items), "print('three')", "print('six')")
+
+    records, fallbacks = generate_section(llm, section, "en")
+
+    assert (llm.calls, fallbacks) == (3, 2)
+    assert records[2].code == "print('three')"
+    assert records[5].code == "print('six')"
+
+
+def test_unusable_response():
+    assert parse_section_response("Sorry, I can't do that") == {}
+    assert parse_section_response("[{broken json") == {}
@@ -0,0 +1,74 @@
+"""
+Test UI string extraction and the compiled message catalog
+"""
+
+from core.i18n import Catalog, build, extract_strings, write_catalog
+
+
+def test_extracts_strings_from_both_entry_points():
+    strings = extract_strings()
+    assert "📁 Select task file:" in strings  # main.get_ui_messages
+    assert "Select task file" in strings  # main_simple ai_localize call
+    assert "Goodbye! 👋" in strings
+    assert len(strings) == len(set(strings))
+
+
+def test_catalog_lookup(tmp_path):
+    path = str(tmp_path / "messages.cat")
+    write_catalog(
+        path,
+        {
+            "Exit": {"en": "Exit", "uk": "Вихід", "ru": "Выход"},
+            "Goodbye! 👋": {"en": "Goodbye! 👋", "uk": "До побачення! 👋"},
+        },
+    )
+    catalog = Catalog(path)
+    assert len(catalog) == 2
+    assert catalog.get("Exit", "uk") == "Вихід"
+    assert catalog.get("Exit", "ru") == "Выход"
+    assert catalog.get("Goodbye! 👋", "uk") == "До побачення! 👋"
+    # Missing locale entries are a miss, so the caller asks the LLM
+    assert catalog.get("Goodbye! 👋", "ru") is None
+    assert catalog.get("Unknown", "uk") is None
+    assert catalog.get("Exit", "de") is None
+
+
+def test_build_translates_every_string_once(tmp_path):
+    calls = []
+
+    def translate(text, locale):
+        calls.append((text, locale))
+        return f"[{locale}] {text}"
+
+    path = str(tmp_path / "messages.cat")
+    count, missing = build(path, translate)
+
+    assert count == len(extract_strings())
+    assert len(calls) == 2 * count and missing == 0
+    assert Catalog(path).get("Exit", "ru") == "[ru] Exit"
+
+
+def test_failed_translations_stay_misses(tmp_path):
+    def translate(text, locale):
+        if locale == "ru":
+            raise RuntimeError("provider down")
+        # ai_translate hands the input back when the LLM call fails
+        return text if text == "Exit" else f"[{locale}] {text}"
+
+    path = str(tmp_path / "messages.cat")
+    count, missing = build(path, translate)
+
+    assert missing == count + 1
+    catalog = Catalog(path)
+    assert catalog.get("Exit", "en") == "Exit"
+    assert catalog.get("Exit", "uk") is None
+    assert catalog.get("Exit", "ru") is None
+    assert catalog.get("Goodbye! 👋", "uk") == "[uk] Goodbye! 👋"
+
+    count, missing = build(path)  # --stub
+    assert missing == 2 * count
+    assert Catalog(path).get("Goodbye! 👋", "uk") is None
+
+
+def test_missing_catalog_is_empty(tmp_path):
+    assert Catalog(str(tmp_path / "none.cat")).get("Exit", "uk") is None
@@ -0,0 +1,92 @@
+"""
+Test the warm interpreter pool backend of run_code()
+"""
+
+import time
+
+import pytest
+
+import core.interpreter_pool
+from core.execution import ExecutionCache, run_code, run_code_cached
+from core.interpreter_pool import InterpreterPool
+
+PROGRAMS = [
+    ("print(input() * 2)", "ab\n"),
+    ("import sys\nprint('out')\nsys.exit(3)", ""),
+    ("def f():\n    return 1 / 0\nf()", ""),
+    ("import sys\nprint('warn', file=sys.stderr)", ""),
+]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with InterpreterPool(size=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("code,stdin", PROGRAMS)
+def test_matches_fresh_interpreter(pool, code, stdin):
+    fresh = run_code(code, stdin)
+    warm = run_code(code, stdin, pool=pool)
+    assert (warm.stdout, warm.stderr, warm.returncode) == (
+        fresh.stdout,
+        fresh.stderr,
+        fresh.returncode,
+    )
+
+
+def test_runs_do_not_share_state(pool):
+    assert run_code("import math\nmath.pi = 3\nx = 1", pool=pool).ok
+    result = run_code("import math\nprint(math.pi, 'x' in globals())", pool=pool)
+    assert result.stdout == "3.141592653589793 False\n"
+
+
+def test_timeout_keeps_the_pool_usable(pool):
+    result = run_code("while True:\n    pass", timeout=0.3, pool=pool)
+    assert result.timed_out and not result.ok
+    assert result.duration < 2
+    assert run_code("print('alive')", pool=pool).stdout == "alive\n"
+
+
+def test_timeout_keeps_earlier_output(pool):
+    code = "print('started')\nwhile True:\n    pass"
+    result = run_code(code, timeout=0.3, pool=pool)
+    assert result.timed_out and result.returncode == -1
+    assert result.stdout == "started\n"
+
+    # Code that swallows the timeout is killed shortly after
+    code = "while True:\n    try:\n        while True:\n            pass\n    except BaseException:\n        pass"
+    result = run_code(code, timeout=0.3, pool=pool)
+    assert result.timed_out and result.duration < 2
+
+
+def test_failed_respawn_falls_back_to_fresh_interpreters(monkeypatch):
+    pool = InterpreterPool(size=1)
+
+    def broken(modules):
+        raise OSError("Too many open files")
+
+    monkeypatch.setattr(core.interpreter_pool, "_Worker", broken)
+    # The worker dies mid-run and cannot be replaced
+    killer = "import os, signal\nos.kill(os.getppid(), signal.SIGKILL)"
+    assert not run_code(killer, pool=pool).ok
+    deadline = time.monotonic() + 5
+    while pool.failed is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert isinstance(pool.failed, OSError)
+    result = run_code("print('fresh')", pool=pool)
+    assert result.ok and result.stdout == "fresh\n"
+
+
+def test_warm_runs_are_fast_and_cacheable(pool):
+    code = "for i in range(3):\n    print('*' * i)"
+    run_code(code, pool=pool)
+    start = time.perf_counter()
+    for _ in range(10):
+        assert run_code(code, pool=pool).ok
+    assert (time.perf_counter() - start) / 10 < 0.05
+
+    cache = ExecutionCache()
+    assert not run_code_cached(code, cache=cache, pool=pool).cached
+    assert run_code_cached(code, cache=cache, pool=pool).cached
@@ -0,0 +1,63 @@
+"""
+Test the incremental, tolerant JSON extractor
+"""
+
+from core.json_stream import JsonStreamExtractor, extract_json
+
+RESPONSE = (
+    "Sure! Here [is] the menu:\n```json\n"
+    '[{"id": 1, "task": "a]b"}, {"id": 2, "task": "c\\"d"},\n'
+    ' {"id": 3, "task": "e",},]\n```\nHope this helps!'
+)
+EXPECTED = [
+    {"id": 1, "task": "a]b"},
+    {"id": 2, "task": 'c"d'},
+    {"id": 3, "task": "e"},
+]
+
+
+def test_skips_prose_fences_and_trailing_commas():
+    assert extract_json(RESPONSE) == EXPECTED
+
+
+def test_items_arrive_while_streaming():
+    extractor = JsonStreamExtractor()
+    seen = []
+    for i in range(0, len(RESPONSE), 3):
+        items = extractor.feed(RESPONSE[i : i + 3])
+        seen.extend(items)
+        if items:
+            # the first item is complete long before the array closes
+            assert not extractor.done or len(seen) == 3
+    assert seen == EXPECTED
+    assert extractor.done
+
+
+def test_truncated_response_keeps_complete_items():
+    text = '[{"id": 1, "task": "x"}, {"id": 2, "task": "cut off'
+    assert extract_json(text) == [{"id": 1, "task": "x"}, {"id": 2, "task": "cut off"}]
+
+
+def test_broken_item_is_skipped_not_fatal():
+    assert extract_json('[{"id": 1}, {oops}, {"id": 3}]') == [{"id": 1}, {"id": 3}]
+
+
+def test_objects_python_literals_and_defaults():
+    assert extract_json('Result: {"a": [1, 2]} done') == {"a": [1, 2]}
+    assert extract_json("[{'id': 1, 'ok': True}]") == [{"id": 1, "ok": True}]
+    assert extract_json("no json here", {}) == {}
+    assert extract_json("[]") == []
+
+
+def test_literal_eval_errors_are_counted_not_raised():
+    extractor = JsonStreamExtractor()
+    # {[1]: 2} is a TypeError in ast.literal_eval (unhashable key)
+    items = extractor.feed('[{"id": 1}, {[1]: 2}, {"id": 3}]')
+    assert items == [{"id": 1}, {"id": 3}]
+    assert extractor.errors == 1
+
+
+def test_raw_newlines_inside_strings():
+    assert extract_json('[{"task": "line one\nline two"}]') == [
+        {"task": "line one\nline two"}
+    ]
@@ -0,0 +1,51 @@
+"""
+Test the classroom load test harness against the fake LLM
+"""
+
+from agents.client import wrap_llm
+from agents.fake_llm import FakeLLM, FakeLLMError, LatencyModel
+from loadtest import LoadTest, random_sessions
+
+
+def test_fake_llm_answers_each_prompt_kind():
+    llm = FakeLLM(LatencyModel(0, 0), seed=1)
+    translate = 'Translate this interface text to uk language naturally:\n    "Exit"'
+    assert llm.invoke([{"role": "user", "content": translate}]).content == "[uk] Exit"
+    assert "print" in llm.invoke([{"role": "user", "content": "Generate"}]).content
+
+
+def test_fake_llm_errors():
+    llm = FakeLLM(LatencyModel(0, 0), error_rate=1.0)
+    try:
+        llm.invoke([{"role": "user", "content": "x"}])
+    except FakeLLMError:
+        pass
+    else:
+        raise AssertionError("expected a simulated error")
+
+
+def test_sessions_run_and_report(tmp_path):
+    sessions = random_sessions(6, seed=3, run_rate=0)
+    fake = FakeLLM(LatencyModel(0.001, 0.1), seed=3)
+    test = LoadTest(wrap_llm(fake), output_dir=str(tmp_path))
+
+    elapsed = test.run(sessions, users=3)
+    report = test.report(elapsed, fake.calls)
+
+    assert report["sessions"] == 6
+    assert report["error_rate"] == 0.0
+    assert report["steps"]["task"]["count"] == 6
+    assert report["steps"]["language"]["p95"] >= report["steps"]["language"]["p50"]
+
+
+def test_report_counts_only_this_run_and_cache_hits(tmp_path):
+    sessions = random_sessions(8, seed=1, run_rate=0)
+    # Own model name, so its circuit breaker opening stays out of other tests
+    fake = FakeLLM(LatencyModel(0.001, 0.1), seed=1, error_rate=0.3, model="flaky")
+    test = LoadTest(wrap_llm(fake), output_dir=str(tmp_path))
+
+    report = test.report(test.run(sessions, users=2), fake.calls)
+
+    assert report["llm_calls"] >= fake.calls > 0
+    # Failed requests whose prompt was answered before come from the cache
+    assert 0.0 < report["cache_hit_rate"] <= 1.0
@@ -0,0 +1,81 @@
+"""
+Test call-site labels, the metrics registry and LLM instrumentation
+"""
+
+import urllib.request
+
+import pytest
+
+from agents.fake_llm import FakeLLM, FakeLLMError, LatencyModel
+from agents.telemetry import LATENCY, REQUESTS, TOKENS, InstrumentedLLM, summary
+from core.metrics import Registry, call_site, current_labels
+
+
+def fake(**kwargs):
+    return FakeLLM(LatencyModel(median=0.0, sigma=0.0), seed=1, **kwargs)
+
+
+def test_call_site_nests_and_resets():
+    with call_site("outer", language="uk"):
+        with call_site("inner"):
+            assert current_labels() == {"call_site": "inner", "language": "uk"}
+        assert current_labels()["call_site"] == "outer"
+    assert current_labels() == {}
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs").inc(2, kind='a"b')
+    registry.histogram("wait_seconds", "Wait", buckets=(1, 5)).observe(3)
+    text = registry.render()
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{kind="a\\"b"} 2' in text
+    assert 'wait_seconds_bucket{le="1"} 0' in text
+    assert 'wait_seconds_bucket{le="5"} 1' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 1' in text
+    assert "wait_seconds_count 1" in text
+
+
+def test_registry_dump_and_serve(tmp_path):
+    registry = Registry()
+    gauge = registry.gauge("depth", "Depth")
+    registry.add_collector(lambda: gauge.set(7))
+    path = str(tmp_path / "metrics.prom")
+    registry.dump(path)
+    assert "depth 7" in open(path).read()
+
+    server = registry.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        assert "depth 7" in urllib.request.urlopen(url).read().decode()
+    finally:
+        server.shutdown()
+
+
+def test_instrumented_llm_records_labels_and_tokens():
+    llm = InstrumentedLLM(fake(), provider="Fake", model="m1")
+    labels = {
+        "call_site": "test_site",
+        "language": "uk",
+        "provider": "Fake",
+        "model": "m1",
+    }
+    with call_site("test_site", language="uk"):
+        llm.invoke([{"role": "user", "content": "Write code"}])
+        chunks = list(llm.stream([{"role": "user", "content": "Write more code"}]))
+    assert chunks
+    assert REQUESTS.value(status="ok", **labels) == 2
+    assert LATENCY.summary(**labels)[0] == 2
+    assert TOKENS.value(direction="output", **labels) > 0
+
+    rows = summary()
+    assert rows["test_site"]["requests"] >= 2
+    assert 0 < rows["test_site"]["share"] <= 1
+
+
+def test_instrumented_llm_counts_errors():
+    llm = InstrumentedLLM(fake(error_rate=1.0), provider="Fake", model="m2")
+    with call_site("failing_site"):
+        with pytest.raises(FakeLLMError):
+            llm.invoke([{"role": "user", "content": "x"}])
+    assert summary()["failing_site"]["errors"] == 1
@@ -0,0 +1,53 @@
+"""
+Test multi-process corpus parsing
+"""
+
+import glob
+import os
+
+import pytest
+
+from benchmarks import bench_parallel_parse
+from core.parallel_parse import parse_files_parallel, shard
+from core.task_store import TaskStore
+
+TASK_FILES = sorted(glob.glob("tasks/*.txt"))
+
+
+def test_shard_is_contiguous_and_complete():
+    items = list(range(10))
+    shards = shard(items, 4)
+    assert [len(s) for s in shards] == [3, 3, 2, 2]
+    assert sum(shards, []) == items
+    assert shard(items[:2], 8) == [[0], [1]]
+
+
+def test_parallel_matches_sequential_order():
+    paths = TASK_FILES * 3
+    expected = TaskStore.from_files(paths)
+
+    store = parse_files_parallel(paths, workers=2)
+
+    assert list(store) == list(expected)
+    assert store.files == expected.files
+    assert list(store.file_ids) == list(expected.file_ids)
+
+
+def test_speedup_check_needs_more_than_one_cpu():
+    rows = [{"workers": 1, "speedup": 1.0}, {"workers": 4, "speedup": 2.0}]
+    assert bench_parallel_parse.check(rows, cpus=1) is None
+    assert "4 workers" in bench_parallel_parse.check(rows, cpus=4)
+    assert bench_parallel_parse.check(rows, cpus=4, efficiency=0.5) is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    os.environ.get("PARSER_BENCH") != "1", reason="set PARSER_BENCH=1 to run"
+)
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs more than one CPU")
+def test_speedup_scales_with_workers(tmp_path):
+    paths = bench_parallel_parse.build_corpus(str(tmp_path), 400, 50)
+    counts = bench_parallel_parse.worker_counts(os.cpu_count())
+    rows = bench_parallel_parse.measure(paths, counts)
+    problem = bench_parallel_parse.check(rows)
+    assert problem is None, problem
@@ -1,52 +1,87 @@
 """
-Test the task parser
+Test the task parser against the golden corpus
 """
 
-import re
-
-
-def parse_tasks_from_content(content):
-    """Parse tasks from file content to get exact task mapping"""
-    tasks = {}
-    lines = content.split("\n")
-    task_counter = 1
-
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-
-        # Look for numbered tasks like "1)", "2)", etc.
-        numbered_match = re.match(r"^(\d+)\)\s*(.*)", line)
-        if numbered_match:
-            task_num = int(numbered_match.group(1))
-            task_text = numbered_match.group(2)
-            if task_text.strip():
-                tasks[task_num] = task_text.strip()
-            continue
-
-        # Look for bullet point tasks "–"
-        bullet_match = re.match(r"^–\s*(.*)", line)
-        if bullet_match:
-            task_text = bullet_match.group(1)
-            if task_text.strip():
-                # Find next available number
-                while task_counter in tasks:
-                    task_counter += 1
-                tasks[task_counter] = task_text.strip()
-                task_counter += 1
-            continue
-
-    return tasks
-
-
-# Test with task file
-with open("tasks/task_1.txt", "r", encoding="utf-8") as f:
-    content = f.read()
-
-tasks = parse_tasks_from_content(content)
-
-print(f"Found {len(tasks)} tasks:")
-for task_num in sorted(tasks.keys()):
-    print(f"{task_num}. {tasks[task_num]}")
-    print(f"{task_num}. {tasks[task_num]}")
+import json
+import os
+import random
+
+import pytest
+
+from benchmarks import bench_parser
+from benchmarks.corpus import golden_inputs, golden_path, large_file
+from core.parser import parse_sections, parse_tasks_from_content, read_task_file
+
+CASES = golden_inputs()
+
+
+def load_golden(name):
+    with open(golden_path(name), encoding="utf-8") as f:
+        return [tuple(task) for task in json.load(f)]
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_matches_golden(name):
+    assert parse_tasks_from_content(CASES[name]) == load_golden(name)
+
+
+@pytest.mark.parametrize("name", ["task_1", "task_2", "task_3", "task_4"])
+def test_cp1251_file_matches_golden(tmp_path, name):
+    path = tmp_path / f"{name}.txt"
+    path.write_bytes(CASES[name].encode("cp1251"))
+    assert parse_tasks_from_content(read_task_file(str(path))) == load_golden(name)
+
+
+def test_bom_file_keeps_first_task(tmp_path):
+    path = tmp_path / "bom.txt"
+    path.write_bytes("1) with bom\n2) after bom".encode("utf-8-sig"))
+    content = read_task_file(str(path))
+    assert not content.startswith("\ufeff")
+    assert parse_tasks_from_content(content) == load_golden("bom_prefix")
+
+
+def _fuzz_content(rng):
+    alphabet = ["1) ", "2. ", "– ", "* ", "- ", "#", "вивести ", "x", " ", "\t"]
+    alphabet += ["\n", "\r\n", ")", ".", "0", "9", "ї", "—"]
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+
+
+def test_fuzz_invariants():
+    rng = random.Random(2024)
+    for _ in range(500):
+        content = _fuzz_content(rng)
+        tasks = parse_tasks_from_content(content)
+
+        lines = [line.strip() for line in content.split("\n") if line.strip()]
+        assert len(tasks) <= len(lines)
+        for _, text in tasks:
+            assert text and text == text.strip()
+            assert any(text in line for line in lines)
+
+        # Line endings and surrounding blank lines never change the result
+        assert parse_tasks_from_content(content.replace("\r\n", "\n")) == tasks
+        assert parse_tasks_from_content(f"\n\n{content}\n\n") == tasks
+        # Sections partition the task list without losing or reordering tasks
+        sectioned = [task for s in parse_sections(content) for task in s.tasks]
+        assert sectioned == tasks
+
+
+def test_large_file_counts_every_task():
+    assert len(parse_tasks_from_content(large_file(2000, seed=7))) == 2000
+
+
+# Wall-clock timing: noisy on shared runners, so it runs in its own job
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    os.environ.get("PARSER_BENCH") != "1", reason="set PARSER_BENCH=1 to run"
+)
+def test_throughput_within_baseline():
+    baseline = bench_parser.load_baseline()
+    if baseline is None:
+        pytest.skip("No parser baseline recorded")
+    tolerance = float(
+        os.environ.get("PARSER_BENCH_TOLERANCE", bench_parser.DEFAULT_TOLERANCE)
+    )
+    result = bench_parser.measure(tasks=baseline["tasks"], repeat=5)
+    problem = bench_parser.check(result, baseline, tolerance)
+    assert problem is None, problem
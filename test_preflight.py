@@ -0,0 +1,76 @@
+"""
+Test static pre-flight analysis of generated code
+"""
+
+from agents.codegen import generate_code
+from core.preflight import analyze, extract_code, preflight
+
+
+class Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class ScriptedLLM:
+    """Fake client returning canned answers in order"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return Reply(self.answers.pop(0))
+
+
+def test_extracts_fenced_code_from_prose():
+    text = "Here is the solution:\n```python\nprint('hi')\n```\nHope it helps!"
+    assert extract_code(text) == "print('hi')"
+
+
+def test_drops_leading_prose_without_fences():
+    text = "Sure! Here is the code:\nx = 1\nprint(x)"
+    assert extract_code(text) == "x = 1\nprint(x)"
+
+
+def test_syntax_error_fails():
+    report = analyze("def broken(:\n    pass")
+    assert not report.ok
+    assert report.syntax_error
+
+
+def test_input_is_reported_but_allowed():
+    report = preflight("name = input('Name: ')\nprint(name)")
+    assert report.ok
+    assert report.uses_input
+
+
+def test_unbounded_while_true():
+    assert analyze("while True:\n    print(1)").unbounded_loops == [1]
+    assert analyze("while True:\n    for i in range(3):\n        break").unbounded_loops
+    assert analyze("while True:\n    if input() == '0':\n        break").ok
+    assert analyze("def f():\n    while True:\n        return 1").ok
+
+
+def test_disallowed_imports():
+    report = analyze("import os\nimport subprocess\nfrom socket import socket")
+    assert report.disallowed_imports == ["subprocess", "socket"]
+    assert not report.ok
+
+
+def test_dangerous_os_functions():
+    assert analyze("import os\nprint(os.path.join('a', 'b'), os.getcwd())").ok
+    report = analyze("import os as o\no.system('ls')\nf = o.remove")
+    assert sorted(report.disallowed_calls) == ["os.remove", "os.system"]
+    assert "disallowed call: os.system" in report.problems()
+    report = analyze("from os import path, unlink")
+    assert report.disallowed_imports == ["os.unlink"]
+    assert not report.ok
+
+
+def test_broken_output_is_regenerated_immediately():
+    llm = ScriptedLLM("```python\nprint('unclosed'\n```", "print('fixed')")
+    report = generate_code(llm, "Generate code")
+    assert report.ok
+    assert report.code == "print('fixed')"
+    assert llm.calls == 2
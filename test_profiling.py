@@ -0,0 +1,108 @@
+"""
+Test the sampling profiler and tracemalloc report
+"""
+
+import argparse
+import atexit
+import os
+import pstats
+import threading
+
+from core import profiling
+from core.profiling import Profiler, add_profile_arguments, collapse
+
+
+def blocked_on_io(event):
+    event.wait(0.2)
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(500)]
+
+
+def test_collapse_is_outermost_first():
+    def inner():
+        import sys
+
+        return collapse(sys._getframe(), "worker")
+
+    stack = inner().split(";")
+    assert stack[0] == "worker"
+    assert stack[-1].startswith("inner (test_profiling.py:")
+    assert stack[-2].startswith("test_collapse_is_outermost_first (")
+
+
+def test_wall_clock_samples_catch_blocked_threads(tmp_path):
+    prefix = str(tmp_path / "run")
+    profiler = Profiler(prefix, interval=0.002).start()
+    thread = threading.Thread(target=blocked_on_io, args=(threading.Event(),))
+    thread.start()
+    thread.join()
+    summary = profiler.stop()
+
+    collapsed = (tmp_path / "run.collapsed").read_text(encoding="utf-8")
+    assert "blocked_on_io (test_profiling.py:" in collapsed
+    count = collapsed.splitlines()[0].rsplit(" ", 1)[1]
+    assert int(count) > 0
+    assert "Wall clock" in summary and "cProfile" in summary
+    assert (tmp_path / "run.pstats").exists()
+    assert (tmp_path / "run.txt").read_text(encoding="utf-8").strip() == summary
+    assert profiler.stop() == ""
+
+
+def test_tracemalloc_reports_allocation_sites(tmp_path):
+    profiler = Profiler(str(tmp_path / "mem"), sample=False, memory=True).start()
+    kept = allocate()
+    summary = profiler.stop()
+    assert len(kept) == 500
+    assert "tracemalloc" in summary and "test_profiling.py:" in summary
+    assert not (tmp_path / "mem.collapsed").exists()
+
+
+def test_cli_flags():
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    args = parser.parse_args(["--profile", "--profile-out", "out/run"])
+    assert (args.profile, args.tracemalloc, args.profile_out) == (
+        True,
+        False,
+        "out/run",
+    )
+
+
+SCRIPT = """
+import argparse
+
+from core import profiling
+
+ACTIVE_AT_IMPORT = profiling._active is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true")
+    profiling.add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    return ACTIVE_AT_IMPORT, args.resume, profiling.setup_profiling(args, "script")
+"""
+
+
+def test_launcher_profiles_imports(tmp_path, monkeypatch):
+    (tmp_path / "profiled_script.py").write_text(SCRIPT, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(profiling, "_active", None)
+    reports = []
+    monkeypatch.setattr(atexit, "register", reports.append)
+
+    prefix = str(tmp_path / "run")
+    argv = ["profiled_script", "--resume", "--profile-out", prefix]
+    active_at_import, resume, profiler = profiling.launch(argv)
+
+    assert active_at_import and resume
+    assert profiler is profiling._active
+    reports[0]()
+    # cProfile saw the script's module body run
+    stats = pstats.Stats(prefix + ".pstats").stats
+    assert ("profiled_script.py", "<module>") in {
+        (os.path.basename(filename), name) for filename, _, name in stats
+    }
@@ -0,0 +1,36 @@
+"""
+Test slotted records and their pydantic boundary conversions
+"""
+
+import pytest
+
+from core.models import GeneratedCode, TaskMenuItem
+from core.records import GeneratedCodeRecord, GenerationRecord, TaskRecord
+
+
+def test_records_have_no_instance_dict():
+    record = TaskRecord(1, "print list", "створити функцію, яка виводить List")
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_task_record_round_trip():
+    record = TaskRecord(3, "min number", "знайти мін. число")
+    model = record.to_model()
+    assert isinstance(model, TaskMenuItem)
+    assert TaskRecord.from_model(model) == record
+
+
+def test_generated_code_id_assigned_at_boundary():
+    record = GeneratedCodeRecord("uk", 2, "square", "print('*')")
+    assert record.id is None
+    model = record.to_model()
+    assert isinstance(model, GeneratedCode)
+    assert GeneratedCodeRecord.from_model(model).id == str(model.id)
+
+
+def test_validation_happens_at_boundary():
+    record = GenerationRecord(True, task_id="not a number")
+    with pytest.raises(ValueError):
+        record.to_model()
@@ -0,0 +1,89 @@
+"""
+Test single-buffer rendering, lazy menus and incremental highlighting
+"""
+
+import io
+import os
+import re
+
+from core.render import Menu, Screen, highlight, highlight_lines
+from core.task_store import TaskStore
+
+ANSI = re.compile(r"\033\[[0-9;]*m")
+CODE = '''import math
+
+# area of a circle
+def area(r):
+    """Doc
+    string"""
+    return math.pi * r ** 2 if r > 0 else print("bad", 0)
+'''
+
+
+class Rows(list):
+    """List that records which rows were read"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.read = set()
+
+    def __getitem__(self, index):
+        self.read.add(index)
+        return super().__getitem__(index)
+
+
+def test_screen_is_one_write_on_a_descriptor(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    writes = []
+    real_write = os.write
+
+    def counting_write(fd, data):
+        writes.append(fd)
+        return real_write(fd, data)
+
+    monkeypatch.setattr(os, "write", counting_write)
+    with os.fdopen(write_fd, "w", encoding="utf-8") as stream:
+        Screen(stream).line("Задачі:").rule().lines(["1. a", "2. b"]).flush()
+    monkeypatch.undo()
+    with os.fdopen(read_fd, encoding="utf-8") as pipe:
+        assert pipe.read() == "Задачі:\n" + "-" * 50 + "\n1. a\n2. b\n"
+    assert writes == [write_fd]
+
+
+def test_screen_falls_back_to_stream_write():
+    stream = io.StringIO()
+    screen = Screen(stream).line("a")
+    screen.code("print(1)", color=False).flush()
+    assert stream.getvalue() == "a\nprint(1)\n"
+    assert screen.render() == ""
+
+
+def test_menu_formats_only_the_shown_page():
+    rows = Rows((i, f"task {i}") for i in range(1, 1001))
+    menu = Menu(rows, page_size=40)
+    assert menu.pages == 25
+    assert menu.page_lines(1)[0] == "  41. task 41"
+    assert rows.read == set(range(40, 80))
+    assert menu.turn(0, "p") == 24 and menu.turn(24, "N") == 0
+    assert menu.turn(0, "7") is None
+    assert menu.footer(0) == "◀ p   1/25   n ▶"
+
+
+def test_menu_over_task_store():
+    store = TaskStore.from_tasks([(3, "first"), (12, "second")])
+    menu = Menu(store)
+    assert menu.page_lines(0) == [" 3. first", "12. second"]
+    assert menu.footer(0) == "" and menu.turn(0, "n") is None
+
+
+def test_highlighting_keeps_the_text():
+    painted = list(highlight_lines(CODE))
+    assert [ANSI.sub("", line) for line in painted] == CODE.splitlines()
+    assert "\033[1;34mimport\033[0m" in painted[0]
+    assert painted[5].startswith("\033[32m")  # second line of the docstring
+    assert highlight(CODE) == "\n".join(painted)
+
+
+def test_highlighting_survives_broken_code():
+    code = "x = (1,\ny = 'open"
+    assert [ANSI.sub("", line) for line in highlight_lines(code)] == code.split("\n")
@@ -0,0 +1,120 @@
+"""
+Test the generate -> check -> repair loop
+"""
+
+import time
+
+import pytest
+
+from agents.fake_llm import FakeLLM, LatencyModel
+from agents.repair import RepairCache, generate_with_repair, numbered_excerpt
+from agents.resilience import AdaptiveTimeouts, LLMTimeoutError, ResilientLLM
+
+
+class Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class ScriptedLLM:
+    """Fake client returning canned answers in order"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def invoke(self, messages):
+        self.prompts.append(messages[-1]["content"])
+        return Reply(self.answers.pop(0))
+
+
+def test_working_code_needs_one_attempt():
+    llm = ScriptedLLM("print('ok')")
+    code, record = generate_with_repair(llm, "task", 1)
+    assert code == "print('ok')"
+    assert (record.success, record.attempts, record.status) == (True, 1, "ok")
+
+
+def test_runtime_error_is_repaired_with_traceback():
+    llm = ScriptedLLM("x = 1\nprint(1 / 0)", "print(1 / 1)")
+    code, record = generate_with_repair(llm, "task", 2, execute=True)
+    assert code == "print(1 / 1)"
+    assert (record.attempts, record.status) == (2, "repaired")
+    assert "ZeroDivisionError" in llm.prompts[-1]
+    assert ">>   2 | print(1 / 0)" in llm.prompts[-1]
+
+
+def test_gives_up_after_max_attempts():
+    llm = ScriptedLLM("1 / 0", "2 / 0", "3 / 0")
+    code, record = generate_with_repair(llm, "task", 3, max_attempts=3, execute=True)
+    assert (record.success, record.attempts, record.status) == (False, 3, "failed")
+    assert "ZeroDivisionError" in record.error_message
+    assert record.to_model().status == "failed"
+
+
+def test_same_failure_is_never_repaired_twice():
+    cache = RepairCache()
+    first = ScriptedLLM("1 / 0", "print('fixed')")
+    generate_with_repair(first, "task", 4, cache=cache, execute=True)
+
+    second = ScriptedLLM("1 / 0")
+    code, record = generate_with_repair(second, "task", 4, cache=cache, execute=True)
+    assert code == "print('fixed')"
+    assert record.status == "repaired"
+    assert len(second.prompts) == 1
+
+
+def test_numbered_excerpt_marks_failing_line():
+    code = "\n".join(f"line{i}" for i in range(1, 11))
+    excerpt = numbered_excerpt(code, 'File "<string>", line 5, in <module>')
+    assert ">>   5 | line5" in excerpt
+    assert "line1 " not in excerpt and "line10" not in excerpt
+
+
+def test_preflight_regenerations_count_as_attempts():
+    llm = ScriptedLLM("print(", "print('ok')")
+    code, record = generate_with_repair(llm, "task", 5)
+    assert code == "print('ok')"
+    assert (record.attempts, record.status) == (2, "repaired")
+
+    # Pre-flight regenerations don't use up the repair budget
+    llm = ScriptedLLM("print(", "print(", "1 / 0", "print('fixed')")
+    code, record = generate_with_repair(
+        llm, "task", 6, max_attempts=3, cache=RepairCache(), execute=True
+    )
+    assert code == "print('fixed')"
+    assert (record.attempts, record.status) == (4, "repaired")
+
+
+def test_code_is_not_executed_without_opt_in(tmp_path):
+    marker = tmp_path / "ran"
+    llm = ScriptedLLM(f"open({str(marker)!r}, 'w').close()\n1 / 0")
+    code, record = generate_with_repair(llm, "task", 8)
+    assert (record.attempts, record.status) == (1, "ok")
+    assert not marker.exists()
+
+
+def test_failed_repair_call_keeps_generated_code():
+    class FlakyLLM(ScriptedLLM):
+        def invoke(self, messages):
+            if self.prompts:
+                raise RuntimeError("provider down")
+            return super().invoke(messages)
+
+    code, record = generate_with_repair(
+        FlakyLLM("1 / 0"), "task", 9, cache=RepairCache(), execute=True
+    )
+    assert code == "1 / 0"
+    assert (record.success, record.status) == (False, "failed")
+
+
+def test_budget_bounds_every_llm_call():
+    timeouts = AdaptiveTimeouts(initial=60, minimum=0.1)
+    upstream = FakeLLM(
+        LatencyModel(median=0.0, sigma=0.0), seed=1, hang_rate=1.0, hang_seconds=5
+    )
+    llm = ResilientLLM(upstream, timeouts=timeouts)
+    start = time.perf_counter()
+    with pytest.raises(LLMTimeoutError):
+        generate_with_repair(llm, "task", 7, budget=0.3)
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,111 @@
+"""
+Test adaptive timeouts, circuit breakers and the resilient client
+"""
+
+import time
+
+import pytest
+
+from agents.fake_llm import FakeLLM, FakeLLMError, LatencyModel
+from agents.resilience import (
+    BREAKER_STATE,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveTimeouts,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMTimeoutError,
+    ResilientLLM,
+)
+from core.metrics import call_site
+
+PROMPT = [{"role": "user", "content": "Write code"}]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake(**kwargs):
+    return FakeLLM(LatencyModel(median=0.0, sigma=0.0), seed=1, **kwargs)
+
+
+def test_adaptive_timeout_follows_latency_percentile():
+    timeouts = AdaptiveTimeouts(initial=60, minimum=0.1, factor=2, min_samples=5)
+    assert timeouts.timeout("menu") == 60
+    for seconds in (0.1, 0.2, 0.2, 0.3, 0.5):
+        timeouts.observe("menu", seconds)
+    assert timeouts.timeout("menu") == pytest.approx(0.92)
+    # Other call sites keep their own history
+    assert timeouts.timeout("repair") == 60
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=2, cooldown=10, name="test", clock=clock)
+    breaker.failure()
+    assert breaker.state == CLOSED
+    breaker.failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert BREAKER_STATE.value(breaker="test") == 2
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state == CLOSED
+    assert BREAKER_STATE.value(breaker="test") == 0
+
+
+def test_hung_request_times_out():
+    timeouts = AdaptiveTimeouts(initial=0.2, minimum=0.1)
+    llm = ResilientLLM(fake(hang_rate=1.0, hang_seconds=5), timeouts=timeouts)
+    start = time.perf_counter()
+    with call_site("hung"):
+        with pytest.raises(LLMTimeoutError):
+            llm.invoke(PROMPT)
+    assert time.perf_counter() - start < 1
+    assert llm.breaker.failures == 1
+
+
+def test_open_circuit_serves_cached_answer_instantly():
+    upstream = fake()
+    llm = ResilientLLM(upstream, breaker=CircuitBreaker(threshold=1))
+    answer = llm.invoke(PROMPT).content
+
+    upstream.error_rate = 1.0
+    assert llm.invoke(PROMPT).content == answer  # failure -> cached fallback
+    assert llm.breaker.state == OPEN
+
+    calls = upstream.calls
+    assert llm.invoke(PROMPT).content == answer  # open -> no upstream call
+    assert upstream.calls == calls
+    with pytest.raises(CircuitOpenError):
+        llm.invoke([{"role": "user", "content": "never asked"}])
+
+
+def test_stream_passes_chunks_and_counts_errors():
+    upstream = fake()
+    llm = ResilientLLM(upstream, breaker=CircuitBreaker(threshold=1))
+    chunks = [chunk.content for chunk in llm.stream(PROMPT)]
+    assert "".join(chunks) == upstream.respond(PROMPT[0]["content"])
+
+    upstream.error_rate = 1.0
+    other = [{"role": "user", "content": "other"}]
+    with pytest.raises(FakeLLMError):
+        list(llm.stream(other))
+    assert llm.breaker.state == OPEN
+    # The earlier streamed answer is still served while open
+    assert "".join(c.content for c in llm.stream(PROMPT)) == "".join(chunks)
@@ -0,0 +1,169 @@
+"""
+Test the priority scheduler for provider slots
+"""
+
+import threading
+import time
+
+import pytest
+
+from agents.fake_llm import FakeLLM, LatencyModel
+from agents.resilience import (
+    AdaptiveTimeouts,
+    LLMTimeoutError,
+    ResilientLLM,
+    deadline,
+)
+from agents.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    PREFETCH,
+    WAIT,
+    ScheduledLLM,
+    Scheduler,
+    job,
+)
+
+
+def queue_up(scheduler, jobs):
+    """Hold the only slot, queue jobs in order, release; returns grant order"""
+    order = []
+    release = threading.Event()
+    holding = threading.Event()
+
+    def holder():
+        with scheduler.slot(INTERACTIVE, "holder"):
+            holding.set()
+            release.wait()
+
+    def worker(priority, user, name):
+        with scheduler.slot(priority, user):
+            order.append(name)
+
+    threads = [threading.Thread(target=holder)]
+    threads[0].start()
+    holding.wait()
+    for priority, user, name in jobs:
+        thread = threading.Thread(target=worker, args=(priority, user, name))
+        thread.start()
+        threads.append(thread)
+        # Wait until it is queued so arrival order is deterministic
+        while sum(scheduler.snapshot()["waiting"].values()) < len(threads) - 1:
+            time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_higher_priority_class_goes_first():
+    order = queue_up(
+        Scheduler(slots=1),
+        [
+            (BATCH, "night", "batch"),
+            (PREFETCH, "alice", "prefetch"),
+            (INTERACTIVE, "bob", "interactive"),
+        ],
+    )
+    assert order == ["interactive", "prefetch", "batch"]
+
+
+def test_users_share_a_class_fairly():
+    order = queue_up(
+        Scheduler(slots=1),
+        [
+            (INTERACTIVE, "alice", "a1"),
+            (INTERACTIVE, "alice", "a2"),
+            (INTERACTIVE, "alice", "a3"),
+            (INTERACTIVE, "bob", "b1"),
+        ],
+    )
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_batch_never_takes_reserved_slots():
+    scheduler = Scheduler(slots=2, reserved=1)
+    peak = 0
+    running = 0
+    lock = threading.Lock()
+
+    def batch_job():
+        nonlocal peak, running
+        with scheduler.slot(BATCH, "night"):
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=batch_job) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    # Interactive work gets the reserved slot without waiting for batch
+    start = time.perf_counter()
+    with scheduler.slot(INTERACTIVE, "alice"):
+        assert time.perf_counter() - start < 0.03
+    for thread in threads:
+        thread.join()
+    assert peak == 1
+
+
+def test_resize_keeps_reserve_below_slots():
+    scheduler = Scheduler(slots=4, reserved=2)
+    scheduler.resize(1)
+    # A single slot cannot be reserved, or batch work would never run
+    assert (scheduler.slots, scheduler.reserved) == (1, 0)
+    with scheduler.slot(BATCH, "night"):
+        pass
+    scheduler.resize(8)
+    assert (scheduler.slots, scheduler.reserved) == (8, 2)
+
+
+def test_slot_wait_ends_at_the_deadline():
+    scheduler = Scheduler(slots=1)
+    with scheduler.slot(INTERACTIVE, "alice"):
+        start = time.perf_counter()
+        with deadline(0.1), pytest.raises(LLMTimeoutError):
+            with scheduler.slot(INTERACTIVE, "bob"):
+                pass
+        assert time.perf_counter() - start < 1
+    assert scheduler.snapshot()["waiting"]["interactive"] == 0
+    with scheduler.slot(INTERACTIVE, "bob"):
+        pass
+
+
+def test_at_least_one_slot():
+    with pytest.raises(ValueError):
+        Scheduler(slots=0)
+    with pytest.raises(ValueError):
+        Scheduler(slots=2).resize(0)
+
+
+def test_abandoned_request_keeps_its_slot():
+    scheduler = Scheduler(slots=1)
+    upstream = FakeLLM(
+        LatencyModel(median=0.0, sigma=0.0), seed=1, hang_rate=1.0, hang_seconds=0.5
+    )
+    timeouts = AdaptiveTimeouts(initial=0.05, minimum=0.01)
+    llm = ScheduledLLM(ResilientLLM(upstream, timeouts=timeouts), scheduler)
+
+    with pytest.raises(LLMTimeoutError):
+        llm.invoke([{"role": "user", "content": "Write code"}])
+    # The provider is still working on it, so the quota is still used
+    assert scheduler.snapshot()["active"]["interactive"] == 1
+    time.sleep(0.8)
+    assert scheduler.snapshot()["active"]["interactive"] == 0
+
+
+def test_scheduled_llm_uses_job_context():
+    llm = ScheduledLLM(
+        FakeLLM(LatencyModel(median=0.0, sigma=0.0), seed=1), Scheduler(slots=2)
+    )
+    before = WAIT.summary(priority="batch")[0]
+    with job(BATCH, user="night"):
+        assert llm.invoke([{"role": "user", "content": "Write code"}]).content
+        assert list(llm.stream([{"role": "user", "content": "Write code"}]))
+    assert WAIT.summary(priority="batch")[0] == before + 2
+    assert llm.scheduler.snapshot()["active"]["batch"] == 0
@@ -0,0 +1,83 @@
+"""
+Test session snapshots and their restore
+"""
+
+import os
+import time
+
+from core.models import AgentConfig
+from core.parser import parse_tasks_from_content
+from core.records import GeneratedCodeRecord
+from core.session import MAX_RECENT, Session
+
+
+def make_session(tmp_path):
+    tasks_dir = tmp_path / "tasks"
+    tasks_dir.mkdir()
+    (tasks_dir / "task_1.txt").write_text("1) first\n2) second", encoding="utf-8")
+    (tasks_dir / "task_2.txt").write_text("– bullet one\n– bullet two\n– three")
+    config = AgentConfig(task_file_path="", tasks_directory=str(tasks_dir))
+    return Session.build(config, {"goodbye": "До побачення! 👋"})
+
+
+def test_round_trip(tmp_path):
+    session = make_session(tmp_path)
+    session.add_generation(GeneratedCodeRecord("uk", 1, "first", "print(1)"))
+    path = str(tmp_path / "session.bin")
+    session.save(path)
+
+    restored = Session.load(path)
+
+    assert restored.config == session.config
+    assert restored.messages == session.messages
+    assert restored.files == session.files
+    assert list(restored.tasks) == list(session.tasks)
+    assert restored.recent == session.recent
+    assert restored.is_fresh()
+
+
+def test_tasks_for_matches_parser(tmp_path):
+    session = make_session(tmp_path)
+    for task_file in session.files:
+        with open(task_file.filepath, encoding="utf-8") as f:
+            expected = parse_tasks_from_content(f.read())
+        assert list(session.tasks_for(task_file)) == expected
+        assert session.tasks_for(task_file).find(2) == expected[1][1]
+
+
+def test_modified_task_file_is_detected(tmp_path):
+    session = make_session(tmp_path)
+    task_file = session.files[0]
+    with open(task_file.filepath, "a", encoding="utf-8") as f:
+        f.write("\n3) third")
+    os.utime(task_file.filepath, ns=(0, 0))
+    assert not session.is_fresh()
+
+    session.refresh()
+    assert session.is_fresh()
+    assert session.tasks_for(task_file).find(3) == "third"
+
+
+def test_recent_generations_are_bounded(tmp_path):
+    session = make_session(tmp_path)
+    for i in range(MAX_RECENT + 5):
+        session.add_generation(GeneratedCodeRecord("en", i, "task", "pass"))
+    assert len(session.recent) == MAX_RECENT
+    assert session.recent[-1].task_number == MAX_RECENT + 4
+
+
+def test_missing_or_corrupt_snapshot_loads_as_none(tmp_path):
+    path = tmp_path / "session.bin"
+    assert Session.load(str(path)) is None
+    path.write_bytes(b"garbage")
+    assert Session.load(str(path)) is None
+
+
+def test_restore_is_fast(tmp_path):
+    session = make_session(tmp_path)
+    path = str(tmp_path / "session.bin")
+    session.save(path)
+    start = time.perf_counter()
+    for _ in range(10):
+        Session.load(path)
+    assert (time.perf_counter() - start) / 10 < 0.05
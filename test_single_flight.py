@@ -0,0 +1,119 @@
+"""
+Test single-flight coalescing of identical LLM calls
+"""
+
+import threading
+import time
+
+from agents.single_flight import CoalescingLLM, SingleFlight
+
+
+class SlowLLM:
+    """Fake client that counts upstream calls"""
+
+    model = "fake"
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def invoke(self, messages):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return messages[0]["content"].upper()
+
+    def stream(self, messages):
+        with self.lock:
+            self.calls += 1
+        for word in messages[0]["content"].split():
+            time.sleep(0.02)
+            yield word
+
+
+def _run_concurrently(fn, count):
+    results = [None] * count
+    threads = [
+        threading.Thread(target=lambda i=i: results.__setitem__(i, fn()))
+        for i in range(count)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_identical_invokes_share_one_request():
+    upstream = SlowLLM()
+    llm = CoalescingLLM(upstream)
+    messages = [{"role": "user", "content": "translate me"}]
+
+    results = _run_concurrently(lambda: llm.invoke(messages), 30)
+
+    assert results == ["TRANSLATE ME"] * 30
+    assert upstream.calls == 1
+    stats = llm.stats()
+    assert stats["upstream"] == 1
+    assert stats["coalesced"] == 29
+
+
+def test_different_prompts_are_not_coalesced():
+    upstream = SlowLLM()
+    llm = CoalescingLLM(upstream)
+
+    _run_concurrently(lambda: llm.invoke([{"role": "user", "content": "a"}]), 3)
+    llm.invoke([{"role": "user", "content": "b"}])
+
+    assert upstream.calls == 2
+
+
+def test_streams_are_fanned_out():
+    upstream = SlowLLM()
+    llm = CoalescingLLM(upstream)
+    messages = [{"role": "user", "content": "one two three four"}]
+
+    results = _run_concurrently(lambda: list(llm.stream(messages)), 5)
+
+    assert all(r == ["one", "two", "three", "four"] for r in results)
+    assert upstream.calls == 1
+
+
+def test_abandoned_leader_stream_does_not_stall_followers():
+    upstream = SlowLLM()
+    llm = CoalescingLLM(upstream)
+    messages = [{"role": "user", "content": "one two three four"}]
+
+    leader = llm.stream(messages)
+    assert next(leader) == "one"
+    # The leader's caller stops reading but keeps the generator alive
+    follower = list(llm.stream(messages))
+    assert follower == ["one", "two", "three", "four"]
+
+    # Closing it outright doesn't hand followers a GeneratorExit either
+    leader = llm.stream(messages)
+    follower = llm.stream(messages)
+    leader.close()
+    assert list(follower) == ["one", "two", "three", "four"]
+    assert upstream.calls == 2
+
+
+def test_errors_are_shared_and_key_is_released():
+    group = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            group.do("k", failing)
+        except RuntimeError as e:
+            return str(e)
+
+    assert _run_concurrently(call, 4) == ["boom"] * 4
+    assert len(calls) == 1
+    assert group.in_flight() == 0
+    assert group.do("k", lambda: "ok") == "ok"
@@ -0,0 +1,72 @@
+"""
+Test hash-keyed task identity and diff-aware batch regeneration
+"""
+
+import batch
+from agents.fake_llm import FakeLLM, LatencyModel
+from core.blob_store import BlobStore
+from core.task_index import INDEX_NAME, IndexEntry, TaskIndex, task_key, task_keys
+
+TASKS = """1) Print the sum of two numbers
+2) Reverse a string
+3) Count vowels in a word
+"""
+
+
+def test_keys_ignore_numbering_and_whitespace():
+    assert task_key("Reverse  a\nstring") == task_key("Reverse a string")
+    assert task_key("Reverse a string") != task_key("Reverse a list")
+    keys = task_keys([(1, "Same task"), (2, "Other"), (7, "Same task")])
+    assert keys[2] == keys[0] + "#2"
+
+
+def test_diff_reuses_renumbered_tasks(tmp_path):
+    code = tmp_path / "task_1.py"
+    code.write_text("print(1)\n")
+    index = TaskIndex(str(tmp_path / INDEX_NAME))
+    index.update(
+        "tasks/t.txt",
+        "en",
+        "gpt-4o",
+        {task_key("Old task"): IndexEntry(1, "Old task", str(code))},
+    )
+    index.save()
+
+    diff = TaskIndex(str(tmp_path / INDEX_NAME)).diff(
+        "tasks/t.txt", "en", "gpt-4o", [(1, "New task"), (2, "Old task")]
+    )
+    assert diff.changed == [(1, "New task")]
+    assert diff.unchanged[task_key("Old task")].task_number == 2
+    # Other languages/models keep their own index
+    other = index.diff("tasks/t.txt", "uk", "gpt-4o", [(2, "Old task")])
+    assert other.changed == [(2, "Old task")]
+
+
+def test_changed_only_regenerates_just_the_edit(tmp_path, monkeypatch):
+    fake = FakeLLM(LatencyModel(median=0.0, sigma=0.0), seed=1)
+    monkeypatch.setattr(batch, "create_llm", lambda **kwargs: fake)
+    store = BlobStore(str(tmp_path / "store"))
+    monkeypatch.setattr(batch, "default_store", lambda: store)
+    task_file = tmp_path / "tasks.txt"
+    task_file.write_text(TASKS, encoding="utf-8")
+    out = tmp_path / "out"
+    args = [str(task_file), "--individual", "--output", str(out), "--changed-only"]
+
+    batch.main(args)
+    assert fake.calls == 3
+    index = TaskIndex(str(out / INDEX_NAME))
+    before = index.entries(str(task_file), "en", "gpt-4o")
+
+    batch.main(args)
+    assert fake.calls == 3
+
+    task_file.write_text(
+        TASKS.replace("Reverse a string", "Reverse a list"), encoding="utf-8"
+    )
+    batch.main(args)
+    assert fake.calls == 4
+    after = TaskIndex(str(out / INDEX_NAME)).entries(str(task_file), "en", "gpt-4o")
+    assert task_key("Reverse a list") in after
+    assert task_key("Reverse a string") not in after
+    for text in ("Print the sum of two numbers", "Count vowels in a word"):
+        assert after[task_key(text)].path == before[task_key(text)].path
@@ -0,0 +1,63 @@
+"""
+Test the columnar task store
+"""
+
+import glob
+
+from core.parser import parse_tasks_from_content, read_task_file
+from core.task_store import TaskStore
+
+TASK_FILES = sorted(glob.glob("tasks/*.txt"))
+
+
+def _expected():
+    return [
+        task
+        for path in TASK_FILES
+        for task in parse_tasks_from_content(read_task_file(path))
+    ]
+
+
+def test_store_matches_parser_output():
+    store = TaskStore.from_files(TASK_FILES)
+    assert list(store) == _expected()
+    assert store.files == TASK_FILES
+
+
+def test_per_file_index_and_find():
+    store = TaskStore.from_files(TASK_FILES)
+    first = parse_tasks_from_content(read_task_file(TASK_FILES[0]))
+    rows = store.rows_for_file(0)
+    assert [store[row] for row in rows] == first
+    assert store.find(first[0][0], file_id=0) == first[0][1]
+    assert store.find(10**9) is None
+
+
+def test_keyword_search():
+    store = TaskStore.from_files(TASK_FILES)
+    expected = [i for i, (_, text) in enumerate(store) if "функцію" in text]
+    assert list(store.search("функцію")) == expected
+    assert list(store.search("LIST", ignore_case=True)) == [
+        i for i, (_, text) in enumerate(store) if "list" in text.lower()
+    ]
+
+
+def test_slices_share_buffers():
+    store = TaskStore.from_files(TASK_FILES)
+    view = store[3:8]
+    assert list(view) == list(store)[3:8]
+    assert view.text_bytes(0).obj is store.arena
+
+
+def test_save_and_mmap_load(tmp_path):
+    store = TaskStore.from_files(TASK_FILES)
+    path = tmp_path / "tasks.tst"
+    store.save(path)
+
+    loaded = TaskStore.load(path)
+    assert list(loaded) == list(store)
+    assert loaded.files == store.files
+    assert list(loaded.search("List")) == list(store.search("List"))
+
+    store[10:20].save(tmp_path / "slice.tst")
+    assert list(TaskStore.load(tmp_path / "slice.tst")) == list(store)[10:20]
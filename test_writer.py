@@ -0,0 +1,80 @@
+"""
+Test the atomic, content-addressed code writer
+"""
+
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from core.records import GeneratedCodeRecord
+from core.writer import CodeWriter
+
+
+def test_same_content_same_name_and_no_collisions(tmp_path):
+    writer = CodeWriter(str(tmp_path), fsync="never")
+    first = writer.write("print(1)\n", "task_1", 1)
+    again = writer.write("print(1)\n", "task_1", 1)
+    other = writer.write("print(2)\n", "task_1", 1)
+
+    assert first == again
+    assert first != other
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(p) for p in (first, other)
+    )
+    with open(other, encoding="utf-8") as f:
+        assert f.read() == "print(2)\n"
+
+
+@pytest.mark.parametrize("policy", ["never", "file", "batch"])
+def test_write_many_leaves_no_temp_files(tmp_path, policy):
+    writer = CodeWriter(str(tmp_path / "out"), fsync=policy)
+    records = [GeneratedCodeRecord("en", i, "task", f"print({i})") for i in range(5)]
+
+    paths = writer.write_many(records)
+
+    assert len(set(paths)) == 5
+    assert not [n for n in os.listdir(tmp_path / "out") if n.startswith(".tmp-")]
+
+
+def test_archives(tmp_path):
+    writer = CodeWriter(str(tmp_path), fsync="never")
+    records = [GeneratedCodeRecord("uk", i, "task", f"print({i})") for i in range(3)]
+
+    with zipfile.ZipFile(writer.write_archive(records, "bundle.zip", "zip")) as z:
+        assert len(z.namelist()) == 3
+    with tarfile.open(writer.write_archive(records, "bundle.tar.gz", "tar")) as t:
+        assert len(t.getnames()) == 3
+    with open(writer.write_archive(records, "bundle.jsonl", "jsonl")) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["code"] for line in lines] == ["print(0)", "print(1)", "print(2)"]
+
+
+def test_archives_accept_tuples(tmp_path):
+    writer = CodeWriter(str(tmp_path), fsync="never")
+    items = [(f"print({i})", f"task_{i}", i) for i in range(3)]
+
+    with zipfile.ZipFile(writer.write_archive(items, "bundle.zip", "zip")) as z:
+        assert len(z.namelist()) == 3
+    with open(writer.write_archive(items, "bundle.jsonl", "jsonl")) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["task_number"] for line in lines] == [0, 1, 2]
+    assert lines[2] == {"task_number": 2, "task_name": "task_2", "code": "print(2)"}
+
+
+def test_files_get_umask_permissions(tmp_path):
+    writer = CodeWriter(str(tmp_path), fsync="never")
+    old = os.umask(0o027)
+    try:
+        path = writer.write("print(1)", "t", 1)
+    finally:
+        os.umask(old)
+    # 0666 & ~umask like any other new file, not mkstemp's 0600
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        CodeWriter(fsync="sometimes")